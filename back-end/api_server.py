@@ -3,22 +3,33 @@ FastAPI Server for Banana Coin Trading Game
 Implements background market updates with asyncio.create_task()
 """
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, List
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Optional, Dict, List, Tuple, Union, Annotated
 import asyncio
+import os
+import secrets
 import time
+import json
+import orjson
 import logging
-from datetime import datetime
+import re
+from datetime import datetime, timedelta
+from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
 
 # Import existing modules
-from market import Market, MarketData
+from market import Market, MarketData, PriceHistory, adjust_market_supplies
 from user import User
 from wallet import UserWallet
 from bot import Bot, generate_custom_bot_strategy
 from bot_operations import buyBot, toggleBot
-from redis_helper import get_redis_connection
+from market_worker import (run_tick, save_game_state, game_state_key, decode_game_state, tick_channel,
+                           claim_ticker, release_ticker, lease_ttl)
+from redis.exceptions import WatchError
+from redis_helper import get_redis_connection, get_async_redis_connection
 from transaction_history import TransactionHistory
 
 # Configure logging
@@ -28,7 +39,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="Banana Coin Trading API",
     description="Real-time trading game with background market updates",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse  # orjson serializes response dicts much faster than stdlib json
 )
 
 # CORS middleware for front-end access
@@ -41,13 +53,58 @@ app.add_middleware(
 )
 
 # Global storage
-active_game_tasks: Dict[str, asyncio.Task] = {}
-game_states: Dict[str, Dict] = {}  # Store game state info
+active_game_tasks: Dict[str, asyncio.Task] = {}  # Task handles are per-process
+
+# Market ticks run on the default thread pool, or in this many worker processes if set
+TICK_WORKERS = int(os.getenv("TICK_WORKERS", "0"))
+_tick_executor: Optional[ProcessPoolExecutor] = None
+
+# Live leaderboards are built at most once per tick: game_id -> (tick, leaderboard)
+_leaderboard_snapshots: Dict[str, Tuple[int, List[Dict]]] = {}
+
+# Market data responses are cached per tick so polling clients share one build
+MARKET_DATA_CACHE_TTL = 1  # Seconds
+
+# A user's minion list only changes on a tick, a purchase or a toggle
+BOT_LIST_CACHE_TTL = 5  # Seconds; entries are also checked against the current tick
+
+# Striped locks for requests that rewrite a game's players JSON, so two requests
+# on one game in this process queue up instead of repeatedly failing each other's
+# compare-and-set (which is what keeps separate workers from overwriting each other),
+# while different games rarely contend
+PLAYER_LOCK_STRIPES = 64
+_player_locks: List[asyncio.Lock] = [asyncio.Lock() for _ in range(PLAYER_LOCK_STRIPES)]
+
+# Attempts at a trade or minion purchase before giving up with a 500
+TRADE_MAX_RETRIES = 100
+
+# Every Redis key prefix a game owns; each is stored as "<prefix>:<game_id>" and/or
+# "<prefix>:<game_id>:..." (markets, bots, transactions, caches, ticker lease)
+GAME_KEY_PREFIXES = (
+    'game', 'game_state', 'market', 'market_ticker', 'market_data_cache',
+    'bot', 'bots', 'bot_list_cache', 'transactions', 'final_leaderboard'
+)
+GAME_KEY_SCAN_COUNT = 500  # Keys per SCAN call when enumerating a game's keys
 
 # ============================================================================
 # PYDANTIC MODELS
 # ============================================================================
 
+# Normalized in pydantic-core while parsing, so handlers always see lowercase values
+LowercaseStr = Annotated[str, StringConstraints(strip_whitespace=True, to_lower=True)]
+
+# Map front-end minion types to backend bot types
+BOT_TYPE_MAP = {
+    'premade': 'random',
+    'custom': 'custom',
+    'hodler': 'mean_reversion',
+    'scalper': 'momentum',
+    'swing': 'momentum',
+    'arbitrage': 'market_maker',
+    'dip': 'mean_reversion',
+    'momentum': 'momentum'
+}
+
 class GameStartRequest(BaseModel):
     gameId: str
     duration: int = Field(default=300, description="Game duration in seconds")
@@ -59,13 +116,13 @@ class GameStartRequest(BaseModel):
 class TradeRequest(BaseModel):
     gameId: str
     userId: str
-    action: str = Field(..., description="'buy' or 'sell'")
+    action: LowercaseStr = Field(..., description="'buy' or 'sell'")
     amount: float = Field(..., gt=0, description="Amount of BC to trade")
 
 class BotRequest(BaseModel):
     gameId: str
     userId: str
-    botType: str = Field(..., description="Type of bot: random, momentum, mean_reversion, market_maker, hedger")
+    botType: LowercaseStr = Field(..., description="Type of bot: random, momentum, mean_reversion, market_maker, hedger")
     parameters: Optional[Dict] = None
 
 class BotToggleRequest(BaseModel):
@@ -76,20 +133,317 @@ class BotToggleRequest(BaseModel):
 class BotBuyRequest(BaseModel):
     gameId: str
     userId: str
-    botType: str = Field(..., description="Type of bot strategy")
+    botType: LowercaseStr = Field(..., description="Type of bot strategy")
     cost: float = Field(..., gt=0, description="Cost in USD")
     botName: Optional[str] = Field(None, description="Display name for the bot (e.g., 'HODL Master')")
     customPrompt: Optional[str] = None
 
+# ============================================================================
+# PLAYER & BOT HELPERS
+# ============================================================================
+
+def _player_balances(player: Dict) -> Tuple[float, float]:
+    """
+    Read (usd, coins) from a player entry.
+    Players created by the front-end use either usd/coins or usdBalance/coinBalance.
+    """
+    usd = float(player.get('usd', player.get('usdBalance', 0)))
+    coins = float(player.get('coins', player.get('coinBalance', 0)))
+    return usd, coins
+
+
+def _set_player_balances(player: Dict, usd: float, coins: Optional[float] = None):
+    """Write balances back under whichever field names the player entry carries"""
+    if 'usd' in player:
+        player['usd'] = usd
+    if 'usdBalance' in player:
+        player['usdBalance'] = usd
+    
+    if coins is not None:
+        if 'coins' in player:
+            player['coins'] = coins
+        if 'coinBalance' in player:
+            player['coinBalance'] = coins
+
+
+def _player_name(player: Dict) -> str:
+    """Display name of a player entry (userName or playerName, whichever is set)"""
+    return player.get('userName') or player.get('playerName') or 'Unknown'
+
+
+def _wealth_leaderboard(players: List[Dict], bots: List[Bot], price: float) -> List[Dict]:
+    """
+    Rank players by wealth at `price`, counting each player's minion balances as theirs.
+    Wealth = (player USD + minion USD) + (player BC + minion BC) * price
+    """
+    # One pass over the bots: user_id -> [minion USD, minion BC]
+    minion_totals: Dict[str, List[float]] = {}
+    for bot in bots:
+        if bot.user_id:
+            totals = minion_totals.setdefault(bot.user_id, [0.0, 0.0])
+            totals[0] += bot.usd
+            totals[1] += bot.bc
+    
+    leaderboard = []
+    for player in players:
+        # Handle both field name conventions (userId/playerId, usd/usdBalance, coins/coinBalance)
+        player_id = player.get('userId') or player.get('playerId')
+        usd_balance, bc_balance = _player_balances(player)
+        minion_usd, minion_bc = minion_totals.get(player_id, (0.0, 0.0))
+        
+        total_usd = usd_balance + minion_usd
+        total_bc = bc_balance + minion_bc
+        leaderboard.append({
+            'userId': player_id,
+            'userName': _player_name(player),
+            'usdBalance': total_usd,  # Include minion balances
+            'coinBalance': total_bc,   # Include minion balances
+            'wealth': total_usd + (total_bc * price)
+        })
+    
+    # Sort by wealth (descending)
+    leaderboard.sort(key=lambda x: x['wealth'], reverse=True)
+    return leaderboard
+
+
+def _find_player(players_json: Optional[Union[str, bytes]], user_id: str) -> Tuple[List[Dict], int, Dict]:
+    """
+    Parse a game's players JSON (the players field of game:{id}) and find one of
+    them (by userId or playerId).
+    
+    Returns:
+        (players, index of the user, the user's entry)
+    
+    Raises:
+        HTTPException(404) if the game or the user doesn't exist
+    """
+    if players_json is None:
+        raise HTTPException(status_code=404, detail="Game not found")
+    
+    players = orjson.loads(players_json)
+    for i, player in enumerate(players):
+        # Check both userId and playerId fields for compatibility
+        if (player.get('userId') or player.get('playerId')) == user_id:
+            return players, i, player
+    
+    raise HTTPException(status_code=404, detail="User not found in game")
+
+
+@dataclass(slots=True)
+class TradeSnapshot:
+    """The market fields and player entry a trade needs, read together"""
+    price: float
+    tick: int
+    dollar_supply: float
+    bc_supply: float
+    players: List[Dict]
+    user_index: int
+    user: Dict
+    players_json: bytes  # The players field as read, for the compare-and-set write-back
+
+
+def _load_trade_snapshot(r, game_id: str, user_id: str) -> TradeSnapshot:
+    """
+    Read everything a trade needs in one MULTI/EXEC round trip: the price, tick and
+    supplies (not the whole market and its price history) plus the game's players.
+    `r` may be a bytes connection (decode_responses=False); every field is parsed directly.
+    
+    Raises:
+        HTTPException(404) if the market, the game or the user doesn't exist
+    """
+    pipe = r.pipeline(transaction=True)
+    pipe.hmget(f"market:{game_id}", 'current_tick', 'dollar_supply', 'bc_supply')
+    pipe.hget(f"market:{game_id}:data", 'current_price')
+    pipe.hget(f"game:{game_id}", 'players')
+    (tick, dollar_supply, bc_supply), price, players_json = pipe.execute()
+    
+    if tick is None or price is None:
+        raise HTTPException(status_code=404, detail="Market not found")
+    
+    players, user_index, user = _find_player(players_json, user_id)
+    return TradeSnapshot(float(price), int(tick), float(dollar_supply), float(bc_supply),
+                         players, user_index, user, players_json)
+
+
+def _players_lock(game_id: str) -> asyncio.Lock:
+    """Lock guarding read-modify-writes of a game's players JSON in this process"""
+    return _player_locks[hash(game_id) % PLAYER_LOCK_STRIPES]
+
+
+async def _retry_locked(game_id: str, label: str, attempt_fn, *args):
+    """
+    Run a blocking players-JSON update, retrying failed attempts with a growing backoff.
+    Each attempt runs on a worker thread under the game's players lock; the backoff is an
+    async sleep with the lock released, so a failing request never holds up the game's
+    other requests (or ties up a thread) while it waits. HTTPExceptions are not retried.
+    The lock only covers this process: attempts write the players back with a
+    compare-and-set and raise WatchError if another worker got there first.
+    
+    attempt_fn is called as attempt_fn(*args, attempt) with a 1-based attempt number.
+    """
+    for attempt in range(1, TRADE_MAX_RETRIES + 1):
+        try:
+            async with _players_lock(game_id):
+                return await asyncio.to_thread(attempt_fn, *args, attempt)
+        except HTTPException:
+            raise
+        except Exception as e:
+            if attempt >= TRADE_MAX_RETRIES:
+                logger.error(f"{label} failed after {TRADE_MAX_RETRIES} retries: {e}")
+                raise HTTPException(status_code=500, detail=str(e))
+            if isinstance(e, WatchError):
+                # Another request or worker changed the players since this attempt read
+                # them; nothing was written, so retry from a fresh read straight away
+                continue
+            logger.warning(f"{label} failed, retrying ({attempt}/{TRADE_MAX_RETRIES}): {e}")
+            # Back off a little longer each time: 0.1s, 0.2s, 0.3s, etc.
+            await asyncio.sleep(0.1 * attempt)
+
+
+def _bot_list_cache_key(game_id: str, user_id: str) -> str:
+    """Redis key caching a user's minion list (invalidated on purchase and toggle)"""
+    return f"bot_list_cache:{game_id}:{user_id}"
+
+
+def _toggled_bot_summary(game_id: str, bot_id: str, user_id: str) -> Optional[Dict]:
+    """
+    Read back a just-toggled minion as Bot.to_dict() would and drop the owner's
+    cached minion list, in one round trip. Only the fields to_dict() needs are
+    read, not the strategy code and parameters.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    r = get_redis_connection()
+    pipe = r.pipeline(transaction=False)
+    pipe.hmget(f"bot:{game_id}:{bot_id}", 'bot_name', 'usd_given', 'usd', 'bc', 'is_toggled')
+    pipe.delete(_bot_list_cache_key(game_id, user_id))
+    (bot_name, usd_given, usd, bc, is_toggled), _ = pipe.execute()
+    
+    if usd is None:
+        return None
+    
+    return {
+        'botId': bot_id,
+        'botName': bot_name or f'Bot_{bot_id[:8]}',
+        'startingUsdBalance': float(usd_given or 0),
+        'usdBalance': float(usd),
+        'coinBalance': float(bc or 0),
+        'isActive': (is_toggled or 'True').lower() == 'true'
+    }
+
+
 # ============================================================================
 # BACKGROUND TASK: MARKET UPDATES
 # ============================================================================
 
-async def run_market_updates(game_id: str, duration: int, update_interval: float):
+def _delete_game_keys(game_id: str) -> int:
+    """
+    Drop every Redis key belonging to a game and return how many were removed.
+    Keys are found with SCAN (never KEYS) and removed with UNLINK, so large
+    histories are freed in a Redis background thread instead of blocking it.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    r = get_redis_connection()
+    pattern_id = re.sub(r'([*?\[\]\\])', r'\\\1', game_id)  # Glob-escape the ID
+    
+    keys = [f"{prefix}:{game_id}" for prefix in GAME_KEY_PREFIXES]
+    for prefix in GAME_KEY_PREFIXES:
+        keys.extend(r.scan_iter(match=f"{prefix}:{pattern_id}:*", count=GAME_KEY_SCAN_COUNT))
+    
+    removed = 0
+    for i in range(0, len(keys), GAME_KEY_SCAN_COUNT):
+        removed += r.unlink(*keys[i:i + GAME_KEY_SCAN_COUNT])
+    return removed
+
+
+def _load_or_create_market(request: GameStartRequest) -> Market:
+    """
+    Load the market for a game from Redis, creating it if it does not exist yet.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    game_id = request.gameId
+    
+    # Try to load existing market
+    market = Market.load_from_redis(game_id)
+    
+    if market is None:
+        # Create new market
+        # Supplies go into the constructor so the new market is written to Redis once
+        market = Market(
+            initial_price=request.initialPrice,
+            game_id=game_id,
+            duration=request.duration,
+            dollar_supply=request.totalUsd,
+            bc_supply=request.totalBc
+        )
+        
+        logger.info(f"Created new market for game {game_id}")
+    else:
+        logger.info(f"Loaded existing market for game {game_id}")
+    
+    return market
+
+
+def _finalize_game(game_id: str):
+    """
+    Mark a finished game as ended, cache its final leaderboard and stop its bots.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    try:
+        r = get_redis_connection()
+        game_key = f"game:{game_id}"
+        
+        # Mark the game ended and read the final price, players and bot IDs in one round trip
+        pipe = r.pipeline(transaction=False)
+        pipe.hset(game_key, "isEnded", "true")
+        pipe.hget(f"market:{game_id}:data", "current_price")
+        pipe.hget(game_key, 'players')
+        pipe.smembers(f"bots:{game_id}")
+        _, price_str, players_json, bot_ids = pipe.execute()
+        
+        # Calculate and cache final leaderboard with final price
+        if price_str is not None:
+            final_price = float(price_str)
+            
+            if players_json is not None:
+                players = orjson.loads(players_json)
+                
+                # Get all bots for the game
+                game_bots = Bot.load_many_from_redis(game_id, bot_ids)
+                
+                # Calculate final leaderboard
+                final_leaderboard = _wealth_leaderboard(players, game_bots, final_price)
+                
+                # Cache final leaderboard permanently (no expiration), with its price in the same hash
+                pipe.hset(f"final_leaderboard:{game_id}", mapping={
+                    'leaderboard': json.dumps(final_leaderboard),
+                    'price': str(final_price)
+                })
+                
+                # Stop all bots for this game (reuse the bots loaded above).
+                # Only the toggle field changes, so write just that - every bot goes out
+                # with the leaderboard cache in one round trip
+                stopped_count = 0
+                key_prefix = f"bot:{game_id}:"
+                for bot in game_bots:
+                    if bot.is_toggled:
+                        bot.is_toggled = False
+                        pipe.hset(key_prefix + bot.bot_id, 'is_toggled', 'False')
+                        stopped_count += 1
+                pipe.execute()
+                
+                logger.info(f"Cached final leaderboard for game {game_id} with {len(final_leaderboard)} players")
+                logger.info(f"Stopped {stopped_count} bots for ended game {game_id}")
+    except Exception as e:
+        logger.error(f"Error marking game {game_id} as ended or caching final leaderboard: {e}")
+
+
+async def run_market_updates(game_id: str, duration: int, update_interval: float, owner: str):
     """
     Background task that updates the market every `update_interval` seconds
     for the specified duration. Optimized to maintain consistent timing.
+    `owner` holds the game's ticker lease, so this is the game's only writer.
     """
+    ttl = lease_ttl(update_interval)
     start_time = time.time()
     end_time = start_time + duration
     update_count = 0
@@ -102,46 +456,37 @@ async def run_market_updates(game_id: str, duration: int, update_interval: float
             update_start = time.time()
             
             try:
-                # Load market from Redis
-                market = await asyncio.to_thread(Market.load_from_redis, game_id)
+                # The whole tick runs in one hop to the tick executor
+                tick = await asyncio.get_running_loop().run_in_executor(
+                    _tick_executor, run_tick, game_id, update_count + 1, owner, ttl
+                )
                 
-                if market is None:
-                    logger.warning(f"Market {game_id} not found in Redis, stopping updates")
+                if tick is None:
+                    logger.warning(f"Market {game_id} not found in Redis or ticker lease lost, stopping updates")
                     break
                 
-                # Update the market (runs in thread pool to avoid blocking)
-                await asyncio.to_thread(market.updateMarket)
-                
                 update_count += 1
                 
                 # Log every 10 updates
                 if update_count % 10 == 0:
                     logger.info(
-                        f"Game {game_id}: Tick {market.current_tick}, "
-                        f"Price ${market.market_data.current_price:.2f}, "
+                        f"Game {game_id}: Tick {tick['current_tick']}, "
+                        f"Price ${tick['current_price']:.2f}, "
                         f"Updates: {update_count}"
                     )
                 
-                # Update game state info
-                if game_id in game_states:
-                    game_states[game_id].update({
-                        'current_tick': market.current_tick,
-                        'current_price': market.market_data.current_price,
-                        'updates_count': update_count,
-                        'last_update': datetime.now().isoformat()
-                    })
-                
             except Exception as e:
                 logger.error(f"Error updating market {game_id}: {e}")
                 # Continue running even if one update fails
             
-            # Calculate sleep time to maintain consistent interval
+            # Sleep until the next scheduled tick so slow ticks don't accumulate drift
             update_elapsed = time.time() - update_start
-            sleep_time = max(0, update_interval - update_elapsed)
+            sleep_time = max(0, next_update_time - time.time())
             
-            # If we're behind schedule, log a warning
+            # If we're behind schedule, log a warning and restart the schedule from now
             if sleep_time == 0:
                 logger.warning(f"Market update took {update_elapsed:.3f}s (longer than interval {update_interval}s)")
+                next_update_time = time.time()
             
             await asyncio.sleep(sleep_time)
             next_update_time += update_interval
@@ -149,95 +494,8 @@ async def run_market_updates(game_id: str, duration: int, update_interval: float
         # Game finished
         logger.info(f"✅ Game {game_id} completed after {duration} seconds, {update_count} updates")
         
-        # Mark game as ended in Redis and cache final leaderboard
-        try:
-            r = await asyncio.to_thread(get_redis_connection)
-            await asyncio.to_thread(r.hset, f"game:{game_id}", "isEnded", "true")
-            
-            # Calculate and cache final leaderboard with final price
-            market = Market.load_from_redis(game_id)
-            if market:
-                final_price = market.market_data.current_price
-                game_data = await asyncio.to_thread(r.hgetall, f"game:{game_id}")
-                
-                if game_data:
-                    import json
-                    players = json.loads(game_data.get('players', '[]'))
-                    
-                    # Get all bots for the game
-                    bots_set_key = f"bots:{game_id}"
-                    bot_ids = await asyncio.to_thread(r.smembers, bots_set_key)
-                    
-                    # Build a map of user_id -> list of bots
-                    user_bots_map = {}
-                    for bot_id_bytes in bot_ids:
-                        bot_id = bot_id_bytes.decode('utf-8') if isinstance(bot_id_bytes, bytes) else bot_id_bytes
-                        bot = Bot.load_from_redis(game_id, bot_id)
-                        if bot and bot.user_id:
-                            if bot.user_id not in user_bots_map:
-                                user_bots_map[bot.user_id] = []
-                            user_bots_map[bot.user_id].append(bot)
-                    
-                    # Calculate final leaderboard
-                    final_leaderboard = []
-                    for player in players:
-                        player_id = player.get('userId') or player.get('playerId')
-                        player_name = player.get('userName') or player.get('playerName', 'Unknown')
-                        
-                        usd_balance = float(player.get('usd', player.get('usdBalance', 0)))
-                        bc_balance = float(player.get('coins', player.get('coinBalance', 0)))
-                        
-                        # Add minion balances
-                        total_minion_usd = 0.0
-                        total_minion_bc = 0.0
-                        if player_id in user_bots_map:
-                            for bot in user_bots_map[player_id]:
-                                total_minion_usd += bot.usd
-                                total_minion_bc += bot.bc
-                        
-                        total_usd = usd_balance + total_minion_usd
-                        total_bc = bc_balance + total_minion_bc
-                        wealth = total_usd + (total_bc * final_price)
-                        
-                        final_leaderboard.append({
-                            'userId': player_id,
-                            'userName': player_name,
-                            'usdBalance': total_usd,
-                            'coinBalance': total_bc,
-                            'wealth': wealth
-                        })
-                    
-                    # Sort by wealth (descending)
-                    final_leaderboard.sort(key=lambda x: x['wealth'], reverse=True)
-                    
-                    # Cache final leaderboard permanently (no expiration)
-                    final_leaderboard_key = f"final_leaderboard:{game_id}"
-                    await asyncio.to_thread(r.set, final_leaderboard_key, json.dumps(final_leaderboard))
-                    await asyncio.to_thread(r.set, f"{final_leaderboard_key}:price", str(final_price))
-                    
-                    logger.info(f"Cached final leaderboard for game {game_id} with {len(final_leaderboard)} players")
-                    
-                    # Stop all bots for this game
-                    bots_set_key = f"bots:{game_id}"
-                    bot_ids = await asyncio.to_thread(r.smembers, bots_set_key)
-                    
-                    stopped_count = 0
-                    for bot_id_bytes in bot_ids:
-                        bot_id = bot_id_bytes.decode('utf-8') if isinstance(bot_id_bytes, bytes) else bot_id_bytes
-                        try:
-                            bot = Bot.load_from_redis(game_id, bot_id)
-                            if bot and bot.is_toggled:
-                                # Turn off the bot
-                                bot.is_toggled = False
-                                bot.save_to_redis(game_id)
-                                stopped_count += 1
-                                logger.debug(f"Stopped bot {bot_id} for ended game {game_id}")
-                        except Exception as bot_error:
-                            logger.warning(f"Error stopping bot {bot_id}: {bot_error}")
-                    
-                    logger.info(f"Stopped {stopped_count} bots for ended game {game_id}")
-        except Exception as e:
-            logger.error(f"Error marking game {game_id} as ended or caching final leaderboard: {e}")
+        # Finalization does a burst of blocking Redis calls, keep it off the event loop
+        await asyncio.to_thread(_finalize_game, game_id)
         
     except asyncio.CancelledError:
         logger.info(f"🛑 Game {game_id} was cancelled after {update_count} updates")
@@ -248,8 +506,12 @@ async def run_market_updates(game_id: str, duration: int, update_interval: float
         # Clean up task reference
         if game_id in active_game_tasks:
             del active_game_tasks[game_id]
-        if game_id in game_states:
-            game_states[game_id]['status'] = 'completed'
+        _leaderboard_snapshots.pop(game_id, None)
+        try:
+            await asyncio.to_thread(save_game_state, game_id, {'status': 'completed'})
+            await asyncio.to_thread(release_ticker, game_id, owner)
+        except Exception as e:
+            logger.warning(f"Could not mark game {game_id} as completed: {e}")
 
 # ============================================================================
 # API ENDPOINTS
@@ -272,30 +534,20 @@ async def start_market_updates(request: GameStartRequest):
             "error": "Market updates already running for this game"
         }
     
-    # Initialize or load market from Redis
+    # A game is ticked by exactly one server process, however many clients ask
+    owner = secrets.token_hex(8)
+    if not await asyncio.to_thread(claim_ticker, game_id, owner, lease_ttl(request.updateInterval)):
+        return {
+            "success": False,
+            "error": "Market updates already running for this game"
+        }
+    
+    # Initialize or load market from Redis (blocking I/O, keep it off the event loop)
     try:
-        # Try to load existing market
-        market = Market.load_from_redis(game_id)
-        
-        if market is None:
-            # Create new market
-            market = Market(
-                initial_price=request.initialPrice,
-                game_id=game_id,
-                duration=request.duration
-            )
-            market.dollar_supply = request.totalUsd
-            market.bc_supply = request.totalBc
-            market.market_data.dollar_supply = request.totalUsd
-            market.market_data.bc_supply = request.totalBc
-            market.save_to_redis()
-            
-            logger.info(f"Created new market for game {game_id}")
-        else:
-            logger.info(f"Loaded existing market for game {game_id}")
+        market = await asyncio.to_thread(_load_or_create_market, request)
         
         # Store game state info
-        game_states[game_id] = {
+        await asyncio.to_thread(save_game_state, game_id, {
             'game_id': game_id,
             'start_time': datetime.now().isoformat(),
             'duration': request.duration,
@@ -304,11 +556,11 @@ async def start_market_updates(request: GameStartRequest):
             'current_tick': market.current_tick,
             'current_price': market.market_data.current_price,
             'updates_count': 0
-        }
+        })
         
         # Start background task
         task = asyncio.create_task(
-            run_market_updates(game_id, request.duration, request.updateInterval)
+            run_market_updates(game_id, request.duration, request.updateInterval, owner)
         )
         active_game_tasks[game_id] = task
         
@@ -324,6 +576,8 @@ async def start_market_updates(request: GameStartRequest):
         
     except Exception as e:
         logger.error(f"Error starting market updates for {game_id}: {e}")
+        if game_id not in active_game_tasks:
+            await asyncio.to_thread(release_ticker, game_id, owner)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -347,8 +601,7 @@ async def stop_market_updates(game_id: str):
         pass
     
     # Update game state
-    if game_id in game_states:
-        game_states[game_id]['status'] = 'stopped'
+    await asyncio.to_thread(save_game_state, game_id, {'status': 'stopped'})
     
     logger.info(f"Stopped market updates for game {game_id}")
     
@@ -358,6 +611,34 @@ async def stop_market_updates(game_id: str):
     }
 
 
+@app.delete("/api/game/{game_id}")
+async def delete_game(game_id: str):
+    """
+    Delete a game: stop its market updates and free all of its Redis keys.
+    """
+    task = active_game_tasks.get(game_id)
+    if task is not None:
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+    _leaderboard_snapshots.pop(game_id, None)
+    
+    # Hold the players lock so no trade is mid-write - one finishing after the
+    # delete would recreate the game's keys
+    async with _players_lock(game_id):
+        removed = await asyncio.to_thread(_delete_game_keys, game_id)
+    
+    logger.info(f"Deleted game {game_id} ({removed} Redis keys)")
+    
+    return {
+        "success": True,
+        "message": f"Game {game_id} deleted",
+        "keysDeleted": removed
+    }
+
+
 @app.get("/api/game/market-status/{game_id}")
 async def get_market_status(game_id: str):
     """
@@ -365,57 +646,135 @@ async def get_market_status(game_id: str):
     """
     is_active = game_id in active_game_tasks and not active_game_tasks[game_id].done()
     
-    # Get market data from Redis
-    market = Market.load_from_redis(game_id)
+    response = await asyncio.to_thread(_get_market_status, game_id)
+    response["isActive"] = is_active
     
+    # The body is already JSON-native, so hand it straight to orjson and skip
+    # FastAPI's jsonable_encoder walk (the other hot endpoints do the same)
+    return ORJSONResponse(response)
+
+
+def _get_market_status(game_id: str) -> Dict:
+    """
+    Build the market-status snapshot from the market's scalar fields and the game
+    state, in one round trip. The price history is never read or parsed.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    r = get_redis_connection()
+    
+    pipe = r.pipeline(transaction=False)
+    pipe.hmget(f"market:{game_id}", 'current_tick', 'dollar_supply', 'bc_supply', 'start_time',
+               'event_tick', 'event_time', 'event_title', 'event_triggered')
+    pipe.hmget(f"market:{game_id}:data", 'current_price', 'volatility')
+    pipe.hgetall(game_state_key(game_id))
+    market_fields, (current_price, volatility), state = pipe.execute()
+    (current_tick, dollar_supply, bc_supply, start_time,
+     event_tick, event_time, event_title, event_triggered) = market_fields
+    
+    market_exists = current_tick is not None and current_price is not None
     response = {
         "gameId": game_id,
-        "isActive": is_active,
-        "marketExists": market is not None
+        "marketExists": market_exists
     }
     
-    if game_id in game_states:
-        response.update(game_states[game_id])
+    response.update(decode_game_state(state))
     
-    if market:
+    if market_exists:
+        current_tick = int(current_tick)
+        event_tick = int(event_tick or 150)
         response.update({
-            "currentTick": market.current_tick,
-            "currentPrice": market.market_data.current_price,
-            "volatility": market.market_data.volatility,
-            "dollarSupply": market.dollar_supply,
-            "bcSupply": market.bc_supply,
-            "priceHistoryLength": len(market.market_data.price_history),
-            "eventTick": market.event_tick,
-            "eventTime": market.event_time.isoformat(),
-            "eventTitle": market.event_title,
-            "eventTriggered": market.event_triggered
+            "currentTick": current_tick,
+            "currentPrice": float(current_price),
+            "volatility": float(volatility),
+            "dollarSupply": float(dollar_supply),
+            "bcSupply": float(bc_supply),
+            # One price is kept per tick (including tick 0), up to the history cap
+            "priceHistoryLength": min(current_tick + 1, PriceHistory.MAX_LENGTH),
+            "eventTick": event_tick,
+            "eventTime": event_time or (datetime.fromisoformat(start_time)
+                                        + timedelta(seconds=event_tick)).isoformat(),
+            "eventTitle": event_title or "Market Event",
+            "eventTriggered": (event_triggered or "false").lower() == "true"
         })
     
     return response
 
 
 @app.get("/api/game/market-data/{game_id}")
-async def get_market_data(game_id: str, history_limit: int = 100):
+async def get_market_data(game_id: str, history_limit: int = 100, since_tick: Optional[int] = None,
+                          refresh: bool = False):
     """
     Get current market data including price history.
+    Pass since_tick to get only the prices recorded after that tick (still capped
+    at history_limit); historyStartTick is the tick of the first returned price.
+    Responses are cached for the current tick; pass refresh=true to rebuild.
+    """
+    body = await asyncio.to_thread(_get_market_data_json, game_id, history_limit, refresh, since_tick)
+    
+    if body is None:
+        raise HTTPException(status_code=404, detail="Market not found")
+    
+    return Response(content=body, media_type="application/json")
+
+
+def _get_market_data_json(game_id: str, history_limit: int, refresh: bool,
+                          since_tick: Optional[int] = None) -> Optional[bytes]:
+    """
+    Return the serialized market-data response, building it at most once per tick.
+    The cache key includes the tick, so a new tick naturally misses the old entry.
+    Incremental (since_tick) responses differ per client, so they skip the cache.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    if since_tick is not None:
+        response = _build_market_data(game_id, history_limit, since_tick)
+        return None if response is None else orjson.dumps(response)
+    
+    # The cached body goes back out as-is, so keep it as bytes
+    r = get_redis_connection(decode_responses=False)
+    
+    current_tick = r.hget(f"market:{game_id}", "current_tick")
+    if current_tick is None:
+        return None
+    
+    cache_key = f"market_data_cache:{game_id}:{int(current_tick)}:{history_limit}"
+    if not refresh:
+        cached = r.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    response = _build_market_data(game_id, history_limit)
+    if response is None:
+        return None
+    
+    body = orjson.dumps(response)
+    r.set(cache_key, body, ex=MARKET_DATA_CACHE_TTL)
+    return body
+
+
+def _build_market_data(game_id: str, history_limit: int, since_tick: Optional[int] = None) -> Optional[Dict]:
+    """
+    Build the market-data response from Redis.
+    Blocking - call through asyncio.to_thread() from async code.
     """
     from news_helper import get_random_generic_news, load_generic_news
     
     market = Market.load_from_redis(game_id)
     
     if not market:
-        raise HTTPException(status_code=404, detail="Market not found")
+        return None
     
-    # Get recent price history
-    price_history = market.market_data.price_history[-history_limit:] if len(market.market_data.price_history) > history_limit else market.market_data.price_history
+    # Get recent price history (one price per tick), only past since_tick if given
+    count = history_limit
+    if since_tick is not None:
+        count = max(0, min(count, market.current_tick - since_tick))
+    price_history = market.market_data.price_history.tail(count).tolist()
     
     # Get generic news if no event is triggered
     # Always provide generic news - it will be shown when event is not active
     generic_news = get_random_generic_news() if not market.event_triggered else get_random_generic_news()
     
-    # Also provide all headlines for client-side rotation
-    # Create a new list to ensure fresh data and avoid reference issues
-    all_headlines = list(load_generic_news())  # Create new list instance
+    # Also provide all headlines for client-side rotation (already a fresh list)
+    all_headlines = load_generic_news()
     
     return {
         "gameId": game_id,
@@ -425,6 +784,7 @@ async def get_market_data(game_id: str, history_limit: int = 100):
         "dollarSupply": market.dollar_supply,
         "bcSupply": market.bc_supply,
         "priceHistory": price_history,
+        "historyStartTick": market.current_tick + 1 - len(price_history),
         "startTime": market.start_time.isoformat(),
         "eventTick": market.event_tick,
         "eventTime": market.event_time.isoformat(),
@@ -435,6 +795,69 @@ async def get_market_data(game_id: str, history_limit: int = 100):
     }
 
 
+@app.websocket("/ws/{game_id}")
+async def market_ticks_ws(websocket: WebSocket, game_id: str):
+    """
+    Stream per-tick market deltas ({tick, price, volatility}) for a game, until the
+    client disconnects or the game stops ticking.
+    Clients that can't hold a socket keep polling /api/game/market-data.
+    """
+    await websocket.accept()
+    
+    r = get_async_redis_connection()
+    pubsub = r.pubsub()
+    await pubsub.subscribe(tick_channel(game_id))
+    
+    # Listen on the socket alongside the pubsub, so a client leaving between ticks
+    # is noticed right away rather than on the next failed send
+    receive = asyncio.ensure_future(websocket.receive())
+    read = None
+    client_left = False
+    try:
+        while await _game_is_running(r, game_id):
+            if read is None:
+                read = asyncio.ensure_future(pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0))
+            done, _ = await asyncio.wait({receive, read}, return_when=asyncio.FIRST_COMPLETED)
+            
+            if receive in done:
+                if receive.result()["type"] == "websocket.disconnect":
+                    client_left = True
+                    break
+                # Anything the client sends is ignored
+                receive = asyncio.ensure_future(websocket.receive())
+            
+            if read in done:
+                message = read.result()
+                read = None
+                if message is not None:
+                    await websocket.send_text(message["data"])
+    except WebSocketDisconnect:
+        client_left = True
+    except Exception as e:
+        logger.warning(f"Tick stream for game {game_id} closed: {e}")
+    finally:
+        pending = [task for task in (receive, read) if task is not None]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        
+        await pubsub.unsubscribe(tick_channel(game_id))
+        await pubsub.aclose()
+        await r.aclose()
+        
+        if not client_left:
+            try:
+                await websocket.close()
+            except Exception:
+                pass
+
+
+async def _game_is_running(r, game_id: str) -> bool:
+    """Whether the game's state says it is still ticking (False once ended, stopped or unknown)"""
+    status = await r.hget(game_state_key(game_id), 'status')
+    return status is not None and json.loads(status) == 'running'
+
+
 @app.post("/api/game/buy-coins")
 async def buy_coins(request: TradeRequest):
     """
@@ -444,160 +867,106 @@ async def buy_coins(request: TradeRequest):
     if request.action != "buy":
         raise HTTPException(status_code=400, detail="Use sell-coins endpoint for sell trades")
     
-    # Retry loop - keep trying until transaction succeeds
-    max_retries = 100  # Prevent infinite loops
-    retry_count = 0
+    return ORJSONResponse(await _retry_locked(request.gameId, "Buy trade", _buy_coins, request))
+
+
+def _buy_coins(request: TradeRequest, attempt: int):
+    """
+    One attempt at buy_coins; the caller holds the game's players lock and retries failures.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    r = get_redis_connection(decode_responses=False)
     
-    while retry_count < max_retries:
-        try:
-            # Load market to get current price (reload each retry to get fresh price)
-            market = Market.load_from_redis(request.gameId)
-            if not market:
-                raise HTTPException(status_code=404, detail="Market not found")
-            
-            current_price = market.market_data.current_price
-            
-            # Get user wallet from Redis (using existing front-end structure)
-            r = get_redis_connection()
-            game_data = r.hgetall(f"game:{request.gameId}")
-            
-            if not game_data:
-                raise HTTPException(status_code=404, detail="Game not found")
-            
-            import json
-            players = json.loads(game_data.get('players', '[]'))
-            
-            # Find the user (handle both userId and playerId fields)
-            user_data = None
-            user_index = None
-            for i, player in enumerate(players):
-                # Check both userId and playerId fields for compatibility
-                player_id = player.get('userId') or player.get('playerId')
-                if player_id == request.userId:
-                    user_data = player
-                    user_index = i
-                    break
-            
-            if not user_data:
-                raise HTTPException(status_code=404, detail="User not found in game")
-            
-            # Calculate trade
-            cost = request.amount * current_price
-            
-            # Check balance (handle both field name conventions) - ONLY use user's balances (not minion balances)
-            # Convert to float in case Redis returns strings
-            user_usd = float(user_data.get('usd', user_data.get('usdBalance', 0)))
-            user_coins = float(user_data.get('coins', user_data.get('coinBalance', 0)))
-            
-            # Validate market supply - check if there's enough BC to buy
-            if market.bc_supply < request.amount:
-                return {
-                    "success": False,
-                    "message": f"Insufficient BC supply. Available: {market.bc_supply:.2f}, Requested: {request.amount:.2f}",
-                    "newUsd": user_usd,
-                    "newCoins": user_coins
-                }
-            
-            # Check for sufficient funds - silently fail if insufficient (don't raise exception)
-            if user_usd < cost:
-                return {
-                    "success": False,
-                    "message": "Insufficient USD",
-                    "newUsd": user_usd,
-                    "newCoins": user_coins
-                }
-            
-            # Calculate expected balances after transaction
-            expected_usd = max(0.0, user_usd - cost)
-            expected_coins = max(0.0, user_coins + request.amount)
-            
-            # Check if transaction was already applied (prevents double-processing on retry)
-            # If balances already match expected values, transaction was already completed
-            current_usd_check = float(user_data.get('usd', user_data.get('usdBalance', 0)))
-            current_coins_check = float(user_data.get('coins', user_data.get('coinBalance', 0)))
-            if abs(current_usd_check - expected_usd) < 0.01 and abs(current_coins_check - expected_coins) < 0.01:
-                # Transaction already applied, return success with current balances
-                logger.info(f"Transaction already applied for user {request.userId}, returning current state")
-                return {
-                    "success": True,
-                    "action": "buy",
-                    "amount": request.amount,
-                    "cost": cost,
-                    "price": current_price,
-                    "newUsd": current_usd_check,
-                    "newCoins": current_coins_check
-                }
-            
-            # Execute trade (update both field name conventions) - prevent negative balances - ONLY update user's balances
-            if 'usd' in user_data:
-                user_data['usd'] = expected_usd
-            if 'usdBalance' in user_data:
-                user_data['usdBalance'] = expected_usd
-            
-            if 'coins' in user_data:
-                user_data['coins'] = expected_coins
-            if 'coinBalance' in user_data:
-                user_data['coinBalance'] = expected_coins
-            user_data['lastInteractionT'] = datetime.now().isoformat()
-            user_data['lastInteractionV'] = market.current_tick
-            
-            # Update market supplies (ensure non-negative)
-            market.dollar_supply = max(0.0, market.dollar_supply + cost)
-            market.bc_supply = max(0.0, market.bc_supply - request.amount)
-            market.save_to_redis()
-            
-            # Update user in Redis
-            players[user_index] = user_data
-            r.hset(f"game:{request.gameId}", "players", json.dumps(players))
-            
-            # NOTE: Removed interactions counter - using TransactionHistory instead
-            # ⚠️ DO NOT write to 'interactions' field here - it's now an ARRAY maintained by TransactionHistory
-            # The old code was overwriting the array with an integer, destroying all transaction history!
-            
-            # Record transaction in history
-            TransactionHistory.add_transaction(request.gameId, {
-                'type': 'buy',
-                'actor': request.userId,
-                'actor_name': user_data.get('userName', user_data.get('playerName', 'Unknown')),
-                'amount': request.amount,
-                'price': current_price,
-                'total_cost': cost,
-                'timestamp': datetime.now().isoformat(),
-                'is_bot': False
-            })
-            
-            logger.info(f"User {request.userId} bought {request.amount} BC for ${cost:.2f} (attempt {retry_count + 1})")
-            
-            # Get updated balances (handle both field name conventions)
-            # Use the values we just set to ensure consistency
-            updated_usd = user_data.get('usd', user_data.get('usdBalance', 0))
-            updated_coins = user_data.get('coins', user_data.get('coinBalance', 0))
-            # Convert to float to ensure numeric type (not string from Redis)
-            updated_usd = float(updated_usd) if updated_usd is not None else 0.0
-            updated_coins = float(updated_coins) if updated_coins is not None else 0.0
-            
-            return {
-                "success": True,
-                "action": "buy",
-                "amount": request.amount,
-                "cost": cost,
-                "price": current_price,
-                "newUsd": updated_usd,
-                "newCoins": updated_coins
-            }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            retry_count += 1
-            if retry_count >= max_retries:
-                logger.error(f"Error executing buy trade after {max_retries} retries: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
-            # Wait a short time before retrying (exponential backoff)
-            import asyncio
-            await asyncio.sleep(0.1 * retry_count)  # 0.1s, 0.2s, 0.3s, etc.
-            logger.warning(f"Buy trade failed, retrying ({retry_count}/{max_retries}): {e}")
-            continue
+    # Price, supplies and the user's wallet in one round trip (re-read each retry for a fresh price)
+    snapshot = _load_trade_snapshot(r, request.gameId, request.userId)
+    current_price = snapshot.price
+    players, user_index, user_data = snapshot.players, snapshot.user_index, snapshot.user
+    
+    # Calculate trade
+    cost = request.amount * current_price
+    
+    # Check balance (handle both field name conventions) - ONLY use user's balances (not minion balances)
+    # Convert to float in case Redis returns strings
+    user_usd, user_coins = _player_balances(user_data)
+    
+    # Validate market supply - check if there's enough BC to buy
+    if snapshot.bc_supply < request.amount:
+        return {
+            "success": False,
+            "message": f"Insufficient BC supply. Available: {snapshot.bc_supply:.2f}, Requested: {request.amount:.2f}",
+            "newUsd": user_usd,
+            "newCoins": user_coins
+        }
+    
+    # Check for sufficient funds - silently fail if insufficient (don't raise exception)
+    if user_usd < cost:
+        return {
+            "success": False,
+            "message": "Insufficient USD",
+            "newUsd": user_usd,
+            "newCoins": user_coins
+        }
+    
+    # Calculate expected balances after transaction
+    expected_usd = max(0.0, user_usd - cost)
+    expected_coins = max(0.0, user_coins + request.amount)
+    
+    # Check if transaction was already applied (prevents double-processing on retry)
+    # If balances already match expected values, transaction was already completed
+    if abs(user_usd - expected_usd) < 0.01 and abs(user_coins - expected_coins) < 0.01:
+        # Transaction already applied, return success with current balances
+        logger.info(f"Transaction already applied for user {request.userId}, returning current state")
+        return {
+            "success": True,
+            "action": "buy",
+            "amount": request.amount,
+            "cost": cost,
+            "price": current_price,
+            "newUsd": user_usd,
+            "newCoins": user_coins
+        }
+    
+    # Execute trade (update both field name conventions) - prevent negative balances - ONLY update user's balances
+    _set_player_balances(user_data, expected_usd, expected_coins)
+    user_data['lastInteractionT'] = datetime.now().isoformat()
+    user_data['lastInteractionV'] = snapshot.tick
+    
+    # Update market supplies and the user's wallet in one atomic round trip. The wallet is
+    # only written if no other request (in any worker) changed the players since the read;
+    # if one did, WatchError makes the caller retry from a fresh read.
+    players[user_index] = user_data
+    if adjust_market_supplies(request.gameId, cost, -request.amount,
+                              also_hset=(f"game:{request.gameId}", "players", orjson.dumps(players)),
+                              expected=snapshot.players_json) is None:
+        raise HTTPException(status_code=404, detail="Market not found")
+    
+    # NOTE: Removed interactions counter - using TransactionHistory instead
+    # ⚠️ DO NOT write to 'interactions' field here - it's now an ARRAY maintained by TransactionHistory
+    # The old code was overwriting the array with an integer, destroying all transaction history!
+    
+    # Record transaction in history
+    TransactionHistory.add_transaction(request.gameId, {
+        'type': 'buy',
+        'actor': request.userId,
+        'actor_name': _player_name(user_data),
+        'amount': request.amount,
+        'price': current_price,
+        'total_cost': cost,
+        'timestamp': datetime.now().isoformat(),
+        'is_bot': False
+    })
+    
+    logger.info(f"User {request.userId} bought {request.amount} BC for ${cost:.2f} (attempt {attempt})")
+    
+    return {
+        "success": True,
+        "action": "buy",
+        "amount": request.amount,
+        "cost": cost,
+        "price": current_price,
+        "newUsd": expected_usd,
+        "newCoins": expected_coins
+    }
 
 
 @app.post("/api/game/sell-coins")
@@ -610,169 +979,116 @@ async def sell_coins(request: TradeRequest):
     if request.action != "sell":
         raise HTTPException(status_code=400, detail="Use buy-coins endpoint for buy trades")
     
-    # Retry loop - keep trying until transaction succeeds
-    max_retries = 100  # Prevent infinite loops
-    retry_count = 0
+    return ORJSONResponse(await _retry_locked(request.gameId, "Sell trade", _sell_coins, request))
+
+
+def _sell_coins(request: TradeRequest, attempt: int):
+    """
+    One attempt at sell_coins; the caller holds the game's players lock and retries failures.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    r = get_redis_connection(decode_responses=False)
     
-    while retry_count < max_retries:
-        try:
-            # Load market to get current price (reload each retry to get fresh price)
-            market = Market.load_from_redis(request.gameId)
-            if not market:
-                raise HTTPException(status_code=404, detail="Market not found")
-            
-            current_price = market.market_data.current_price
-            
-            # Get user wallet from Redis
-            r = get_redis_connection()
-            game_data = r.hgetall(f"game:{request.gameId}")
-            
-            if not game_data:
-                raise HTTPException(status_code=404, detail="Game not found")
-            
-            import json
-            players = json.loads(game_data.get('players', '[]'))
-            
-            # Find the user (handle both userId and playerId fields)
-            user_data = None
-            user_index = None
-            for i, player in enumerate(players):
-                # Check both userId and playerId fields for compatibility
-                player_id = player.get('userId') or player.get('playerId')
-                if player_id == request.userId:
-                    user_data = player
-                    user_index = i
-                    break
-            
-            if not user_data:
-                raise HTTPException(status_code=404, detail="User not found in game")
-            
-            # Check balance (handle both field name conventions)
-            # Convert to float in case Redis returns strings
-            user_usd = float(user_data.get('usd', user_data.get('usdBalance', 0)))
-            user_coins = float(user_data.get('coins', user_data.get('coinBalance', 0)))
-            
-            # If trying to sell more than available, sell all available coins
-            actual_amount = min(request.amount, user_coins)
-            
-            if actual_amount <= 0:
-                return {
-                    "success": False,
-                    "message": "No BC to sell",
-                    "newUsd": user_usd,
-                    "newCoins": user_coins
-                }
-            
-            # Validate market supply - check if there's enough USD supply to cover the sale
-            revenue = actual_amount * current_price
-            if market.dollar_supply < revenue:
-                # Adjust actual_amount to what market can afford
-                max_affordable_amount = market.dollar_supply / current_price if current_price > 0 else 0
-                actual_amount = min(actual_amount, max_affordable_amount)
-                revenue = actual_amount * current_price
-                
-                if actual_amount <= 0:
-                    return {
-                        "success": False,
-                        "message": "Insufficient USD supply in market to complete sale",
-                        "newUsd": user_usd,
-                        "newCoins": user_coins
-                    }
-            
-            # Calculate expected balances after transaction
-            expected_usd = max(0.0, user_usd + revenue)
-            expected_coins = max(0.0, user_coins - actual_amount)
-            
-            # Check if transaction was already applied (prevents double-processing on retry)
-            # If balances already match expected values, transaction was already completed
-            current_usd_check = float(user_data.get('usd', user_data.get('usdBalance', 0)))
-            current_coins_check = float(user_data.get('coins', user_data.get('coinBalance', 0)))
-            if abs(current_usd_check - expected_usd) < 0.01 and abs(current_coins_check - expected_coins) < 0.01:
-                # Transaction already applied, return success with current balances
-                logger.info(f"Transaction already applied for user {request.userId}, returning current state")
-                return {
-                    "success": True,
-                    "action": "sell",
-                    "amount": actual_amount,
-                    "revenue": revenue,
-                    "price": current_price,
-                    "newUsd": current_usd_check,
-                    "newCoins": current_coins_check
-                }
-            
-            # Execute trade (update both field name conventions) - prevent negative balances
-            # Use the already-converted float values to ensure type consistency
-            if 'coins' in user_data:
-                user_data['coins'] = expected_coins
-            if 'coinBalance' in user_data:
-                user_data['coinBalance'] = expected_coins
-            
-            if 'usd' in user_data:
-                user_data['usd'] = expected_usd
-            if 'usdBalance' in user_data:
-                user_data['usdBalance'] = expected_usd
-            
-            user_data['lastInteractionT'] = datetime.now().isoformat()
-            user_data['lastInteractionV'] = market.current_tick
-            user_data['lastInteractionTime'] = user_data['lastInteractionT']
-            user_data['lastInteractionValue'] = actual_amount
-            
-            # Update market supplies (use actual_amount, not request.amount, ensure non-negative)
-            market.dollar_supply = max(0.0, market.dollar_supply - revenue)
-            market.bc_supply = max(0.0, market.bc_supply + actual_amount)
-            market.save_to_redis()
-            
-            # Update user in Redis
-            players[user_index] = user_data
-            r.hset(f"game:{request.gameId}", "players", json.dumps(players))
-            
-            # NOTE: Removed interactions counter - using TransactionHistory instead
-            # ⚠️ DO NOT write to 'interactions' field here - it's now an ARRAY maintained by TransactionHistory
-            # The old code was overwriting the array with an integer, destroying all transaction history!
-            
-            # Record transaction in history (use actual_amount)
-            TransactionHistory.add_transaction(request.gameId, {
-                'type': 'sell',
-                'actor': request.userId,
-                'actor_name': user_data.get('userName', user_data.get('playerName', 'Unknown')),
-                'amount': actual_amount,
-                'price': current_price,
-                'total_cost': revenue,
-                'timestamp': datetime.now().isoformat(),
-                'is_bot': False
-            })
-            
-            logger.info(f"User {request.userId} sold {actual_amount} BC for ${revenue:.2f} (requested {request.amount}, attempt {retry_count + 1})")
-            
-            # Get updated balances (use the values we just set to ensure consistency)
-            updated_usd = user_data.get('usd', user_data.get('usdBalance', 0))
-            updated_coins = user_data.get('coins', user_data.get('coinBalance', 0))
-            # Convert to float to ensure numeric type (not string from Redis)
-            updated_usd = float(updated_usd) if updated_usd is not None else 0.0
-            updated_coins = float(updated_coins) if updated_coins is not None else 0.0
-            
+    # Price, supplies and the user's wallet in one round trip (re-read each retry for a fresh price)
+    snapshot = _load_trade_snapshot(r, request.gameId, request.userId)
+    current_price = snapshot.price
+    players, user_index, user_data = snapshot.players, snapshot.user_index, snapshot.user
+    
+    # Check balance (handle both field name conventions)
+    # Convert to float in case Redis returns strings
+    user_usd, user_coins = _player_balances(user_data)
+    
+    # If trying to sell more than available, sell all available coins
+    actual_amount = min(request.amount, user_coins)
+    
+    if actual_amount <= 0:
+        return {
+            "success": False,
+            "message": "No BC to sell",
+            "newUsd": user_usd,
+            "newCoins": user_coins
+        }
+    
+    # Validate market supply - check if there's enough USD supply to cover the sale
+    revenue = actual_amount * current_price
+    if snapshot.dollar_supply < revenue:
+        # Adjust actual_amount to what market can afford
+        max_affordable_amount = snapshot.dollar_supply / current_price if current_price > 0 else 0
+        actual_amount = min(actual_amount, max_affordable_amount)
+        revenue = actual_amount * current_price
+        
+        if actual_amount <= 0:
             return {
-                "success": True,
-                "action": "sell",
-                "amount": actual_amount,
-                "revenue": revenue,
-                "price": current_price,
-                "newUsd": updated_usd,
-                "newCoins": updated_coins
+                "success": False,
+                "message": "Insufficient USD supply in market to complete sale",
+                "newUsd": user_usd,
+                "newCoins": user_coins
             }
-            
-        except HTTPException:
-            raise
-        except Exception as e:
-            retry_count += 1
-            if retry_count >= max_retries:
-                logger.error(f"Error executing sell trade after {max_retries} retries: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
-            # Wait a short time before retrying (exponential backoff)
-            import asyncio
-            await asyncio.sleep(0.1 * retry_count)  # 0.1s, 0.2s, 0.3s, etc.
-            logger.warning(f"Sell trade failed, retrying ({retry_count}/{max_retries}): {e}")
-            continue
+    
+    # Calculate expected balances after transaction
+    expected_usd = max(0.0, user_usd + revenue)
+    expected_coins = max(0.0, user_coins - actual_amount)
+    
+    # Check if transaction was already applied (prevents double-processing on retry)
+    # If balances already match expected values, transaction was already completed
+    if abs(user_usd - expected_usd) < 0.01 and abs(user_coins - expected_coins) < 0.01:
+        # Transaction already applied, return success with current balances
+        logger.info(f"Transaction already applied for user {request.userId}, returning current state")
+        return {
+            "success": True,
+            "action": "sell",
+            "amount": actual_amount,
+            "revenue": revenue,
+            "price": current_price,
+            "newUsd": user_usd,
+            "newCoins": user_coins
+        }
+    
+    # Execute trade (update both field name conventions) - prevent negative balances
+    # Use the already-converted float values to ensure type consistency
+    _set_player_balances(user_data, expected_usd, expected_coins)
+    
+    user_data['lastInteractionT'] = datetime.now().isoformat()
+    user_data['lastInteractionV'] = snapshot.tick
+    user_data['lastInteractionTime'] = user_data['lastInteractionT']
+    user_data['lastInteractionValue'] = actual_amount
+    
+    # Update market supplies (use actual_amount, not request.amount) and the user's
+    # wallet in one atomic round trip, unless another request changed the players since
+    # the read (WatchError; the caller retries from a fresh read)
+    players[user_index] = user_data
+    if adjust_market_supplies(request.gameId, -revenue, actual_amount,
+                              also_hset=(f"game:{request.gameId}", "players", orjson.dumps(players)),
+                              expected=snapshot.players_json) is None:
+        raise HTTPException(status_code=404, detail="Market not found")
+    
+    # NOTE: Removed interactions counter - using TransactionHistory instead
+    # ⚠️ DO NOT write to 'interactions' field here - it's now an ARRAY maintained by TransactionHistory
+    # The old code was overwriting the array with an integer, destroying all transaction history!
+    
+    # Record transaction in history (use actual_amount)
+    TransactionHistory.add_transaction(request.gameId, {
+        'type': 'sell',
+        'actor': request.userId,
+        'actor_name': _player_name(user_data),
+        'amount': actual_amount,
+        'price': current_price,
+        'total_cost': revenue,
+        'timestamp': datetime.now().isoformat(),
+        'is_bot': False
+    })
+    
+    logger.info(f"User {request.userId} sold {actual_amount} BC for ${revenue:.2f} (requested {request.amount}, attempt {attempt})")
+    
+    return {
+        "success": True,
+        "action": "sell",
+        "amount": actual_amount,
+        "revenue": revenue,
+        "price": current_price,
+        "newUsd": expected_usd,
+        "newCoins": expected_coins
+    }
 
 
 @app.post("/api/bot/buy")
@@ -781,175 +1097,117 @@ async def buy_bot(request: BotBuyRequest):
     Purchase a minion for a user.
     Retries until success if transaction fails, but only if user has sufficient funds.
     """
-    # Retry loop - keep trying until transaction succeeds
-    max_retries = 100  # Prevent infinite loops
-    retry_count = 0
+    # Minion ID for this purchase, drawn once so every retry reuses it.
+    # It stays unguessable (toggle takes it straight from the request), but costs one C call.
+    bot_id = secrets.token_hex(16)
+    
+    # Generate custom strategy code if minion type is custom. This is a slow LLM call,
+    # so it runs once here rather than inside the players lock on every retry.
+    custom_strategy_code = None
+    if BOT_TYPE_MAP.get(request.botType, 'random') == 'custom':
+        if not request.customPrompt:
+            raise HTTPException(status_code=400, detail="Custom prompt required for custom minion type")
     
-    while retry_count < max_retries:
+        logger.info(f"Generating custom strategy for prompt: {request.customPrompt[:100]}...")
         try:
-            # Get user wallet from Redis (reload each retry to get fresh data)
-            r = get_redis_connection()
-            game_data = r.hgetall(f"game:{request.gameId}")
-            
-            if not game_data:
-                raise HTTPException(status_code=404, detail="Game not found")
-            
-            import json
-            players = json.loads(game_data.get('players', '[]'))
-            
-            # Find the user (handle both userId and playerId fields)
-            user_data = None
-            user_index = None
-            for i, player in enumerate(players):
-                # Check both userId and playerId fields for compatibility
-                player_id = player.get('userId') or player.get('playerId')
-                if player_id == request.userId:
-                    user_data = player
-                    user_index = i
-                    break
-            
-            if not user_data:
-                raise HTTPException(status_code=404, detail="User not found in game")
-            
-            # Check if user has enough USD (handle both usd and usdBalance fields)
-            # This check happens on each retry to ensure funds are still sufficient
-            # Convert to float in case Redis returns strings
-            user_usd = float(user_data.get('usd', user_data.get('usdBalance', 0)))
-            if user_usd < float(request.cost):
-                raise HTTPException(status_code=400, detail="Insufficient USD")
-            
-            # Map front-end minion types to backend bot types
-            bot_type_map = {
-                'premade': 'random',
-                'custom': 'custom',
-                'hodler': 'mean_reversion',
-                'scalper': 'momentum',
-                'swing': 'momentum',
-                'arbitrage': 'market_maker',
-                'dip': 'mean_reversion',
-                'momentum': 'momentum'
-            }
-            
-            backend_bot_type = bot_type_map.get(request.botType, 'random')
-            
-            # Generate custom strategy code if minion type is custom
-            custom_strategy_code = None
-            if backend_bot_type == 'custom':
-                if not request.customPrompt:
-                    raise HTTPException(status_code=400, detail="Custom prompt required for custom minion type")
-                
-                logger.info(f"Generating custom strategy for prompt: {request.customPrompt[:100]}...")
-                try:
-                    custom_strategy_code = generate_custom_bot_strategy(request.customPrompt)
-                    logger.info(f"Generated custom strategy code ({len(custom_strategy_code)} chars)")
-                except Exception as e:
-                    logger.error(f"Failed to generate custom strategy: {e}")
-                    raise HTTPException(status_code=500, detail=f"Failed to generate custom strategy: {str(e)}")
-            
-            # Deduct cost from user FIRST (before minion creation) - prevent negative balances
-            # Use float conversion to ensure proper numeric operations
-            cost_float = float(request.cost)
-            if 'usd' in user_data:
-                user_data['usd'] = max(0.0, user_usd - cost_float)
-            if 'usdBalance' in user_data:
-                user_data['usdBalance'] = max(0.0, user_usd - cost_float)
-            
-            # Add minion entry to user's bots list
-            if 'bots' not in user_data:
-                user_data['bots'] = []
-            
-            # Generate temporary minion ID for the entry
-            import uuid
-            bot_id = str(uuid.uuid4())
-            
-            # Use the display name if provided, otherwise fall back to bot type
-            display_name = request.botName if request.botName else backend_bot_type
-            
-            user_data['bots'].append({
-                'botId': bot_id,
-                'botName': display_name
-            })
-            
-            logger.info(f"After adding minion, user has {len(user_data['bots'])} minions: {user_data['bots']}")
-            logger.info(f"User index: {user_index}, Total players: {len(players)}")
-            
-            # Update players in Redis FIRST
-            players[user_index] = user_data
-            players_json = json.dumps(players)
-            logger.info(f"About to save. players[{user_index}]['bots'] = {players[user_index].get('bots', [])}")
-            logger.info(f"Full players array: {players}")
-            r.hset(f"game:{request.gameId}", "players", players_json)
-            
-            # Verify the save worked
-            saved_data = r.hget(f"game:{request.gameId}", "players")
-            saved_players = json.loads(saved_data) if saved_data else []
-            logger.info(f"After save, Redis has {len(saved_players[0].get('bots', []))} minions for player 0")
-            
-            # NOW create the actual minion (this will use the bot_id we generated)
-            # Call bot_operations directly but pass the bot_id we already created
-            from bot import Bot
-            # Allocate resources: 70% of purchase price as starting capital (increased from 50% for better bot performance)
-            # This gives bots more resources to trade effectively
-            bot_starting_capital = request.cost * 0.7
-            bot = Bot(
-                bot_id=bot_id,
-                is_toggled=True,
-                usd_given=bot_starting_capital,
-                usd=bot_starting_capital,
-                bc=0.0,
-                bot_type=backend_bot_type,
-                user_id=request.userId,
-                custom_strategy_code=custom_strategy_code,
-                bot_name=display_name
-            )
-            
-            # Save minion to Redis
-            bot.save_to_redis(request.gameId)
-            
-            # Start minion running in a separate thread
-            import threading
-            bot_thread = threading.Thread(
-                target=bot.run,
-                args=(request.gameId,),
-                daemon=True,
-                name=f"Bot-{bot_id}"
-            )
-            bot_thread.start()
-            
-            logger.info(f"Minion {bot_id} started for user {request.userId} (attempt {retry_count + 1})")
-            
-            logger.info(f"User {request.userId} purchased minion {bot_id} for ${request.cost}")
-            
-            # Get minion details
-            bot = Bot.load_from_redis(request.gameId, bot_id)
-            bot_data = bot.to_dict() if bot else {}
-            
-            # Get updated USD balance (use the value we just set to ensure consistency)
-            updated_usd = user_data.get('usd', user_data.get('usdBalance', 0))
-            # Convert to float to ensure numeric type (not string from Redis)
-            updated_usd = float(updated_usd) if updated_usd is not None else 0.0
-            
-            return {
-                "success": True,
-                "botId": bot_id,
-                "botType": backend_bot_type,
-                "cost": request.cost,
-                "newUsd": updated_usd,
-                "bot": bot_data
-            }
-            
-        except HTTPException:
-            raise
+            custom_strategy_code = await asyncio.to_thread(generate_custom_bot_strategy, request.customPrompt)
+            logger.info(f"Generated custom strategy code ({len(custom_strategy_code)} chars)")
         except Exception as e:
-            retry_count += 1
-            if retry_count >= max_retries:
-                logger.error(f"Error purchasing minion after {max_retries} retries: {e}")
-                raise HTTPException(status_code=500, detail=str(e))
-            # Wait a short time before retrying (exponential backoff)
-            import asyncio
-            await asyncio.sleep(0.1 * retry_count)  # 0.1s, 0.2s, 0.3s, etc.
-            logger.warning(f"Bot purchase failed, retrying ({retry_count}/{max_retries}): {e}")
-            continue
+            logger.error(f"Failed to generate custom strategy: {e}")
+            raise HTTPException(status_code=500, detail=f"Failed to generate custom strategy: {str(e)}")
+    
+    return await _retry_locked(request.gameId, "Bot purchase", _buy_bot, request, bot_id,
+                               custom_strategy_code)
+
+
+def _buy_bot(request: BotBuyRequest, bot_id: str, custom_strategy_code: Optional[str], attempt: int):
+    """
+    One attempt at buy_bot; the caller holds the game's players lock and retries failures.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
+    # Get user wallet from Redis (reload each retry to get fresh data)
+    r = get_redis_connection()
+    game_key = f"game:{request.gameId}"
+    players_json = r.hget(game_key, 'players')
+    players, user_index, user_data = _find_player(players_json, request.userId)
+    
+    # Check if user has enough USD (handle both usd and usdBalance fields)
+    # This check happens on each retry to ensure funds are still sufficient
+    # Convert to float in case Redis returns strings
+    user_usd, _ = _player_balances(user_data)
+    if user_usd < float(request.cost):
+        raise HTTPException(status_code=400, detail="Insufficient USD")
+    
+    # Map front-end minion types to backend bot types
+    backend_bot_type = BOT_TYPE_MAP.get(request.botType, 'random')
+    
+    # Deduct cost from user FIRST (before minion creation) - prevent negative balances
+    # Use float conversion to ensure proper numeric operations
+    cost_float = float(request.cost)
+    updated_usd = max(0.0, user_usd - cost_float)
+    _set_player_balances(user_data, updated_usd)
+    
+    # Add minion entry to user's bots list
+    if 'bots' not in user_data:
+        user_data['bots'] = []
+    
+    # Use the display name if provided, otherwise fall back to bot type
+    display_name = request.botName if request.botName else backend_bot_type
+    
+    user_data['bots'].append({
+        'botId': bot_id,
+        'botName': display_name
+    })
+    
+    logger.debug(f"After adding minion, user has {len(user_data['bots'])} minions")
+    
+    players[user_index] = user_data
+    
+    # Create the actual minion (this will use the bot_id we generated)
+    # Allocate resources: 70% of purchase price as starting capital (increased from 50% for better bot performance)
+    # This gives bots more resources to trade effectively
+    bot_starting_capital = request.cost * 0.7
+    bot = Bot(
+        bot_id=bot_id,
+        is_toggled=True,
+        usd_given=bot_starting_capital,
+        usd=bot_starting_capital,
+        bc=0.0,
+        bot_type=backend_bot_type,
+        user_id=request.userId,
+        custom_strategy_code=custom_strategy_code,
+        bot_name=display_name
+    )
+    
+    # Charge the user and save the minion in one MULTI/EXEC round trip, so a
+    # failure can't leave the user charged for a minion that doesn't exist.
+    # The players are watched and checked against the first read, so a change made
+    # meanwhile by another request or worker fails the write (WatchError; the caller
+    # retries from a fresh read) instead of being overwritten.
+    # The market update loop picks the minion up on the next tick.
+    with r.pipeline() as pipe:
+        pipe.watch(game_key)
+        if pipe.hget(game_key, 'players') != players_json:
+            raise WatchError(f"{game_key} players changed since they were read")
+        pipe.multi()
+        pipe.hset(game_key, "players", orjson.dumps(players))
+        bot.queue_save(pipe, request.gameId)
+        pipe.delete(_bot_list_cache_key(request.gameId, request.userId))
+        pipe.execute()
+    
+    logger.info(f"Minion {bot_id} created for user {request.userId} (attempt {attempt})")
+    
+    logger.info(f"User {request.userId} purchased minion {bot_id} for ${request.cost}")
+    
+    # The minion we just saved is the source of truth, no need to read it back
+    return {
+        "success": True,
+        "botId": bot_id,
+        "botType": backend_bot_type,
+        "cost": request.cost,
+        "newUsd": updated_usd,
+        "bot": bot.to_dict()
+    }
 
 
 @app.post("/api/bot/toggle")
@@ -958,27 +1216,28 @@ async def toggle_bot(request: BotToggleRequest):
     Toggle a minion on/off.
     """
     try:
-        success = await asyncio.to_thread(
-            toggleBot,
-            request.botId,
-            request.gameId
-        )
+        async with _players_lock(request.gameId):
+            success = await asyncio.to_thread(
+                toggleBot,
+                request.botId,
+                request.gameId
+            )
         
         if not success:
             raise HTTPException(status_code=404, detail="Minion not found")
         
         # Get minion details
-        bot = Bot.load_from_redis(request.gameId, request.botId)
+        bot = await asyncio.to_thread(_toggled_bot_summary, request.gameId, request.botId, request.userId)
         if not bot:
             raise HTTPException(status_code=404, detail="Minion not found after toggle")
         
-        logger.info(f"Minion {request.botId} toggled to {'ON' if bot.is_toggled else 'OFF'}")
+        logger.info(f"Minion {request.botId} toggled to {'ON' if bot['isActive'] else 'OFF'}")
         
         return {
             "success": True,
             "botId": request.botId,
-            "isActive": bot.is_toggled,
-            "bot": bot.to_dict()
+            "isActive": bot['isActive'],
+            "bot": bot
         }
         
     except HTTPException:
@@ -993,28 +1252,48 @@ async def list_user_bots(game_id: str, user_id: str):
     """
     List all minions owned by a user in a game.
     """
+    return ORJSONResponse(await asyncio.to_thread(_list_user_bots, game_id, user_id))
+
+
+def _list_user_bots(game_id: str, user_id: str) -> Dict:
+    """
+    Body of list_user_bots.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
     try:
         r = get_redis_connection()
+        cache_key = _bot_list_cache_key(game_id, user_id)
         
-        # Get all minions for the game
-        bots_set_key = f"bots:{game_id}"
-        bot_ids = r.smembers(bots_set_key)
+        # Balances only move when bots trade on a tick, so a list built this tick is still current.
+        # The tick is read from the game state, which run_tick writes only after the tick's
+        # bot trades are saved; the market's own tick moves before they are.
+        pipe = r.pipeline(transaction=False)
+        pipe.hget(game_state_key(game_id), "current_tick")
+        pipe.get(cache_key)
+        current_tick, cached = pipe.execute()
+        
+        if cached:
+            entry = orjson.loads(cached)
+            if entry["tick"] == current_tick:
+                return entry["response"]
+        
+        # Get only this user's minions from the per-user index
+        bot_ids = r.smembers(f"bots:{game_id}:user:{user_id}")
         
         # Load user's minions
-        user_bots = []
-        for bot_id_bytes in bot_ids:
-            bot_id = bot_id_bytes.decode('utf-8') if isinstance(bot_id_bytes, bytes) else bot_id_bytes
-            bot = Bot.load_from_redis(game_id, bot_id)
-            if bot:
-                user_bots.append(bot.to_dict())
+        user_bots = [bot.to_dict() for bot in Bot.load_many_from_redis(game_id, bot_ids)]
         
-        return {
+        response = {
             "success": True,
             "gameId": game_id,
             "userId": user_id,
             "bots": user_bots
         }
         
+        r.set(cache_key, orjson.dumps({"tick": current_tick, "response": response}), ex=BOT_LIST_CACHE_TTL)
+        
+        return response
+    
     except Exception as e:
         logger.error(f"Error listing minions: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -1028,110 +1307,84 @@ async def get_wealth_leaderboard(game_id: str):
     Returns a sorted leaderboard by wealth (descending).
     If the game has ended, returns the cached final leaderboard (static for all players).
     """
+    return ORJSONResponse(await asyncio.to_thread(_get_wealth_leaderboard, game_id))
+
+
+def _get_wealth_leaderboard(game_id: str) -> Dict:
+    """
+    Body of get_wealth_leaderboard.
+    Blocking - call through asyncio.to_thread() from async code.
+    """
     try:
         r = get_redis_connection()
-        game_data = r.hgetall(f"game:{game_id}")
+        # Only two fields are needed; the game hash also carries the interactions log
+        is_ended_str, players_json = r.hmget(f"game:{game_id}", 'isEnded', 'players')
         
-        if not game_data:
+        if is_ended_str is None and players_json is None:
             raise HTTPException(status_code=404, detail="Game not found")
         
+        current_tick = None
+        
         # Check if game has ended - if so, return cached final leaderboard
-        is_ended = game_data.get('isEnded', 'false').lower() == 'true'
+        is_ended = (is_ended_str or 'false').lower() == 'true'
         if is_ended:
-            final_leaderboard_key = f"final_leaderboard:{game_id}"
-            cached_leaderboard = r.get(final_leaderboard_key)
+            # The final leaderboard and the price it was built at share one hash
+            cached_leaderboard, cached_price = r.hmget(f"final_leaderboard:{game_id}", 'leaderboard', 'price')
             
             if cached_leaderboard:
-                import json
                 try:
-                    final_leaderboard = json.loads(cached_leaderboard)
+                    final_leaderboard = orjson.loads(cached_leaderboard)
                     logger.debug(f"Returning cached final leaderboard for ended game {game_id}")
                     return {
                         "success": True,
                         "leaderboard": final_leaderboard,
                         "isFinal": True
                     }
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # Cache is corrupted, fall through to recalculate
                     logger.warning(f"Cached final leaderboard for {game_id} is corrupted, recalculating")
             else:
-                # No cached leaderboard, but game has ended - recalculate and cache it
+                # No cached leaderboard, but game has ended - recalculate it
                 logger.info(f"Game {game_id} has ended but no cached leaderboard found, calculating final leaderboard")
-                # Load market to get final price (use current price as final)
-                market = Market.load_from_redis(game_id)
-                if market:
-                    final_price = market.market_data.current_price
-                else:
-                    # Fallback: try to get price from cached final price
-                    final_price_str = r.get(f"final_leaderboard:{game_id}:price")
-                    final_price = float(final_price_str) if final_price_str else 1.0
-                
-                # Recalculate final leaderboard (code continues below)
-                current_price = final_price
+            
+            # Use the market's current price as final - just that field, not the whole price history
+            final_price_str = r.hget(f"market:{game_id}:data", "current_price")
+            if final_price_str is None:
+                # Fallback: the price cached with the final leaderboard
+                final_price_str = cached_price
+            final_price = float(final_price_str) if final_price_str else 1.0
+            
+            # Recalculate final leaderboard (code continues below)
+            current_price = final_price
         else:
             # Game is still active - calculate current leaderboard
-            # Load market to get current price
-            market = Market.load_from_redis(game_id)
-            if not market:
+            # Only the price and tick are needed, no need to load the whole market
+            price_str, tick_str = r.hmget(f"market:{game_id}:data", "current_price", "current_tick")
+            if price_str is None or tick_str is None:
                 raise HTTPException(status_code=404, detail="Market not found")
             
-            current_price = market.market_data.current_price
+            current_price = float(price_str)
+            current_tick = int(tick_str)
+            
+            # Reuse the leaderboard already built for this tick
+            snapshot = _leaderboard_snapshots.get(game_id)
+            if snapshot and snapshot[0] == current_tick:
+                return {
+                    "success": True,
+                    "leaderboard": snapshot[1]
+                }
         
-        import json
-        players = json.loads(game_data.get('players', '[]'))
+        players = orjson.loads(players_json or '[]')
         
         if not players:
             raise HTTPException(status_code=404, detail="No players found in game")
         
         # Calculate wealth for each player (including minion balances)
-        player_wealths = []
-        bots_set_key = f"bots:{game_id}"
-        bot_ids = r.smembers(bots_set_key)
+        bots = Bot.load_many_from_redis(game_id, r.smembers(f"bots:{game_id}"))
+        player_wealths = _wealth_leaderboard(players, bots, current_price)
         
-        # Build a map of user_id -> list of bot_ids
-        user_bots_map = {}
-        for bot_id_bytes in bot_ids:
-            bot_id = bot_id_bytes.decode('utf-8') if isinstance(bot_id_bytes, bytes) else bot_id_bytes
-            bot = Bot.load_from_redis(game_id, bot_id)
-            if bot and bot.user_id:
-                if bot.user_id not in user_bots_map:
-                    user_bots_map[bot.user_id] = []
-                user_bots_map[bot.user_id].append(bot)
-        
-        for player in players:
-            # Handle both field name conventions (userId/playerId, usd/usdBalance, coins/coinBalance)
-            player_id = player.get('userId') or player.get('playerId')
-            player_name = player.get('userName') or player.get('playerName', 'Unknown')
-            
-            # Get USD balance (handle both field names)
-            usd_balance = float(player.get('usd', player.get('usdBalance', 0)))
-            
-            # Get BC balance (handle both field names)
-            bc_balance = float(player.get('coins', player.get('coinBalance', 0)))
-            
-            # Add minion balances to player's total
-            total_minion_usd = 0.0
-            total_minion_bc = 0.0
-            if player_id in user_bots_map:
-                for bot in user_bots_map[player_id]:
-                    total_minion_usd += bot.usd
-                    total_minion_bc += bot.bc
-            
-            # Calculate total wealth: (player USD + minion USD) + ((player BC + minion BC) * current_price)
-            total_usd = usd_balance + total_minion_usd
-            total_bc = bc_balance + total_minion_bc
-            wealth = total_usd + (total_bc * current_price)
-            
-            player_wealths.append({
-                'userId': player_id,
-                'userName': player_name,
-                'usdBalance': total_usd,  # Include minion balances
-                'coinBalance': total_bc,   # Include minion balances
-                'wealth': wealth
-            })
-        
-        # Sort by wealth (descending)
-        player_wealths.sort(key=lambda x: x['wealth'], reverse=True)
+        if current_tick is not None:
+            _leaderboard_snapshots[game_id] = (current_tick, player_wealths)
         
         return {
             "success": True,
@@ -1151,8 +1404,11 @@ async def get_transactions(game_id: str, limit: int = 100, offset: int = 0):
     Get transaction history for a game.
     """
     try:
-        transactions = TransactionHistory.get_transactions(game_id, limit=limit, offset=offset)
-        stats = TransactionHistory.get_transaction_stats(game_id)
+        # The page and the stats are independent reads; run them side by side
+        transactions, stats = await asyncio.gather(
+            asyncio.to_thread(TransactionHistory.get_transactions, game_id, limit=limit, offset=offset),
+            asyncio.to_thread(TransactionHistory.get_transaction_stats, game_id)
+        )
         
         return {
             "success": True,
@@ -1172,7 +1428,7 @@ async def get_user_transactions(game_id: str, user_id: str, limit: int = 100):
     Get transaction history for a specific user in a game.
     """
     try:
-        transactions = TransactionHistory.get_user_transactions(game_id, user_id, limit=limit)
+        transactions = await asyncio.to_thread(TransactionHistory.get_user_transactions, game_id, user_id, limit=limit)
         
         return {
             "success": True,
@@ -1192,7 +1448,7 @@ async def get_bot_transactions(game_id: str, limit: int = 100):
     Get all bot transactions for a game.
     """
     try:
-        transactions = TransactionHistory.get_bot_transactions(game_id, limit=limit)
+        transactions = await asyncio.to_thread(TransactionHistory.get_bot_transactions, game_id, limit=limit)
         
         return {
             "success": True,
@@ -1211,7 +1467,7 @@ async def get_transaction_stats(game_id: str):
     Get transaction statistics for a game.
     """
     try:
-        stats = TransactionHistory.get_transaction_stats(game_id)
+        stats = await asyncio.to_thread(TransactionHistory.get_transaction_stats, game_id)
         
         return {
             "success": True,
@@ -1236,33 +1492,38 @@ async def health_check():
     }
 
 
+# The API description never changes, so it is serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "name": "Banana Coin Trading API",
+    "version": "1.0.0",
+    "description": "Real-time trading game with background market updates",
+    "endpoints": {
+        "POST /api/game/start-market": "Start background market updates",
+        "POST /api/game/stop-market/{game_id}": "Stop market updates",
+        "GET /api/game/market-status/{game_id}": "Get market update status",
+        "GET /api/game/market-data/{game_id}": "Get market data and price history",
+        "WS /ws/{game_id}": "Stream per-tick market updates",
+        "POST /api/game/buy-coins": "Execute buy trade",
+        "POST /api/game/sell-coins": "Execute sell trade",
+        "GET /api/game/leaderboard/{game_id}": "Get wealth leaderboard (richest player)",
+        "POST /api/bot/buy": "Purchase a minion",
+        "POST /api/bot/toggle": "Toggle minion on/off",
+        "GET /api/bot/list/{game_id}/{user_id}": "List user's minions",
+        "GET /api/transactions/{game_id}": "Get transaction history",
+        "GET /api/transactions/{game_id}/user/{user_id}": "Get user's transactions",
+        "GET /api/transactions/{game_id}/bots": "Get bot transactions",
+        "GET /api/transactions/{game_id}/stats": "Get transaction statistics",
+        "GET /health": "Health check"
+    }
+})
+
+
 @app.get("/")
 async def root():
     """
     API information.
     """
-    return {
-        "name": "Banana Coin Trading API",
-        "version": "1.0.0",
-        "description": "Real-time trading game with background market updates",
-        "endpoints": {
-            "POST /api/game/start-market": "Start background market updates",
-            "POST /api/game/stop-market/{game_id}": "Stop market updates",
-            "GET /api/game/market-status/{game_id}": "Get market update status",
-            "GET /api/game/market-data/{game_id}": "Get market data and price history",
-            "POST /api/game/buy-coins": "Execute buy trade",
-            "POST /api/game/sell-coins": "Execute sell trade",
-            "GET /api/game/leaderboard/{game_id}": "Get wealth leaderboard (richest player)",
-            "POST /api/bot/buy": "Purchase a minion",
-            "POST /api/bot/toggle": "Toggle minion on/off",
-            "GET /api/bot/list/{game_id}/{user_id}": "List user's minions",
-            "GET /api/transactions/{game_id}": "Get transaction history",
-            "GET /api/transactions/{game_id}/user/{user_id}": "Get user's transactions",
-            "GET /api/transactions/{game_id}/bots": "Get bot transactions",
-            "GET /api/transactions/{game_id}/stats": "Get transaction statistics",
-            "GET /health": "Health check"
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
 
 # ============================================================================
@@ -1271,7 +1532,13 @@ async def root():
 
 @app.on_event("startup")
 async def startup_event():
+    global _tick_executor
     logger.info("🍌 Banana Coin Trading API starting up...")
+    
+    if TICK_WORKERS > 0:
+        _tick_executor = ProcessPoolExecutor(max_workers=TICK_WORKERS)
+        logger.info(f"Running market ticks in {TICK_WORKERS} worker processes")
+    
     logger.info("✅ API ready to accept requests")
 
 
@@ -1288,10 +1555,16 @@ async def shutdown_event():
         except asyncio.CancelledError:
             pass
     
+    if _tick_executor is not None:
+        _tick_executor.shutdown(wait=False, cancel_futures=True)
+    
     logger.info("✅ API shutdown complete")
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
+    # uvloop is faster than the stock asyncio loop but isn't available on Windows
+    loop = "asyncio" if sys.platform == "win32" else "uvloop"
+    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info", loop=loop)
 
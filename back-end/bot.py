@@ -1,16 +1,20 @@
+import logging
 import random
 import math
-from typing import List, Dict, Optional
+import numpy as np
+from typing import List, Dict, Optional, Iterable
 from dataclasses import dataclass
-import uuid
+from functools import lru_cache
+import secrets
 import json
 import re
 import os
+from types import MappingProxyType
 from redis_helper import get_redis_connection
-from google import genai
-from google.genai import types
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Load environment variables
 load_dotenv()
 
@@ -35,6 +39,11 @@ def generate_custom_bot_strategy(user_prompt: str) -> str:
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable not set")
     
+    # Imported on first use: the SDK is heavy, and the server and every tick worker
+    # process import this module without ever generating a strategy
+    from google import genai
+    from google.genai import types
+    
     client = genai.Client(api_key=api_key)
     
     system_prompt = """You are an expert Python developer creating trading bot strategies.
@@ -129,16 +138,16 @@ Remember: Output ONLY the Python code, nothing else."""
             if test_result is None:
                 raise ValueError("Strategy returned None")
             
-            print(f"Custom strategy validated successfully. Test result: {test_result}")
+            logger.info(f"Custom strategy validated successfully. Test result: {test_result}")
             
         except Exception as e:
-            print(f"Generated code failed validation: {e}")
+            logger.warning(f"Generated code failed validation: {e}")
             raise ValueError(f"Generated code failed validation: {e}")
         
         return code
         
     except Exception as e:
-        print(f"Error generating custom bot strategy: {e}")
+        logger.error(f"Error generating custom bot strategy: {e}")
         # Return a safe default strategy
         return """def custom_strategy(coins, current_price):
     if len(coins) < 2:
@@ -154,12 +163,27 @@ Remember: Output ONLY the Python code, nothing else."""
 # BOT CLASS
 # ============================================================================
 
+# The decision for a bot sitting out a tick. Shared instead of built per call, so it is
+# a read-only view - a caller writing to it would change every later hold.
+_HOLD = MappingProxyType({'action': 'hold', 'amount': 0.0})
+
+
+@lru_cache(maxsize=256)
+def _compile_strategy(code: str):
+    """Compile a custom strategy's source once instead of on every decision"""
+    return compile(code, '<custom_strategy>', 'exec')
+
+
 class Bot:
     """
     Basic Bot constructor with own wallet and trading capabilities.
     Works directly with Redis game room data.
     """
     
+    __slots__ = ('bot_id', 'is_toggled', 'usd_given', 'usd', 'bc', 'bot_type', 'user_id',
+                 'custom_strategy_code', 'bot_name', 'parameters', 'behavior_coefficient',
+                 '_random_seed', '_personality_factor')
+    
     def __init__(self, bot_id: Optional[str] = None,
                  is_toggled: bool = True, usd_given: float = 0.0,
                  usd: float = 0.0, bc: float = 0.0, bot_type: Optional[str] = None,
@@ -180,7 +204,7 @@ class Bot:
             custom_strategy_code: Python code for custom strategy (only used when bot_type='custom')
             bot_name: Display name for the bot (e.g., 'HODL Master')
         """
-        self.bot_id = bot_id or str(uuid.uuid4())
+        self.bot_id = bot_id or secrets.token_hex(16)
         self.is_toggled = is_toggled
         self.usd_given = usd_given
         self.usd = usd
@@ -193,7 +217,6 @@ class Bot:
         
         # Bot-specific randomness seed based on bot_id for consistent uniqueness
         self._random_seed = hash(self.bot_id) % 10000
-        random.seed(self._random_seed)
         # behaviorCoefficient: stored as public attribute for Redis persistence
         # Range: 0.8 to 1.2 (represents bot's unique personality/behavior variation)
         if behavior_coefficient is not None:
@@ -201,40 +224,111 @@ class Bot:
         else:
             self.behavior_coefficient = 0.8 + (hash(self.bot_id) % 40) / 100.0
         self._personality_factor = self.behavior_coefficient  # Alias for internal use
-        random.seed()  # Reset to system randomness
+    
+    # Default strategy parameters by bot type. Built once for the class; every bot
+    # (including each one loaded from Redis on every tick) gets its own shallow copy.
+    _DEFAULT_PARAMETERS = {
+        'random': {
+            'min_trade': 2.0,  # 20x increase (was 2.0)
+            'max_trade': 60.0,  # 20x increase (was 10.0)
+            'trade_probability': 0.3
+        },
+        'momentum': {
+            'short_window': 5,
+            'long_window': 20,
+            'trade_size': 40.0,  # 20x increase (was 8.0)
+            'aggressiveness': 1.0
+        },
+        'mean_reversion': {
+            'lookback_window': 20,
+            'std_threshold': 1.5,
+            'trade_size': 50.0  # 20x increase (was 10.0)
+        },
+        'market_maker': {
+            'target_bc_ratio': 0.5,
+            'rebalance_threshold': 0.1,
+            'trade_size': 30.0  # 20x increase (was 6.0)
+        },
+        'hedger': {
+            'volatility_threshold': 0.05,
+            'low_vol_ratio': 0.7,
+            'high_vol_ratio': 0.3,
+            'trade_size': 40.0  # 20x increase (was 8.0)
+        }
+    }
     
     def _get_default_parameters(self) -> Dict:
         """Get default parameters based on bot type"""
-        defaults = {
-            'random': {
-                'min_trade': 2.0,  # 20x increase (was 2.0)
-                'max_trade': 60.0,  # 20x increase (was 10.0)
-                'trade_probability': 0.3
-            },
-            'momentum': {
-                'short_window': 5,
-                'long_window': 20,
-                'trade_size': 40.0,  # 20x increase (was 8.0)
-                'aggressiveness': 1.0
-            },
-            'mean_reversion': {
-                'lookback_window': 20,
-                'std_threshold': 1.5,
-                'trade_size': 50.0  # 20x increase (was 10.0)
-            },
-            'market_maker': {
-                'target_bc_ratio': 0.5,
-                'rebalance_threshold': 0.1,
-                'trade_size': 30.0  # 20x increase (was 6.0)
-            },
-            'hedger': {
-                'volatility_threshold': 0.05,
-                'low_vol_ratio': 0.7,
-                'high_vol_ratio': 0.3,
-                'trade_size': 40.0  # 20x increase (was 8.0)
-            }
+        defaults = self._DEFAULT_PARAMETERS
+        return dict(defaults.get(self.bot_type, defaults['random']))
+    
+    def _strategy_params(self) -> Dict:
+        """
+        Resolve this bot's personalised strategy parameters (windows, thresholds, trade size).
+        Shared by the per-bot analyzers below and the batched runner in bot_operations.
+        """
+        builder = self._PARAM_BUILDERS.get(self.bot_type)
+        if builder is None:
+            return {}
+        return builder(self, self.parameters)
+    
+    def _random_params(self, params: Dict) -> Dict:
+        return {
+            'trade_probability': params['trade_probability'] * self._personality_factor,
+            'min_trade': params['min_trade'] * self._personality_factor,
+            'max_trade': params['max_trade'] * self._personality_factor
+        }
+    
+    def _momentum_params(self, params: Dict) -> Dict:
+        # Bot-specific window variation
+        short_window = max(3, int(params['short_window'] * self._personality_factor))
+        long_window = max(short_window + 1, int(params['long_window'] * self._personality_factor))
+        base_amount = params['trade_size'] * params['aggressiveness']
+        return {
+            'short_window': short_window,
+            'long_window': long_window,
+            # Bot-specific threshold variation (1.5% to 2.5% instead of fixed 2%)
+            'threshold': 0.015 + (hash(self.bot_id) % 10) / 1000.0,
+            'amount': base_amount * (0.8 + (hash(self.bot_id + 'amount') % 40) / 100.0)  # ±20% variation
+        }
+    
+    def _mean_reversion_params(self, params: Dict) -> Dict:
+        return {
+            'lookback': max(5, int(params['lookback_window'] * (0.8 + (hash(self.bot_id + 'lookback') % 40) / 100.0))),
+            # Bot-specific threshold variation (1.2 to 1.8 instead of fixed 1.5)
+            'threshold': params['std_threshold'] * (0.8 + (hash(self.bot_id + 'threshold') % 40) / 100.0),
+            'amount': params['trade_size'] * (0.7 + (hash(self.bot_id + 'amount') % 60) / 100.0)  # ±30% variation
         }
-        return defaults.get(self.bot_type, defaults['random'])
+    
+    def _market_maker_params(self, params: Dict) -> Dict:
+        return {
+            # Bot-specific target ratio variation (0.4 to 0.6 instead of fixed 0.5)
+            'target_ratio': params['target_bc_ratio'] * (0.8 + (hash(self.bot_id + 'target') % 40) / 100.0),
+            # Bot-specific threshold variation (0.08 to 0.12 instead of fixed 0.1)
+            'threshold': params['rebalance_threshold'] * (0.8 + (hash(self.bot_id + 'threshold') % 40) / 100.0),
+            'amount': params['trade_size'] * (0.6 + (hash(self.bot_id + 'size') % 80) / 100.0)  # ±40% variation
+        }
+    
+    def _hedger_params(self, params: Dict) -> Dict:
+        return {
+            'vol_window': max(5, int(10 * (0.7 + (hash(self.bot_id + 'window') % 60) / 100.0))),
+            # Bot-specific volatility threshold variation (0.04 to 0.06 instead of fixed 0.05)
+            'vol_threshold': params['volatility_threshold'] * (0.8 + (hash(self.bot_id + 'vol_threshold') % 40) / 100.0),
+            'high_vol_ratio': params['high_vol_ratio'] * (0.8 + (hash(self.bot_id + 'high_vol') % 40) / 100.0),
+            'low_vol_ratio': params['low_vol_ratio'] * (0.8 + (hash(self.bot_id + 'low_vol') % 40) / 100.0),
+            # Bot-specific rebalance threshold (0.08 to 0.12 instead of fixed 0.1)
+            'rebalance_threshold': 0.1 * (0.8 + (hash(self.bot_id + 'rebalance') % 40) / 100.0),
+            'amount': params['trade_size'] * (0.7 + (hash(self.bot_id + 'size') % 60) / 100.0)  # ±30% variation
+        }
+    
+    # bot_type -> parameter builder, all called as (self, self.parameters)
+    _PARAM_BUILDERS = {
+        'random': _random_params,
+        'momentum': _momentum_params,
+        'mean_reversion': _mean_reversion_params,
+        'market_maker': _market_maker_params,
+        'hedger': _hedger_params
+    }
     
     def _scale_trade_amount(self, base_amount: float, current_price: float, action: str) -> float:
         """
@@ -270,6 +364,14 @@ class Bot:
         else:
             return base_amount
     
+    def _holdings_ratio(self, current_price: float) -> Optional[float]:
+        """BC share of this bot's portfolio value (None if the bot holds nothing)"""
+        bc_value = self.bc * current_price
+        total_value = self.usd + bc_value
+        if total_value == 0:
+            return None
+        return bc_value / total_value
+    
     def analyze(self, coins: List[float], current_price: Optional[float] = None) -> Dict:
         """
         Analyze market conditions and determine trading action
@@ -285,40 +387,26 @@ class Bot:
             }
         """
         if not coins or len(coins) < 1:
-            return {'action': 'hold', 'amount': 0.0}
+            return _HOLD
         
         if current_price is None:
             current_price = coins[-1]
         
-        if self.bot_type == 'random':
-            return self._analyze_random()
-        elif self.bot_type == 'momentum':
-            return self._analyze_momentum(coins, current_price)
-        elif self.bot_type == 'mean_reversion':
-            return self._analyze_mean_reversion(coins, current_price)
-        elif self.bot_type == 'market_maker':
-            return self._analyze_market_maker(current_price)
-        elif self.bot_type == 'hedger':
-            return self._analyze_hedger(coins, current_price)
-        elif self.bot_type == 'custom':
-            return self._analyze_custom(coins, current_price)
-        else:
-            return {'action': 'hold', 'amount': 0.0}
+        analyzer = self._ANALYZERS.get(self.bot_type)
+        if analyzer is None:
+            return _HOLD
+        return analyzer(self, coins, current_price)
     
     def _analyze_random(self) -> Dict:
         """Random trading strategy with bot-specific variation"""
-        # Bot-specific trade probability variation
-        base_prob = self.parameters['trade_probability']
-        bot_prob = base_prob * self._personality_factor
+        # Bot-specific trade probability and amount variation
+        params = self._strategy_params()
         
-        if random.random() > bot_prob:
-            return {'action': 'hold', 'amount': 0.0}
+        if random.random() > params['trade_probability']:
+            return _HOLD
         
         action = random.choice(['buy', 'sell'])
-        # Bot-specific amount variation
-        min_trade = self.parameters['min_trade'] * self._personality_factor
-        max_trade = self.parameters['max_trade'] * self._personality_factor
-        amount = random.uniform(min_trade, max_trade)
+        amount = random.uniform(params['min_trade'], params['max_trade'])
         
         # Scale amount based on available capital (need current_price, estimate from coins if available)
         # For random bot, we'll use a simple scaling without price since we don't have it in this method
@@ -328,33 +416,27 @@ class Bot:
     def _analyze_momentum(self, coins: List[float], current_price: float) -> Dict:
         """Momentum trading strategy with bot-specific variation"""
         if len(coins) < 2:
-            return {'action': 'hold', 'amount': 0.0}
+            return _HOLD
         
-        # Bot-specific window variation
-        short_window = max(3, int(self.parameters['short_window'] * self._personality_factor))
-        long_window = max(short_window + 1, int(self.parameters['long_window'] * self._personality_factor))
+        params = self._strategy_params()
+        short_window = params['short_window']
+        long_window = params['long_window']
         
-        prices = coins[-long_window:] if len(coins) >= long_window else coins
+        # One array of the last long_window prices; both averages are C-level means over it
+        prices = np.asarray(coins[-long_window:], dtype=np.float64)
         
         if len(prices) < short_window:
-            return {'action': 'hold', 'amount': 0.0}
-        
-        short_prices = prices[-short_window:]
-        long_prices = prices[-long_window:] if len(prices) >= long_window else prices
+            return _HOLD
         
-        short_ma = sum(short_prices) / len(short_prices)
-        long_ma = sum(long_prices) / len(long_prices)
+        short_ma = float(prices[-short_window:].mean())
+        long_ma = float(prices.mean())
         
-        # Bot-specific threshold variation (1.5% to 2.5% instead of fixed 2%)
-        threshold = 0.015 + (hash(self.bot_id) % 10) / 1000.0  # 0.015 to 0.025
-        
-        # Bot-specific amount variation
-        base_amount = self.parameters['trade_size'] * self.parameters['aggressiveness']
-        amount = base_amount * (0.8 + (hash(self.bot_id + 'amount') % 40) / 100.0)  # ±20% variation
+        threshold = params['threshold']
+        amount = params['amount']
         
         # Add small random factor to decision (5% chance to ignore signal)
         if random.random() < 0.05:
-            return {'action': 'hold', 'amount': 0.0}
+            return _HOLD
         
         if short_ma > long_ma * (1.0 + threshold):
             # Scale buy amount based on available capital
@@ -365,36 +447,34 @@ class Bot:
             scaled_amount = self._scale_trade_amount(amount, current_price, 'sell')
             return {'action': 'sell', 'amount': scaled_amount}
         
-        return {'action': 'hold', 'amount': 0.0}
+        return _HOLD
     
     def _analyze_mean_reversion(self, coins: List[float], current_price: float) -> Dict:
         """Mean reversion trading strategy with bot-specific variation"""
-        # Bot-specific lookback window variation
-        base_lookback = self.parameters['lookback_window']
-        lookback = max(5, int(base_lookback * (0.8 + (hash(self.bot_id + 'lookback') % 40) / 100.0)))
+        params = self._strategy_params()
+        lookback = params['lookback']
         
-        prices = coins[-lookback:] if len(coins) >= lookback else coins
+        prices = coins[-lookback:]
         
         if len(prices) < 2:
-            return {'action': 'hold', 'amount': 0.0}
-        
-        mean_price = sum(prices) / len(prices)
-        variance = sum((p - mean_price) ** 2 for p in prices) / len(prices)
+            return _HOLD
+        
+        # Mean and variance from one running sum and sum of squares (as the batched
+        # runner does), taken relative to the current price to keep them numerically stable
+        offsets = np.asarray(prices, dtype=np.float64) - current_price
+        n = len(offsets)
+        mean_offset = float(offsets.sum()) / n
+        variance = float(offsets @ offsets) / n - mean_offset * mean_offset
         std_dev = math.sqrt(variance) if variance > 0 else 0
         
-        z_score = (current_price - mean_price) / std_dev if std_dev > 0 else 0
+        z_score = -mean_offset / std_dev if std_dev > 0 else 0
         
-        # Bot-specific threshold variation (1.2 to 1.8 instead of fixed 1.5)
-        base_threshold = self.parameters['std_threshold']
-        threshold = base_threshold * (0.8 + (hash(self.bot_id + 'threshold') % 40) / 100.0)
-        
-        # Bot-specific amount variation
-        base_amount = self.parameters['trade_size']
-        amount = base_amount * (0.7 + (hash(self.bot_id + 'amount') % 60) / 100.0)  # ±30% variation
+        threshold = params['threshold']
+        amount = params['amount']
         
         # Add small random factor (3% chance to ignore signal)
         if random.random() < 0.03:
-            return {'action': 'hold', 'amount': 0.0}
+            return _HOLD
         
         if z_score > threshold:
             # Scale sell amount based on available capital
@@ -405,32 +485,22 @@ class Bot:
             scaled_amount = self._scale_trade_amount(amount, current_price, 'buy')
             return {'action': 'buy', 'amount': scaled_amount}
         
-        return {'action': 'hold', 'amount': 0.0}
+        return _HOLD
     
     def _analyze_market_maker(self, current_price: float) -> Dict:
         """Market maker strategy with bot-specific variation"""
-        total_value = self.usd + (self.bc * current_price)
-        if total_value == 0:
-            return {'action': 'hold', 'amount': 0.0}
-        
-        bc_value = self.bc * current_price
-        current_ratio = bc_value / total_value
+        current_ratio = self._holdings_ratio(current_price)
+        if current_ratio is None:
+            return _HOLD
         
-        # Bot-specific target ratio variation (0.4 to 0.6 instead of fixed 0.5)
-        base_target = self.parameters['target_bc_ratio']
-        target_ratio = base_target * (0.8 + (hash(self.bot_id + 'target') % 40) / 100.0)
-        
-        # Bot-specific threshold variation (0.08 to 0.12 instead of fixed 0.1)
-        base_threshold = self.parameters['rebalance_threshold']
-        threshold = base_threshold * (0.8 + (hash(self.bot_id + 'threshold') % 40) / 100.0)
-        
-        # Bot-specific trade size variation
-        base_size = self.parameters['trade_size']
-        amount = base_size * (0.6 + (hash(self.bot_id + 'size') % 80) / 100.0)  # ±40% variation
+        params = self._strategy_params()
+        target_ratio = params['target_ratio']
+        threshold = params['threshold']
+        amount = params['amount']
         
         # Add small random factor (5% chance to skip rebalancing)
         if random.random() < 0.05:
-            return {'action': 'hold', 'amount': 0.0}
+            return _HOLD
         
         if current_ratio < target_ratio - threshold:
             # Scale buy amount based on available capital
@@ -441,57 +511,43 @@ class Bot:
             scaled_amount = self._scale_trade_amount(amount, current_price, 'sell')
             return {'action': 'sell', 'amount': scaled_amount}
         
-        return {'action': 'hold', 'amount': 0.0}
+        return _HOLD
     
     def _analyze_hedger(self, coins: List[float], current_price: float) -> Dict:
         """Hedging strategy with bot-specific variation"""
         if len(coins) < 2:
-            return {'action': 'hold', 'amount': 0.0}
+            return _HOLD
         
-        # Bot-specific volatility calculation window
-        base_window = 10
-        vol_window = max(5, int(base_window * (0.7 + (hash(self.bot_id + 'window') % 60) / 100.0)))
+        params = self._strategy_params()
+        vol_window = params['vol_window']
         
-        recent_prices = coins[-vol_window:] if len(coins) >= vol_window else coins
-        returns = [(recent_prices[i] - recent_prices[i-1]) / recent_prices[i-1] 
-                  for i in range(1, len(recent_prices)) if recent_prices[i-1] > 0]
+        # Returns and their spread as array ops rather than per-element Python arithmetic
+        recent_prices = np.asarray(coins[-vol_window:], dtype=np.float64)
+        previous = recent_prices[:-1]
+        positive = previous > 0
+        returns = (recent_prices[1:][positive] - previous[positive]) / previous[positive]
         
-        if not returns:
-            return {'action': 'hold', 'amount': 0.0}
+        if len(returns) == 0:
+            return _HOLD
         
-        mean_return = sum(returns) / len(returns)
-        variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-        volatility = math.sqrt(variance) if variance > 0 else 0
+        volatility = float(returns.std())
         
-        total_value = self.usd + (self.bc * current_price)
-        if total_value == 0:
-            return {'action': 'hold', 'amount': 0.0}
-        
-        bc_value = self.bc * current_price
-        current_ratio = bc_value / total_value
-        
-        # Bot-specific volatility threshold variation (0.04 to 0.06 instead of fixed 0.05)
-        base_threshold = self.parameters['volatility_threshold']
-        vol_threshold = base_threshold * (0.8 + (hash(self.bot_id + 'vol_threshold') % 40) / 100.0)
+        current_ratio = self._holdings_ratio(current_price)
+        if current_ratio is None:
+            return _HOLD
         
         # Bot-specific ratio targets variation
-        if volatility > vol_threshold:
-            base_high = self.parameters['high_vol_ratio']
-            target_ratio = base_high * (0.8 + (hash(self.bot_id + 'high_vol') % 40) / 100.0)
+        if volatility > params['vol_threshold']:
+            target_ratio = params['high_vol_ratio']
         else:
-            base_low = self.parameters['low_vol_ratio']
-            target_ratio = base_low * (0.8 + (hash(self.bot_id + 'low_vol') % 40) / 100.0)
-        
-        # Bot-specific rebalance threshold (0.08 to 0.12 instead of fixed 0.1)
-        rebalance_threshold = 0.1 * (0.8 + (hash(self.bot_id + 'rebalance') % 40) / 100.0)
+            target_ratio = params['low_vol_ratio']
         
-        # Bot-specific trade size variation
-        base_size = self.parameters['trade_size']
-        amount = base_size * (0.7 + (hash(self.bot_id + 'size') % 60) / 100.0)  # ±30% variation
+        rebalance_threshold = params['rebalance_threshold']
+        amount = params['amount']
         
         # Add small random factor (4% chance to ignore signal)
         if random.random() < 0.04:
-            return {'action': 'hold', 'amount': 0.0}
+            return _HOLD
         
         if current_ratio < target_ratio - rebalance_threshold:
             # Scale buy amount based on available capital
@@ -502,7 +558,7 @@ class Bot:
             scaled_amount = self._scale_trade_amount(amount, current_price, 'sell')
             return {'action': 'sell', 'amount': scaled_amount}
         
-        return {'action': 'hold', 'amount': 0.0}
+        return _HOLD
     
     def _analyze_custom(self, coins: List[float], current_price: float) -> Dict:
         """
@@ -516,8 +572,8 @@ class Bot:
             Dict with 'action' and 'amount' keys
         """
         if not self.custom_strategy_code:
-            print(f"Warning: Bot {self.bot_id} has no custom strategy code, defaulting to hold")
-            return {'action': 'hold', 'amount': 0.0}
+            logger.warning(f"Bot {self.bot_id} has no custom strategy code, defaulting to hold")
+            return _HOLD
         
         try:
             # Create a safe execution environment with pre-imported modules
@@ -547,30 +603,30 @@ class Bot:
             }
             
             # Execute the custom strategy code to define the function
-            exec(self.custom_strategy_code, safe_globals)
+            exec(_compile_strategy(self.custom_strategy_code), safe_globals)
             
             # Check if the custom_strategy function was defined
             if 'custom_strategy' not in safe_globals:
-                print(f"Error: custom_strategy function not found in generated code")
-                return {'action': 'hold', 'amount': 0.0}
+                logger.error("custom_strategy function not found in generated code")
+                return _HOLD
             
             # Call the custom strategy function
             result = safe_globals['custom_strategy'](coins, current_price)
             
             # Validate result format
             if not isinstance(result, dict):
-                print(f"Error: custom_strategy returned non-dict: {type(result)}")
-                return {'action': 'hold', 'amount': 0.0}
+                logger.error(f"custom_strategy returned non-dict: {type(result)}")
+                return _HOLD
             
             if 'action' not in result or 'amount' not in result:
-                print(f"Error: custom_strategy missing required keys: {result.keys()}")
-                return {'action': 'hold', 'amount': 0.0}
+                logger.error(f"custom_strategy missing required keys: {result.keys()}")
+                return _HOLD
             
             # Validate action
             action = result['action']
             if action not in ['buy', 'sell', 'hold']:
-                print(f"Error: invalid action '{action}', defaulting to hold")
-                return {'action': 'hold', 'amount': 0.0}
+                logger.error(f"Invalid action '{action}', defaulting to hold")
+                return _HOLD
             
             # Validate and clamp amount
             try:
@@ -580,162 +636,61 @@ class Bot:
                 # Clamp to reasonable range (increased to allow larger trades - 20x scale)
                 amount = min(max(amount, 0.0), 1000.0)
             except (ValueError, TypeError):
-                print(f"Error: invalid amount '{result['amount']}'")
-                return {'action': 'hold', 'amount': 0.0}
+                logger.error(f"Invalid amount '{result['amount']}'")
+                return _HOLD
             
             return {'action': action, 'amount': amount}
             
         except Exception as e:
-            print(f"Error executing custom strategy for bot {self.bot_id}: {e}")
-            import traceback
-            traceback.print_exc()
-            return {'action': 'hold', 'amount': 0.0}
+            logger.exception(f"Error executing custom strategy for bot {self.bot_id}: {e}")
+            return _HOLD
     
-    def buy(self, amount: float, price: float, game_data: Dict, user_id: Optional[str] = None) -> bool:
-        """
-        Execute buy trade
-        
-        Args:
-            amount: Amount of BC to buy
-            price: Price per BC
-            game_data: Game room data dict (will be modified)
-            user_id: Owner user ID (if applicable)
-        
-        Returns:
-            True if successful, False otherwise
-        """
-        from transaction_history import TransactionHistory
-        from datetime import datetime
-        
-        cost = amount * price
-        
-        # Check if bot has enough USD
-        if self.usd < cost:
-            return False
-        
-        # Update bot wallet - prevent negative balances
-        self.usd = max(0.0, self.usd - cost)
-        self.bc = max(0.0, self.bc + amount)
-        
-        # Update game totals (market supplies) - convert from string if needed
-        total_bc = float(game_data.get('totalBc', 0.0))
-        total_usd = float(game_data.get('totalUsd', 0.0))
-        game_data['totalBc'] = total_bc - amount
-        game_data['totalUsd'] = total_usd + cost
-        
-        # NOTE: Do NOT modify user's balance when bot trades
-        # Bots have their own separate balances (self.usd and self.bc)
-        # The user's balance should only change when they manually buy/sell
-        # Bot balances are displayed separately in the UI but don't affect user's coinBalance/usdBalance
-        
-        # Get game_id from game_data (need to extract it)
-        game_id = game_data.get('gameId', '')
-        if not game_id and hasattr(self, '_current_game_id'):
-            game_id = self._current_game_id
-        
-        # Record transaction in history
-        if game_id:
-            TransactionHistory.add_transaction(game_id, {
-                'type': 'buy',
-                'actor': self.bot_id,
-                'actor_name': self.bot_name,
-                'amount': amount,
-                'price': price,
-                'total_cost': cost,
-                'timestamp': datetime.now().isoformat(),
-                'is_bot': True,
-                'bot_type': self.bot_type,
-                'user_id': user_id
-            })
-        
-        return True
-    
-    def sell(self, amount: float, price: float, game_data: Dict, user_id: Optional[str] = None) -> bool:
-        """
-        Execute sell trade
-        
-        Args:
-            amount: Amount of BC to sell
-            price: Price per BC
-            game_data: Game room data dict (will be modified)
-            user_id: Owner user ID (if applicable)
-        
-        Returns:
-            True if successful, False otherwise
-        """
-        from transaction_history import TransactionHistory
-        from datetime import datetime
-        
-        # Check if bot has enough BC
-        if self.bc < amount:
-            return False
-        
-        revenue = amount * price
-        
-        # Update bot wallet - prevent negative balances
-        self.bc = max(0.0, self.bc - amount)
-        self.usd = max(0.0, self.usd + revenue)
-        
-        # Update game totals (market supplies) - convert from string if needed
-        total_bc = float(game_data.get('totalBc', 0.0))
-        total_usd = float(game_data.get('totalUsd', 0.0))
-        game_data['totalBc'] = total_bc + amount
-        game_data['totalUsd'] = total_usd - revenue
-        
-        # NOTE: Do NOT modify user's balance when bot trades
-        # Bots have their own separate balances (self.usd and self.bc)
-        # The user's balance should only change when they manually buy/sell
-        # Bot balances are displayed separately in the UI but don't affect user's coinBalance/usdBalance
-        
-        # Get game_id from game_data (need to extract it)
-        game_id = game_data.get('gameId', '')
-        if not game_id and hasattr(self, '_current_game_id'):
-            game_id = self._current_game_id
-        
-        # Record transaction in history
-        if game_id:
-            TransactionHistory.add_transaction(game_id, {
-                'type': 'sell',
-                'actor': self.bot_id,
-                'actor_name': self.bot_name,
-                'amount': amount,
-                'price': price,
-                'total_cost': revenue,
-                'timestamp': datetime.now().isoformat(),
-                'is_bot': True,
-                'bot_type': self.bot_type,
-                'user_id': user_id
-            })
-        
-        return True
+    # bot_type -> analyzer, all called as (self, coins, current_price)
+    _ANALYZERS = {
+        'random': lambda self, coins, current_price: self._analyze_random(),
+        'momentum': _analyze_momentum,
+        'mean_reversion': _analyze_mean_reversion,
+        'market_maker': lambda self, coins, current_price: self._analyze_market_maker(current_price),
+        'hedger': _analyze_hedger,
+        'custom': _analyze_custom
+    }
     
     def save_to_redis(self, game_id: str):
         """Save bot data to Redis"""
         try:
             r = get_redis_connection()
-            
-            bot_key = f"bot:{game_id}:{self.bot_id}"
-            bot_data = {
-                'bot_id': self.bot_id,
-                'is_toggled': str(self.is_toggled),
-                'usd_given': str(self.usd_given),
-                'usd': str(self.usd),
-                'bc': str(self.bc),
-                'bot_type': self.bot_type,
-                'bot_name': self.bot_name,
-                'behavior_coefficient': str(self.behavior_coefficient),
-                'parameters': json.dumps(self.parameters),
-                'user_id': self.user_id or '',
-                'custom_strategy_code': self.custom_strategy_code or ''
-            }
-            r.hset(bot_key, mapping=bot_data)
-            
-            # Add to game's bot set
-            bots_set_key = f"bots:{game_id}"
-            r.sadd(bots_set_key, self.bot_id)
-            
+            pipe = r.pipeline(transaction=False)
+            self.queue_save(pipe, game_id)
+            pipe.execute()
+        
         except Exception as e:
-            print(f"Warning: Failed to save bot {self.bot_id} to Redis: {e}")
+            logger.warning(f"Failed to save bot {self.bot_id} to Redis: {e}")
+    
+    def queue_save(self, pipe, game_id: str):
+        """Queue the writes of save_to_redis on a pipeline, so they can go out with other writes"""
+        bot_key = f"bot:{game_id}:{self.bot_id}"
+        bot_data = {
+            'bot_id': self.bot_id,
+            'is_toggled': str(self.is_toggled),
+            'usd_given': str(self.usd_given),
+            'usd': str(self.usd),
+            'bc': str(self.bc),
+            'bot_type': self.bot_type,
+            'bot_name': self.bot_name,
+            'behavior_coefficient': str(self.behavior_coefficient),
+            'parameters': json.dumps(self.parameters),
+            'user_id': self.user_id or '',
+            'custom_strategy_code': self.custom_strategy_code or ''
+        }
+        pipe.hset(bot_key, mapping=bot_data)
+        
+        # Add to game's bot set
+        bots_set_key = f"bots:{game_id}"
+        pipe.sadd(bots_set_key, self.bot_id)
+        
+        # Per-user index, so a user's bots can be listed without scanning the game
+        if self.user_id:
+            pipe.sadd(f"{bots_set_key}:user:{self.user_id}", self.bot_id)
     
     @classmethod
     def load_from_redis(cls, game_id: str, bot_id: str) -> Optional['Bot']:
@@ -743,300 +698,103 @@ class Bot:
         try:
             r = get_redis_connection()
             
-            bot_key = f"bot:{game_id}:{bot_id}"
-            if not r.exists(bot_key):
-                return None
-            
-            bot_data = r.hgetall(bot_key)
+            # A missing bot reads back as an empty hash, no separate EXISTS needed
+            bot_data = r.hgetall(f"bot:{game_id}:{bot_id}")
             if not bot_data:
                 return None
             
-            is_toggled = bot_data.get('is_toggled', 'True').lower() == 'true'
-            
-            # Load behavior_coefficient if present, otherwise will be generated
-            behavior_coefficient = None
-            if 'behavior_coefficient' in bot_data:
-                try:
-                    behavior_coefficient = float(bot_data['behavior_coefficient'])
-                except (ValueError, TypeError):
-                    behavior_coefficient = None
-            
-            parameters = {}
-            if 'parameters' in bot_data:
-                try:
-                    parameters = json.loads(bot_data['parameters'])
-                except (json.JSONDecodeError, TypeError):
-                    parameters = {}
-            
-            custom_strategy_code = bot_data.get('custom_strategy_code', '')
-            if not custom_strategy_code:
-                custom_strategy_code = None
-            
-            bot = cls(
-                bot_id=bot_data.get('bot_id', bot_id),
-                is_toggled=is_toggled,
-                usd_given=float(bot_data.get('usd_given', 0)),
-                usd=float(bot_data.get('usd', 0)),
-                bc=float(bot_data.get('bc', 0)),
-                bot_type=bot_data.get('bot_type', 'random'),
-                behavior_coefficient=behavior_coefficient,
-                user_id=bot_data.get('user_id', ''),
-                custom_strategy_code=custom_strategy_code,
-                bot_name=bot_data.get('bot_name')
-            )
-            bot.parameters = parameters
-            
-            return bot
+            return cls._from_redis_hash(bot_id, bot_data)
             
         except Exception as e:
-            print(f"Error loading bot {bot_id} from Redis: {e}")
+            logger.error(f"Error loading bot {bot_id} from Redis: {e}")
             return None
     
-    def remove_from_redis(self, game_id: str):
-        """Remove bot data from Redis"""
-        try:
-            r = get_redis_connection()
-            
-            bot_key = f"bot:{game_id}:{self.bot_id}"
-            r.delete(bot_key)
-            
-            bots_set_key = f"bots:{game_id}"
-            r.srem(bots_set_key, self.bot_id)
-            
-        except Exception as e:
-            print(f"Warning: Failed to remove bot {self.bot_id} from Redis: {e}")
-    
-    def run(self, game_id: str, update_interval: float = 1.0):
-        """
-        Main bot trading loop. Continuously monitors coin prices, makes trading decisions,
-        and updates the bot's wallet. Runs throughout the game until bot is toggled off.
-        
-        Args:
-            game_id: Game ID where the bot operates
-            update_interval: Time in seconds between trading decisions (default: 1.0)
+    @classmethod
+    def load_many_from_redis(cls, game_id: str, bot_ids: Iterable[str]) -> List['Bot']:
         """
-        import time
-        
-        print(f"Bot {self.bot_id} started running in game {game_id}")
-        last_trade_time = 0
-        iteration_count = 0
-        
-        while True:
-            try:
-                current_time = time.time()
-                
-                # Only check every update_interval seconds
-                if current_time - last_trade_time < update_interval:
-                    time.sleep(0.1)  # Short sleep to avoid busy waiting
-                    continue
-                
-                last_trade_time = current_time
-                iteration_count += 1
-                
-                # Reload toggle state from Redis
-                r = get_redis_connection()
-                bot_key = f"bot:{game_id}:{self.bot_id}"
-                if not r.exists(bot_key):
-                    # Bot removed, exit
-                    print(f"Bot {self.bot_id} removed, stopping")
-                    break
-                
-                # Check if game has ended - if so, stop the bot
-                game_key = f"game:{game_id}"
-                if r.exists(game_key):
-                    game_data = r.hgetall(game_key)
-                    is_ended = game_data.get('isEnded', 'false').lower() == 'true'
-                    if is_ended:
-                        # Game has ended, stop this bot
-                        print(f"Bot {self.bot_id} stopping - game {game_id} has ended")
-                        self.is_toggled = False
-                        self.save_to_redis(game_id)
-                        break
-                
-                bot_data = r.hgetall(bot_key)
-                # Python stores True/False, Redis returns as string "True" or "False"
-                is_toggled_str = bot_data.get('is_toggled', 'True')
-                self.is_toggled = (is_toggled_str == 'True' or is_toggled_str == 'true' or is_toggled_str == '1')
-                
-                if not self.is_toggled:
-                    # Bot is OFF - continue checking without trading
-                    continue
-                
-                # Get real-time access to coins (price history)
-                coins = self._get_coins_from_redis(game_id)
-                if not coins:
-                    continue
-                
-                current_price = coins[-1] if coins else 1.0
-                
-                # Make trading decision based on trend
-                decision = self.analyze(coins, current_price)
-                
-                # Execute trade if decision is not 'hold'
-                if decision['action'] != 'hold' and decision['amount'] > 0:
-                    # Scale trade amount for random bot (other bots already scaled in their analyze methods)
-                    if self.bot_type == 'random':
-                        scaled_amount = self._scale_trade_amount(decision['amount'], current_price, decision['action'])
-                        decision['amount'] = scaled_amount
-                    
-                    # Load game data for trade execution
-                    game_data = self._get_game_data_from_redis(game_id)
-                    if game_data:
-                        success = False
-                        if decision['action'] == 'buy':
-                            success = self.buy(decision['amount'], current_price, game_data, self.user_id)
-                        elif decision['action'] == 'sell':
-                            success = self.sell(decision['amount'], current_price, game_data, self.user_id)
-                        
-                        if success:
-                            # Save updated bot state to Redis
-                            self.save_to_redis(game_id)
-                            
-                            # Save updated game data back to Redis
-                            self._save_game_data_to_redis(game_id, game_data)
-                            
-                            print(f"Bot {self.bot_id} executed {decision['action']} of {decision['amount']} BC at {current_price}")
-                
-                # Periodically save bot state (every 5 iterations to reduce Redis writes)
-                if iteration_count % 5 == 0:
-                    self.save_to_redis(game_id)
-                
-            except Exception as e:
-                print(f"Error in Bot.run() for {self.bot_id}: {e}")
-                import traceback
-                traceback.print_exc()
-                # Short sleep on error to avoid rapid error loops
-                time.sleep(0.5)
-    
-    def _get_coins_from_redis(self, game_id: str) -> List[float]:
+        Load several bots from Redis in one round trip.
+        Bots that are missing or fail to parse are skipped.
         """
-        Get current coin price history from Redis.
-        Tries to get from market data first, then falls back to game data.
+        bot_ids = list(bot_ids)
+        if not bot_ids:
+            return []
         
-        Args:
-            game_id: Game ID
-            
-        Returns:
-            List of coin prices (price history)
-        """
         try:
             r = get_redis_connection()
-            
-            # Try to get from market data first
-            market_data_key = f"market:{game_id}:data"
-            if r.exists(market_data_key):
-                market_data = r.hgetall(market_data_key)
-                if 'price_history' in market_data:
-                    price_history = json.loads(market_data['price_history'])
-                    return price_history
-            
-            # Fall back to game data
-            game_key = f"game:{game_id}"
-            if r.exists(game_key):
-                game_data = r.hgetall(game_key)
-                
-                # Check for coinPrice (single value) or coins (array)
-                if 'coins' in game_data:
-                    coins_str = game_data['coins']
-                    if isinstance(coins_str, str):
-                        coins = json.loads(coins_str)
-                    else:
-                        coins = coins_str
-                    if isinstance(coins, list):
-                        return [float(c) for c in coins]
-                
-                # If only coinPrice exists, return it as a single-item list
-                if 'coinPrice' in game_data:
-                    coin_price = float(game_data['coinPrice'])
-                    return [coin_price]
-            
-            return []
-            
+            pipe = r.pipeline(transaction=False)
+            key_prefix = f"bot:{game_id}:"
+            for bot_id in bot_ids:
+                pipe.hgetall(key_prefix + bot_id)
+            results = pipe.execute()
         except Exception as e:
-            print(f"Error getting coins from Redis: {e}")
+            logger.error(f"Error loading bots for game {game_id} from Redis: {e}")
             return []
-    
-    def _get_game_data_from_redis(self, game_id: str) -> Optional[Dict]:
-        """
-        Get game data from Redis for trade execution.
         
-        Args:
-            game_id: Game ID
-            
-        Returns:
-            Game data dictionary or None
-        """
-        try:
-            r = get_redis_connection()
-            game_key = f"game:{game_id}"
-            
-            if not r.exists(game_key):
-                return None
-            
-            game_data = r.hgetall(game_key)
-            
-            # Parse JSON fields
-            if 'players' in game_data:
-                game_data['players'] = json.loads(game_data['players'])
-            
-            if 'interactions' in game_data:
-                try:
-                    game_data['interactions'] = json.loads(game_data['interactions'])
-                except:
-                    game_data['interactions'] = []
-            else:
-                game_data['interactions'] = []
-            
-            # Ensure totalBc and totalUsd exist
-            if 'totalBc' not in game_data:
-                game_data['totalBc'] = 0.0
-            else:
-                game_data['totalBc'] = float(game_data['totalBc'])
-            
-            if 'totalUsd' not in game_data:
-                game_data['totalUsd'] = 0.0
-            else:
-                game_data['totalUsd'] = float(game_data['totalUsd'])
-            
-            return game_data
-            
-        except Exception as e:
-            print(f"Error getting game data from Redis: {e}")
-            return None
+        bots = []
+        for bot_id, bot_data in zip(bot_ids, results):
+            if not bot_data:
+                continue
+            try:
+                bots.append(cls._from_redis_hash(bot_id, bot_data))
+            except Exception as e:
+                logger.error(f"Error loading bot {bot_id} from Redis: {e}")
+        return bots
     
-    def _save_game_data_to_redis(self, game_id: str, game_data: Dict):
-        """
-        Save updated game data back to Redis.
+    @classmethod
+    def _from_redis_hash(cls, bot_id: str, bot_data: Dict[str, str]) -> 'Bot':
+        """Build a bot from its Redis hash fields"""
+        is_toggled = bot_data.get('is_toggled', 'True').lower() == 'true'
         
-        Args:
-            game_id: Game ID
-            game_data: Updated game data dictionary
-        """
+        # Load behavior_coefficient if present, otherwise will be generated
+        behavior_coefficient = None
+        if 'behavior_coefficient' in bot_data:
+            try:
+                behavior_coefficient = float(bot_data['behavior_coefficient'])
+            except (ValueError, TypeError):
+                behavior_coefficient = None
+        
+        parameters = {}
+        if 'parameters' in bot_data:
+            try:
+                parameters = json.loads(bot_data['parameters'])
+            except (json.JSONDecodeError, TypeError):
+                parameters = {}
+        
+        custom_strategy_code = bot_data.get('custom_strategy_code', '')
+        if not custom_strategy_code:
+            custom_strategy_code = None
+        
+        bot = cls(
+            bot_id=bot_data.get('bot_id', bot_id),
+            is_toggled=is_toggled,
+            usd_given=float(bot_data.get('usd_given', 0)),
+            usd=float(bot_data.get('usd', 0)),
+            bc=float(bot_data.get('bc', 0)),
+            bot_type=bot_data.get('bot_type', 'random'),
+            behavior_coefficient=behavior_coefficient,
+            user_id=bot_data.get('user_id', ''),
+            custom_strategy_code=custom_strategy_code,
+            bot_name=bot_data.get('bot_name')
+        )
+        bot.parameters = parameters
+        
+        return bot
+    
+    def remove_from_redis(self, game_id: str):
+        """Remove bot data from Redis"""
         try:
             r = get_redis_connection()
-            game_key = f"game:{game_id}"
-            
-            # Serialize JSON fields
-            if 'players' in game_data:
-                game_data['players'] = json.dumps(game_data['players'])
             
-            if 'interactions' in game_data:
-                game_data['interactions'] = json.dumps(game_data['interactions'])
-            
-            # Convert numeric fields to strings for Redis
-            update_data = {}
-            for key, value in game_data.items():
-                if isinstance(value, (int, float)):
-                    update_data[key] = str(value)
-                elif isinstance(value, (list, dict)):
-                    update_data[key] = json.dumps(value) if not isinstance(value, str) else value
-                else:
-                    update_data[key] = str(value)
+            bot_key = f"bot:{game_id}:{self.bot_id}"
+            r.delete(bot_key)
             
-            r.hset(game_key, mapping=update_data)
+            bots_set_key = f"bots:{game_id}"
+            r.srem(bots_set_key, self.bot_id)
+            if self.user_id:
+                r.srem(f"{bots_set_key}:user:{self.user_id}", self.bot_id)
             
         except Exception as e:
-            print(f"Error saving game data to Redis: {e}")
+            logger.warning(f"Failed to remove bot {self.bot_id} from Redis: {e}")
     
     def to_dict(self) -> Dict:
         """
@@ -1,18 +1,66 @@
-import threading
-from typing import Optional, Dict
-import json
+import logging
+import os
+from typing import Optional, Dict, List, Tuple, Sequence
+from itertools import groupby
+from operator import attrgetter
+from datetime import datetime
+import orjson
+import numpy as np
 from bot import Bot
-from redis_helper import get_redis_connection
+from redis_helper import get_redis_connection, get_script
+from transaction_history import TransactionHistory
 
+logger = logging.getLogger(__name__)
 
-# Global dictionary to track running bot threads
-_running_bots: Dict[str, threading.Thread] = {}
+
+# Signal values used by the batched strategies
+HOLD, BUY, SELL = 0, 1, -1
+
+# One generator for every batched draw; Generator methods fill a whole cohort per call
+# and are faster than the legacy np.random global state
+_rng = np.random.default_rng()
+
+
+def _reseed_rng():
+    """Give a forked process (e.g. a tick worker) its own generator instead of the parent's state"""
+    global _rng
+    _rng = np.random.default_rng()
+
+
+# Forked children would otherwise all repeat the parent's draws
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reseed_rng)
+
+# Per-bot analyze() decisions as signal values
+_DECISION_SIGNALS = {'buy': BUY, 'sell': SELL, 'hold': HOLD}
+
+# Pulls a bot's (usd, bc) wallet in one C-level call when building the wallet columns
+_WALLET_FIELDS = attrgetter('usd', 'bc')
+
+# Sort/group key that puts each strategy's bots next to each other
+_BOT_TYPE = attrgetter('bot_type')
+
+# Flips a bot's is_toggled field (missing counts as on, like Bot._from_redis_hash).
+# KEYS: bot:{game}:{id} - Returns {new is_toggled, user_id}, or false if the bot doesn't exist.
+TOGGLE_BOT_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return false
+end
+local current = redis.call('HGET', KEYS[1], 'is_toggled')
+local toggled = 'True'
+if (not current) or string.lower(current) == 'true' then
+    toggled = 'False'
+end
+redis.call('HSET', KEYS[1], 'is_toggled', toggled)
+return {toggled, redis.call('HGET', KEYS[1], 'user_id') or ''}
+"""
 
 
 def buyBot(user_id: str, game_id: str, bot_type: str = 'random', 
            initial_usd: float = 1000.0) -> Optional[str]:
     """
-    Create a new bot for a user and start it running.
+    Create a new bot for a user. It starts trading on the game's next market
+    tick (see run_all_bots).
     
     Args:
         user_id: User ID who is buying the bot
@@ -25,80 +73,68 @@ def buyBot(user_id: str, game_id: str, bot_type: str = 'random',
     """
     try:
         r = get_redis_connection()
-        
-        # Load game data from Redis
         game_key = f"game:{game_id}"
-        if not r.exists(game_key):
-            print(f"Game {game_id} not found in Redis")
-            return None
-        
-        game_data = r.hgetall(game_key)
-        
-        # Parse players data
-        players = json.loads(game_data.get('players', '[]'))
-        user_found = False
-        user_index = -1
-        
-        for i, player in enumerate(players):
-            # Check both userId and playerId for compatibility
-            player_id = player.get('userId') or player.get('playerId')
-            if player_id == user_id:
-                user_found = True
-                user_index = i
-                break
-        
-        if not user_found:
-            print(f"User {user_id} not found in game {game_id}")
-            print(f"Available players: {[p.get('userId') or p.get('playerId') for p in players]}")
-            return None
-        
-        # Create new bot
-        bot = Bot(
-            bot_id=None,  # Will be auto-generated
-            is_toggled=True,
-            usd_given=initial_usd,
-            usd=initial_usd,
-            bc=0.0,
-            bot_type=bot_type,
-            user_id=user_id
-        )
-        
-        bot_id = bot.bot_id
-        
-        # Append bot to user's bots list
-        if 'bots' not in players[user_index]:
-            players[user_index]['bots'] = []
-        
-        players[user_index]['bots'].append({
-            'botId': bot_id,
-            'botName': bot_type
-        })
-        
-        # Save bot to Redis
-        bot.save_to_redis(game_id)
-        
-        # Update game data in Redis
-        r.hset(game_key, 'players', json.dumps(players))
-        
-        # Start bot running in a separate thread
-        bot_thread = threading.Thread(
-            target=bot.run,
-            args=(game_id,),
-            daemon=True,
-            name=f"Bot-{bot_id}"
-        )
-        bot_thread.start()
-        
-        # Track running bot
-        _running_bots[f"{game_id}:{bot_id}"] = bot_thread
-        
-        print(f"Bot {bot_id} created and started for user {user_id} in game {game_id}")
+        
+        def add_bot(pipe) -> Optional[str]:
+            # Load the players from Redis (the only game field needed; None if the game is missing)
+            players_json = pipe.hget(game_key, 'players')
+            if players_json is None:
+                logger.warning(f"Game {game_id} not found in Redis")
+                return None
+            
+            # Parse players data
+            players = orjson.loads(players_json)
+            user_found = False
+            user_index = -1
+            
+            for i, player in enumerate(players):
+                # Check both userId and playerId for compatibility
+                player_id = player.get('userId') or player.get('playerId')
+                if player_id == user_id:
+                    user_found = True
+                    user_index = i
+                    break
+            
+            if not user_found:
+                logger.warning(f"User {user_id} not found in game {game_id}")
+                logger.debug("Available players: %s", [p.get('userId') or p.get('playerId') for p in players])
+                return None
+            
+            # Create new bot
+            bot = Bot(
+                bot_id=None,  # Will be auto-generated
+                is_toggled=True,
+                usd_given=initial_usd,
+                usd=initial_usd,
+                bc=0.0,
+                bot_type=bot_type,
+                user_id=user_id
+            )
+            
+            # Append bot to user's bots list
+            if 'bots' not in players[user_index]:
+                players[user_index]['bots'] = []
+            
+            players[user_index]['bots'].append({
+                'botId': bot.bot_id,
+                'botName': bot_type
+            })
+            
+            # Save the bot and the updated players together
+            pipe.multi()
+            bot.queue_save(pipe, game_id)
+            pipe.hset(game_key, 'players', orjson.dumps(players))
+            return bot.bot_id
+        
+        # WATCH/MULTI: if anything else rewrites the players in between (another
+        # worker, the front end's join route), add_bot re-runs on fresh data
+        bot_id = r.transaction(add_bot, game_key, value_from_callable=True)
+        if bot_id is not None:
+            logger.info(f"Bot {bot_id} created for user {user_id} in game {game_id}")
         return bot_id
         
     except Exception as e:
-        print(f"Error in buyBot: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in buyBot: {e}")
         return None
 
 
@@ -116,43 +152,334 @@ def toggleBot(bot_id: str, game_id: str) -> bool:
     try:
         r = get_redis_connection()
         
-        # Load bot from Redis
-        bot = Bot.load_from_redis(game_id, bot_id)
-        if bot is None:
-            print(f"Bot {bot_id} not found in game {game_id}")
+        # Flip just the toggle field server-side, instead of loading and rewriting the whole bot
+        result = get_script(TOGGLE_BOT_LUA)(keys=[f"bot:{game_id}:{bot_id}"], client=r)
+        if not result:
+            logger.warning(f"Bot {bot_id} not found in game {game_id}")
             return False
         
-        # Toggle the bot state
-        bot.is_toggled = not bot.is_toggled
-        
-        # Save updated state to Redis
-        bot.save_to_redis(game_id)
+        is_toggled = result[0] == 'True'
+        owner_id = result[1]
         
-        # Update user's bot list in game data
+        # Update the owner's bot entry in game data (only the players field is needed)
         game_key = f"game:{game_id}"
-        if r.exists(game_key):
-            game_data = r.hgetall(game_key)
-            players = json.loads(game_data.get('players', '[]'))
+        
+        def set_entry_active(pipe):
+            players_json = pipe.hget(game_key, 'players')
+            if players_json is None:
+                return
+            players = orjson.loads(players_json)
             
             for player in players:
-                if 'bots' in player:
-                    for bot_entry in player['bots']:
-                        if bot_entry.get('botId') == bot_id:
-                            # Update bot entry if needed (e.g., isActive field)
-                            if 'isActive' not in bot_entry:
-                                bot_entry['isActive'] = bot.is_toggled
-                            else:
-                                bot_entry['isActive'] = bot.is_toggled
-                            break
+                # Go straight to the owner; bots saved without a user_id fall back to a full scan
+                if owner_id and (player.get('userId') or player.get('playerId')) != owner_id:
+                    continue
+                entry = next((e for e in player.get('bots', []) if e.get('botId') == bot_id), None)
+                if entry is not None:
+                    entry['isActive'] = is_toggled
+                    break
             
-            r.hset(game_key, 'players', json.dumps(players))
+            pipe.multi()
+            pipe.hset(game_key, 'players', orjson.dumps(players))
+        
+        # WATCH/MULTI: if anything else rewrites the players in between (another
+        # worker, the front end's join route), the update re-runs on fresh data
+        r.transaction(set_entry_active, game_key)
         
-        print(f"Bot {bot_id} toggled to {'ON' if bot.is_toggled else 'OFF'}")
+        logger.debug("Bot %s toggled to %s", bot_id, 'ON' if is_toggled else 'OFF')
         return True
         
     except Exception as e:
-        print(f"Error in toggleBot: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception(f"Error in toggleBot: {e}")
         return False
 
+
+
+# ============================================================================
+# BATCHED BOT EXECUTION
+# ============================================================================
+
+def _tail_mean_var(values: np.ndarray, windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and population variance of the last `w` values, for every w in `windows`.
+    Uses prefix sums over just the longest window, so each extra window costs O(1)
+    and the cost doesn't grow with the length of the game.
+    """
+    w = np.clip(windows, 1, len(values))
+    n = int(w.max()) if len(w) else 1
+    tail = values[len(values) - n:]
+    sums = np.concatenate(([0.0], np.cumsum(tail)))
+    sq_sums = np.concatenate(([0.0], np.cumsum(tail * tail)))
+    mean = (sums[n] - sums[n - w]) / w
+    var = np.maximum((sq_sums[n] - sq_sums[n - w]) / w - mean * mean, 0.0)
+    return mean, var
+
+
+def _param_columns(bots: List[Bot]) -> Dict[str, np.ndarray]:
+    """
+    A cohort's strategy parameters as columns, one array per parameter.
+    Every bot in a cohort has the same strategy (so the same parameter names),
+    so the whole table is built in one pass and split into columns.
+    """
+    params = [bot._strategy_params() for bot in bots]
+    names = list(params[0])
+    table = np.array([[p[name] for name in names] for p in params], dtype=np.float64)
+    return dict(zip(names, table.T))
+
+
+def _signals(buy: np.ndarray, sell: np.ndarray) -> np.ndarray:
+    """
+    Signal values from a cohort's buy and sell masks, without a select per branch:
+    with BUY = 1 and SELL = -1 the masks combine arithmetically (neither -> HOLD).
+    """
+    return buy.astype(np.int64) - sell
+
+
+def _skip(actions: np.ndarray, probability: float) -> np.ndarray:
+    """Randomly ignore signals, as each per-bot strategy does"""
+    actions[_rng.random(len(actions)) < probability] = HOLD
+    return actions
+
+
+def _holdings_ratio(usd: np.ndarray, bc: np.ndarray, price: float) -> Tuple[np.ndarray, np.ndarray]:
+    """BC share of each bot's portfolio value, plus a mask of bots holding anything"""
+    bc_value = bc * price
+    total_value = usd + bc_value
+    has_value = total_value != 0
+    ratio = np.divide(bc_value, total_value, out=np.zeros_like(total_value), where=has_value)
+    return ratio, has_value
+
+
+def _random_signals(bots: List[Bot], prices: np.ndarray,
+                    price: float, usd: np.ndarray, bc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    params = _param_columns(bots)
+    # Trade and side coin flips for the whole cohort in one draw
+    trade_draw, side_draw = _rng.random((2, len(bots)))
+    trades = trade_draw <= params['trade_probability']
+    sides = np.where(side_draw < 0.5, BUY, SELL)
+    actions = np.where(trades, sides, HOLD)
+    # Most bots hold on a given tick; only the ones trading need an amount
+    amounts = np.zeros(len(bots))
+    amounts[trades] = _rng.uniform(params['min_trade'][trades], params['max_trade'][trades])
+    return actions, amounts
+
+
+def _momentum_signals(bots: List[Bot], prices: np.ndarray,
+                      price: float, usd: np.ndarray, bc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    params = _param_columns(bots)
+    short_window = params['short_window'].astype(np.int64)
+    long_window = params['long_window'].astype(np.int64)
+    threshold = params['threshold']
+    
+    # Both windows of every bot from one set of prefix sums
+    means, _ = _tail_mean_var(prices, np.concatenate((short_window, long_window)))
+    short_ma, long_ma = means[:len(bots)], means[len(bots):]
+    
+    actions = _signals(short_ma > long_ma * (1.0 + threshold), short_ma < long_ma * (1.0 - threshold))
+    actions[(len(prices) < 2) | (len(prices) < short_window)] = HOLD
+    return _skip(actions, 0.05), params['amount']
+
+
+def _mean_reversion_signals(bots: List[Bot], prices: np.ndarray,
+                            price: float, usd: np.ndarray, bc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    params = _param_columns(bots)
+    threshold = params['threshold']
+    lookback = params['lookback'].astype(np.int64)
+    
+    # Work relative to the current price to keep the variance numerically stable
+    recent = prices[-int(lookback.max()):]
+    offset_mean, var = _tail_mean_var(recent - price, lookback)
+    std_dev = np.sqrt(var)
+    z_score = np.divide(-offset_mean, std_dev, out=np.zeros_like(std_dev), where=std_dev > 0)
+    
+    actions = _signals(z_score < -threshold, z_score > threshold)
+    if len(prices) < 2:
+        actions[:] = HOLD
+    return _skip(actions, 0.03), params['amount']
+
+
+def _market_maker_signals(bots: List[Bot], prices: np.ndarray,
+                          price: float, usd: np.ndarray, bc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    params = _param_columns(bots)
+    target_ratio = params['target_ratio']
+    threshold = params['threshold']
+    
+    ratio, has_value = _holdings_ratio(usd, bc, price)
+    
+    actions = _signals(ratio < target_ratio - threshold, ratio > target_ratio + threshold)
+    actions[~has_value] = HOLD
+    return _skip(actions, 0.05), params['amount']
+
+
+def _hedger_signals(bots: List[Bot], prices: np.ndarray,
+                    price: float, usd: np.ndarray, bc: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    params = _param_columns(bots)
+    actions = np.full(len(bots), HOLD)
+    if len(prices) < 2:
+        return actions, np.zeros(len(bots))
+    
+    # A window of w prices holds w - 1 returns; only the longest window is needed
+    vol_window = params['vol_window'].astype(np.int64)
+    recent = prices[-int(vol_window.max()):]
+    returns = np.diff(recent) / recent[:-1]
+    _, var = _tail_mean_var(returns, vol_window - 1)
+    volatility = np.sqrt(var)
+    
+    target_ratio = np.where(volatility > params['vol_threshold'],
+                            params['high_vol_ratio'],
+                            params['low_vol_ratio'])
+    rebalance_threshold = params['rebalance_threshold']
+    
+    ratio, has_value = _holdings_ratio(usd, bc, price)
+    
+    actions = _signals(ratio < target_ratio - rebalance_threshold,
+                       ratio > target_ratio + rebalance_threshold)
+    actions[~has_value] = HOLD
+    return _skip(actions, 0.04), params['amount']
+
+
+def _scale_trade_amounts(amounts: np.ndarray, actions: np.ndarray, usd: np.ndarray,
+                         bc: np.ndarray, price: float) -> np.ndarray:
+    """
+    Vectorized Bot._scale_trade_amount: size each trade to the bot's capital.
+    Buys use up to 20% of USD (capped at what is affordable), sells up to 20% of BC.
+    """
+    max_affordable = usd / price if price > 0 else np.zeros_like(usd)
+    buy_amounts = np.minimum(np.maximum(amounts, max_affordable * 0.2), max_affordable)
+    sell_amounts = np.minimum(np.maximum(amounts, bc * 0.2), bc)
+    return np.where(actions == BUY, buy_amounts, np.where(actions == SELL, sell_amounts, amounts))
+
+
+def _bot_trade_record(bot: Bot, action: str, amount: float, price: float, total: float) -> Dict:
+    """A batched bot trade's entry for TransactionHistory (see add_transaction() for the fields)"""
+    return {
+        'type': action,
+        'actor': bot.bot_id,
+        'actor_name': bot.bot_name,
+        'amount': amount,
+        'price': price,
+        'total_cost': total,
+        'timestamp': datetime.now().isoformat(),
+        'is_bot': True,
+        'bot_type': bot.bot_type,
+        'user_id': bot.user_id
+    }
+
+
+# Strategies that can be evaluated for a whole cohort at once, each called as
+# (bots, prices, current price, usd, bc) with the price worked out once per tick.
+# Custom (LLM-generated) strategies run bot by bot through Bot.analyze().
+_BATCH_SIGNALS = {
+    'random': _random_signals,
+    'momentum': _momentum_signals,
+    'mean_reversion': _mean_reversion_signals,
+    'market_maker': _market_maker_signals,
+    'hedger': _hedger_signals
+}
+
+
+def run_all_bots(game_id: str, price_history: Sequence[float]) -> int:
+    """
+    Let every active bot in a game make one trading decision.
+    
+    Called once per market tick by the game's update loop instead of running
+    a polling thread per bot. Bots are grouped by strategy and each group's
+    signals are computed in one vectorized pass over the price history.
+    Blocking - call through asyncio.to_thread() from async code.
+    
+    Args:
+        game_id: Game ID whose bots should trade
+        price_history: Market price history, most recent price last
+    
+    Returns:
+        Number of trades executed
+    """
+    if len(price_history) == 0:
+        return 0
+    
+    try:
+        r = get_redis_connection()
+        
+        # One pipelined round trip for every bot in the game
+        bots = [bot for bot in Bot.load_many_from_redis(game_id, r.smembers(f"bots:{game_id}"))
+                if bot.is_toggled]
+        
+        if not bots:
+            return 0
+        
+        # Order the bots by strategy so every cohort is one contiguous slice of the
+        # columns below (slices are views; no per-cohort gather or scatter)
+        bots.sort(key=_BOT_TYPE)
+        
+        prices = np.asarray(price_history, dtype=np.float64)
+        current_price = float(prices[-1])
+        
+        # Wallets as columns (one slot per bot) so sizing and settlement are array ops
+        usd, bc = np.array(list(map(_WALLET_FIELDS, bots)), dtype=np.float64).T
+        actions = np.full(len(bots), HOLD)
+        amounts = np.zeros(len(bots))
+        scaled = np.ones(len(bots), dtype=bool)
+        
+        stop = 0
+        for bot_type, group in groupby(bots, key=_BOT_TYPE):
+            cohort = list(group)
+            start, stop = stop, stop + len(cohort)
+            signal_fn = _BATCH_SIGNALS.get(bot_type)
+            if signal_fn is None:
+                # Per-bot strategies expect a plain list of prices; their amounts are used as-is
+                coins = prices.tolist()
+                for i, bot in enumerate(cohort, start):
+                    decision = bot.analyze(coins, current_price)
+                    actions[i] = _DECISION_SIGNALS.get(decision['action'], HOLD)
+                    amounts[i] = decision['amount']
+                scaled[start:stop] = False
+                continue
+            
+            actions[start:stop], amounts[start:stop] = signal_fn(cohort, prices, current_price,
+                                                                 usd[start:stop], bc[start:stop])
+        
+        amounts = np.where(scaled, _scale_trade_amounts(amounts, actions, usd, bc, current_price), amounts)
+        
+        # Settle every trade at once; a bot that can't cover its trade just skips it
+        totals = amounts * current_price
+        buys = (actions == BUY) & (amounts > 0) & (usd >= totals)
+        sells = (actions == SELL) & (amounts > 0) & (bc >= amounts)
+        bought = np.where(buys, amounts, 0.0)
+        sold = np.where(sells, amounts, 0.0)
+        spent = np.where(buys, totals, 0.0)
+        earned = np.where(sells, totals, 0.0)
+        usd = np.maximum(0.0, usd - spent + earned)
+        bc = np.maximum(0.0, bc + bought - sold)
+        
+        traded = np.flatnonzero(buys | sells)
+        
+        if len(traded):
+            # Sync only the wallet columns back, for every traded bot in one round trip.
+            # Other fields (e.g. is_toggled) may have changed since the bots were loaded.
+            pipe = r.pipeline(transaction=False)
+            key_prefix = f"bot:{game_id}:"
+            for i, bot_usd, bot_bc in zip(traded.tolist(), usd[traded].tolist(), bc[traded].tolist()):
+                bot = bots[i]
+                bot.usd = bot_usd
+                bot.bc = bot_bc
+                pipe.hset(key_prefix + bot.bot_id, mapping={'usd': str(bot_usd), 'bc': str(bot_bc)})
+            
+            # Bot buys take BC out of the market and put USD in; sells do the reverse.
+            # Applied as increments in the same round trip, so a concurrent writer isn't overwritten
+            game_key = f"game:{game_id}"
+            pipe.hincrbyfloat(game_key, 'totalBc', float(sold.sum() - bought.sum()))
+            pipe.hincrbyfloat(game_key, 'totalUsd', float(spent.sum() - earned.sum()))
+            pipe.execute()
+            
+            # The whole tick's trades go into the history together
+            TransactionHistory.add_transactions(game_id, [
+                _bot_trade_record(bots[i], 'buy' if buys[i] else 'sell',
+                                  float(amounts[i]), current_price, float(totals[i]))
+                for i in traded
+            ])
+        
+        return len(traded)
+    
+    except Exception as e:
+        logger.exception(f"Error in run_all_bots for game {game_id}: {e}")
+        return 0
@@ -1,57 +1,152 @@
+import logging
 import random
 import math
-from typing import List, Dict, Optional, Tuple
+import numpy as np
+from typing import List, Dict, Optional, Tuple, Iterable, Union
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
+from functools import lru_cache
 import uuid
 import json
-from redis_helper import get_redis_connection, serialize_datetime, deserialize_datetime
+import orjson
+from redis.exceptions import WatchError
+from redis_helper import get_redis_connection, get_script, serialize_datetime, deserialize_datetime
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+class PriceHistory:
+    """
+    Append-only price series backed by a preallocated NumPy buffer.
+    Appends are amortised O(1) (the buffer doubles when full) and tail reads
+    are views into the buffer instead of new lists.
+    Only the most recent MAX_LENGTH prices are kept, so the per-tick Redis write
+    and every load stay bounded however long a game runs.
+    """
+    
+    __slots__ = ('_buf', '_len')
+    
+    INITIAL_CAPACITY = 512  # Enough for a default 300 second game without regrowing
+    MAX_LENGTH = 10000  # Prices kept; older ones are dropped (like LTRIM on a Redis list)
+    
+    def __init__(self, prices: Optional[Iterable[float]] = None):
+        # fromiter fills the array straight from the iterable (e.g. the list orjson gives
+        # on every load) without an intermediate list copy
+        initial = np.fromiter(prices if prices is not None else (), dtype=np.float64)
+        initial = initial[len(initial) - min(len(initial), self.MAX_LENGTH):]
+        self._buf = np.empty(max(self.INITIAL_CAPACITY, 2 * len(initial)), dtype=np.float64)
+        self._buf[:len(initial)] = initial
+        self._len = len(initial)
+    
+    def append(self, price: float):
+        """Append a price, growing the buffer (or dropping the oldest prices) if needed"""
+        if self._len == len(self._buf):
+            if len(self._buf) < 2 * self.MAX_LENGTH:
+                grown = np.empty(min(2 * len(self._buf), 2 * self.MAX_LENGTH), dtype=np.float64)
+                grown[:self._len] = self._buf[:self._len]
+                self._buf = grown
+            else:
+                # Slide the kept window to the front; this happens once per MAX_LENGTH appends
+                keep = self.MAX_LENGTH - 1
+                self._buf[:keep] = self._buf[self._len - keep:self._len]
+                self._len = keep
+        self._buf[self._len] = price
+        self._len += 1
+    
+    @property
+    def values(self) -> np.ndarray:
+        """View of all kept prices (do not hold on to it across appends)"""
+        return self._buf[max(0, self._len - self.MAX_LENGTH):self._len]
+    
+    def tail(self, count: int) -> np.ndarray:
+        """View of the most recent `count` prices"""
+        return self._buf[max(0, self._len - min(count, self.MAX_LENGTH)):self._len]
+    
+    def tolist(self) -> List[float]:
+        """Plain Python list of prices, for JSON serialization"""
+        return self.values.tolist()
+    
+    def __len__(self) -> int:
+        return min(self._len, self.MAX_LENGTH)
+    
+    def __getitem__(self, index):
+        item = self.values[index]
+        return item if isinstance(index, slice) else float(item)
+    
+    def __iter__(self):
+        return iter(self.tolist())
+    
+    def __array__(self, dtype=None, copy=None):
+        # np.asarray(history, dtype=np.float64) must stay a view, not a per-tick copy
+        values = self.values if dtype is None else self.values.astype(dtype, copy=False)
+        return values.copy() if copy else values
+
+
+@dataclass(slots=True)
 class MarketData:
     """Represents the current and historical market state"""
     current_price: float
-    price_history: List[float]  # Historical prices (1 per second)
+    price_history: PriceHistory  # Historical prices (1 per second)
     start_time: datetime  # When the game started
     current_tick: int  # Current tick number (seconds since start)
     volatility: float  # Standard deviation of recent returns
     dollar_supply: float
     bc_supply: float
+    # Moving averages already computed since the last price, keyed by (window, end_tick)
+    _ma_cache: Dict[Tuple[int, Optional[int]], float] = field(default_factory=dict, init=False,
+                                                              repr=False, compare=False)
+    
+    def append_price(self, price: float):
+        """Record a new price, dropping the moving averages computed for the old history"""
+        self.price_history.append(price)
+        self._ma_cache.clear()
     
     @property
     def current_time(self) -> datetime:
         """Get the current timestamp based on tick"""
         return self.start_time + timedelta(seconds=self.current_tick)
     
+    @property
+    def first_tick(self) -> int:
+        """Tick of the oldest kept price (one price is recorded per tick, from tick 0)"""
+        return self.current_tick + 1 - len(self.price_history)
+    
     def get_price_at_tick(self, tick: int) -> Optional[float]:
-        """Get the price at a specific tick"""
-        if 0 <= tick < len(self.price_history):
-            return self.price_history[tick]
+        """Get the price at a specific tick (None if unknown or no longer kept)"""
+        index = tick - self.first_tick
+        if 0 <= index < len(self.price_history):
+            return self.price_history[index]
         return None
     
-    def get_prices(self, count: Optional[int] = None, end_tick: Optional[int] = None) -> List[float]:
+    def get_prices(self, count: Optional[int] = None, end_tick: Optional[int] = None) -> np.ndarray:
         """
         Get the most recent N prices
         
         Args:
             count: Number of prices to get (None = all)
-            end_tick: End at this tick (None = current)
+            end_tick: End before this tick (None = current)
         """
         if end_tick is None:
-            end_tick = len(self.price_history)
+            end = len(self.price_history)
+        else:
+            end = max(0, min(end_tick - self.first_tick, len(self.price_history)))
         
         if count is None:
-            return self.price_history[:end_tick]
+            return self.price_history[:end]
         
-        start_tick = max(0, end_tick - count)
-        return self.price_history[start_tick:end_tick]
+        start = max(0, end - count)
+        return self.price_history[start:end]
     
     def moving_average(self, window: int, end_tick: Optional[int] = None) -> float:
-        """Calculate moving average over the last `window` prices"""
-        prices = self.get_prices(window, end_tick)
-        if not prices:
-            return self.current_price
-        return sum(prices) / len(prices)
+        """Calculate moving average over the last `window` prices (memoized until the next price)"""
+        key = (window, end_tick)
+        average = self._ma_cache.get(key)
+        if average is None:
+            prices = self.get_prices(window, end_tick)
+            if len(prices) == 0:
+                return self.current_price
+            average = self._ma_cache[key] = float(prices.mean())
+        return average
     
     def price_change(self, periods: int = 1) -> float:
         """Calculate price change over the last `periods`"""
@@ -59,22 +154,96 @@ class MarketData:
             return 0.0
         return self.current_price - self.price_history[-(periods + 1)]
     
-    def returns(self, window: int = 10) -> List[float]:
+    def returns(self, window: int = 10) -> np.ndarray:
         """Calculate returns over the last `window` periods"""
         if len(self.price_history) < 2:
-            return []
+            return np.empty(0)
         
-        start_idx = max(0, len(self.price_history) - window - 1)
-        returns = []
-        for i in range(start_idx + 1, len(self.price_history)):
-            if self.price_history[i-1] != 0:
-                returns.append((self.price_history[i] - self.price_history[i-1]) / self.price_history[i-1])
-        return returns
+        prices = self.price_history.tail(window + 1)
+        previous = prices[:-1]
+        nonzero = previous != 0
+        return (prices[1:][nonzero] - previous[nonzero]) / previous[nonzero]
+
+
+# Applies a trade's supply deltas to both market hashes in one atomic step.
+# KEYS: market:{id}, market:{id}:data[, extra hash] - ARGV: dollar delta, bc delta[, field, value[, expected]]
+# The optional extra HSET is only written if the market exists (e.g. the trader's balances).
+# With `expected`, nothing is written unless the extra field still holds that value (compare-and-set).
+# Returns the new {dollar_supply, bc_supply} as strings, 0 if the compare-and-set failed,
+# or false if the market is gone.
+ADJUST_SUPPLIES_LUA = """
+if ARGV[5] and redis.call('HGET', KEYS[3], ARGV[3]) ~= ARGV[5] then
+    return 0
+end
+local dollar = tonumber(redis.call('HGET', KEYS[1], 'dollar_supply'))
+local bc = tonumber(redis.call('HGET', KEYS[1], 'bc_supply'))
+if not dollar or not bc then
+    return false
+end
+dollar = string.format('%.17g', math.max(0, dollar + tonumber(ARGV[1])))
+bc = string.format('%.17g', math.max(0, bc + tonumber(ARGV[2])))
+redis.call('HSET', KEYS[1], 'dollar_supply', dollar, 'bc_supply', bc)
+redis.call('HSET', KEYS[2], 'dollar_supply', dollar, 'bc_supply', bc)
+if KEYS[3] then
+    redis.call('HSET', KEYS[3], ARGV[3], ARGV[4])
+end
+return {dollar, bc}
+"""
+
+
+@lru_cache(maxsize=1024)
+def market_keys(game_id: str) -> Tuple[str, str]:
+    """
+    The (info, data) hash keys of a game's market.
+    Built once per game rather than formatted on every tick and trade.
+    """
+    return f"market:{game_id}", f"market:{game_id}:data"
+
+
+def adjust_market_supplies(game_id: str, dollar_delta: float, bc_delta: float,
+                           also_hset: Optional[Tuple[str, str, Union[str, bytes]]] = None,
+                           expected: Optional[Union[str, bytes]] = None
+                           ) -> Optional[Tuple[float, float]]:
+    """
+    Apply a trade to a market's supplies atomically in Redis, without loading the market.
+    Only the two supply fields are written, so a concurrent trade or market tick
+    is never overwritten by a stale copy of the other fields.
+    Supplies are floored at zero.
+    
+    also_hset: optional (key, field, value) written in the same step, so the
+    other side of the trade lands in the same round trip (or not at all)
+    expected: what also_hset's field must still hold for anything to be written, so a
+    read-modify-write of that field can't overwrite a change made by another process
+    
+    Returns:
+        The new (dollar_supply, bc_supply), or None if the market no longer exists
+    
+    Raises:
+        WatchError if `expected` no longer matches; re-read and retry
+    """
+    r = get_redis_connection()
+    keys = list(market_keys(game_id))
+    args = [dollar_delta, bc_delta]
+    if also_hset:
+        key, hash_field, value = also_hset
+        keys.append(key)
+        args += [hash_field, value]
+        if expected is not None:
+            args.append(expected)
+    result = get_script(ADJUST_SUPPLIES_LUA)(keys=keys, args=args, client=r)
+    if result == 0:
+        raise WatchError(f"{keys[-1]} changed since it was read")
+    if not result:
+        return None
+    return float(result[0]), float(result[1])
 
 
 class Market:
     """Market manager that handles users and market updates"""
     
+    __slots__ = ('game_id', 'start_time', 'current_tick', 'users', 'dollar_supply', 'bc_supply',
+                 'event_tick', 'event_time', 'event_title', 'event_triggered', 'market_data')
+    
     # Event titles pool
     EVENT_TITLES = [
         "Supply Crash",
@@ -91,14 +260,15 @@ class Market:
         "Disease Outbreak"
     ]
     
-    def __init__(self, initial_price: float = 1.0, game_id: Optional[str] = None, duration: int = 300):
-        """Initialize the market with starting price"""
+    def __init__(self, initial_price: float = 1.0, game_id: Optional[str] = None, duration: int = 300,
+                 dollar_supply: float = 1000000, bc_supply: float = 1000000):
+        """Initialize the market with starting price and supplies (saved to Redis once)"""
         self.game_id = game_id or str(uuid.uuid4())
         self.start_time = datetime.now()
         self.current_tick = 0
         self.users: List[str] = []
-        self.dollar_supply = 1000000
-        self.bc_supply = 1000000
+        self.dollar_supply = dollar_supply
+        self.bc_supply = bc_supply
         
         # Generate random event time (between 30% and 70% of game duration)
         min_event_tick = int(duration * 0.3)
@@ -115,7 +285,7 @@ class Market:
         # Initialize MarketData
         self.market_data = MarketData(
             current_price=initial_price,
-            price_history=[initial_price],
+            price_history=PriceHistory([initial_price]),
             start_time=self.start_time,
             current_tick=self.current_tick,
             volatility=0.0,
@@ -128,8 +298,14 @@ class Market:
     
     def addUser(self, userID: str):
         """Add a user to the market"""
-        if userID not in self.users:
-            self.users.append(userID)
+        self.addUsers([userID])
+    
+    def addUsers(self, userIDs: Iterable[str]):
+        """Add several users to the market, saving to Redis once"""
+        known = set(self.users)
+        new_users = [uid for uid in dict.fromkeys(userIDs) if uid not in known]
+        if new_users:
+            self.users.extend(new_users)
             self.save_to_redis()
     
     def removeUser(self, userID: str):
@@ -138,104 +314,110 @@ class Market:
             self.users.remove(userID)
             self.save_to_redis()
     
+    def adjust_supplies(self, dollar_delta: float, bc_delta: float,
+                        also_hset: Optional[Tuple[str, str, Union[str, bytes]]] = None) -> bool:
+        """
+        Apply a trade to the market supplies atomically in Redis (see adjust_market_supplies)
+        and update this market's copy. Returns False if the market no longer exists.
+        """
+        supplies = adjust_market_supplies(self.game_id, dollar_delta, bc_delta, also_hset)
+        if supplies is None:
+            return False
+        
+        self.dollar_supply, self.bc_supply = supplies
+        self.market_data.dollar_supply = self.dollar_supply
+        self.market_data.bc_supply = self.bc_supply
+        return True
+    
     def updateMarket(self, num_simulated_trades=20):
         """Update the market state (price, tick, volatility)"""
+        # Supplies as loaded; the tick's change is saved as a delta against them
+        start_dollar_supply, start_bc_supply = self.dollar_supply, self.bc_supply
+        
         # Increment tick
         self.current_tick += 1
         
-        # Track if event state changed (needs to be saved)
-        event_state_changed = False
-        
         # Check if event should trigger
         if not self.event_triggered and self.current_tick >= self.event_tick:
             self.event_triggered = True
             self._trigger_event()
-            event_state_changed = True
         
         # Reset event_triggered after 10 seconds (10 ticks) to allow front-end timeout to work
         # This ensures the event banner disappears after the timeout period
         if self.event_triggered and self.current_tick >= self.event_tick + 10:
             self.event_triggered = False
-            event_state_changed = True
         
         # Ensure supplies are always above minimum thresholds BEFORE any calculations
         MIN_BC_SUPPLY = 10000.0  # Increased minimum to prevent extreme price swings
         MIN_DOLLAR_SUPPLY = 10000.0
         
-        self.bc_supply = max(MIN_BC_SUPPLY, self.bc_supply)
-        self.dollar_supply = max(MIN_DOLLAR_SUPPLY, self.dollar_supply)
+        # Work on locals inside the simulation loop: LOAD_FAST instead of attribute lookups
+        bc_supply = max(MIN_BC_SUPPLY, self.bc_supply)
+        dollar_supply = max(MIN_DOLLAR_SUPPLY, self.dollar_supply)
+        uniform = random.uniform
+        rand = random.random
         
         # Simulate market activity with random trades to change supplies
         # This creates realistic price movement with higher volatility
         for _ in range(num_simulated_trades):
             # Calculate current price safely
-            if self.bc_supply <= 0:
-                self.bc_supply = MIN_BC_SUPPLY
-            if self.dollar_supply <= 0:
-                self.dollar_supply = MIN_DOLLAR_SUPPLY
+            if bc_supply <= 0:
+                bc_supply = MIN_BC_SUPPLY
+            if dollar_supply <= 0:
+                dollar_supply = MIN_DOLLAR_SUPPLY
             
-            current_price = self.dollar_supply / self.bc_supply
+            current_price = dollar_supply / bc_supply
             
             # Much larger, variable trade sizes for more volatility
             # Trade between 0.3% to 1.5% of current BC supply (reduced to prevent extreme swings)
-            min_trade = self.bc_supply * 0.003  # 0.3%
-            max_trade = self.bc_supply * 0.015   # 1.5%
-            trade_size = random.uniform(min_trade, max_trade)
+            trade_size = uniform(bc_supply * 0.003, bc_supply * 0.015)
             
             # Random buy or sell (50/50 chance)
-            if random.random() > 0.5:
+            if rand() > 0.5:
                 # Simulated buy: BC leaves market, USD enters market
-                new_bc_supply = self.bc_supply - trade_size
-                new_dollar_supply = self.dollar_supply + current_price * trade_size
-                
-                # Only apply trade if it doesn't violate minimum constraints
-                if new_bc_supply >= MIN_BC_SUPPLY and new_dollar_supply >= MIN_DOLLAR_SUPPLY:
-                    self.bc_supply = new_bc_supply
-                    self.dollar_supply = new_dollar_supply
+                new_bc_supply = bc_supply - trade_size
+                new_dollar_supply = dollar_supply + current_price * trade_size
             else:
                 # Simulated sell: BC enters market, USD leaves market
-                new_bc_supply = self.bc_supply + trade_size
-                new_dollar_supply = self.dollar_supply - current_price * trade_size
-                
-                # Only apply trade if it doesn't violate minimum constraints
-                if new_bc_supply >= MIN_BC_SUPPLY and new_dollar_supply >= MIN_DOLLAR_SUPPLY:
-                    self.bc_supply = new_bc_supply
-                    self.dollar_supply = new_dollar_supply
+                new_bc_supply = bc_supply + trade_size
+                new_dollar_supply = dollar_supply - current_price * trade_size
+            
+            # Only apply trade if it doesn't violate minimum constraints
+            if new_bc_supply >= MIN_BC_SUPPLY and new_dollar_supply >= MIN_DOLLAR_SUPPLY:
+                bc_supply = new_bc_supply
+                dollar_supply = new_dollar_supply
         
         # Ensure supplies are still above minimums after all trades
-        self.bc_supply = max(MIN_BC_SUPPLY, self.bc_supply)
-        self.dollar_supply = max(MIN_DOLLAR_SUPPLY, self.dollar_supply)
+        self.bc_supply = max(MIN_BC_SUPPLY, bc_supply)
+        self.dollar_supply = max(MIN_DOLLAR_SUPPLY, dollar_supply)
         
         # Calculate new price with updated supplies (guaranteed safe division)
         new_price = self.dollar_supply / self.bc_supply
         new_price = max(0.10, new_price)  # Ensure minimum price of $0.10 (no upper limit)
         
         # Update price history
-        self.market_data.price_history.append(new_price)
+        market_data = self.market_data
+        market_data.append_price(new_price)
         
         # Update market data
-        self.market_data.current_price = new_price
-        self.market_data.current_tick = self.current_tick
-        self.market_data.dollar_supply = self.dollar_supply
-        self.market_data.bc_supply = self.bc_supply
+        market_data.current_price = new_price
+        market_data.current_tick = self.current_tick
+        market_data.dollar_supply = self.dollar_supply
+        market_data.bc_supply = self.bc_supply
         
         # Calculate volatility from recent returns
-        returns = self.market_data.returns(window=10)
+        returns = market_data.returns(window=10)
         if len(returns) >= 2:
-            mean_return = sum(returns) / len(returns)
-            variance = sum((r - mean_return) ** 2 for r in returns) / len(returns)
-            self.market_data.volatility = math.sqrt(variance) if variance > 0 else 0.0
+            variance = float(returns.var())
+            market_data.volatility = math.sqrt(variance) if variance > 0 else 0.0
         else:
-            self.market_data.volatility = 0.0
+            market_data.volatility = 0.0
         
-        # Save to Redis after update
-        # Always save, but if event state changed, ensure it's saved immediately
-        self.save_to_redis()
-        
-        # If event state changed, save again to ensure it's persisted
-        # This is important for frontend polling to see the state change
-        if event_state_changed:
-            self.save_to_redis()
+        # Save to Redis after update; this includes any event state change, which
+        # frontend polling needs to see on this tick. Supplies go in as increments, so a
+        # user trade that committed while this tick ran is not overwritten.
+        self.save_to_redis(supply_deltas=(self.dollar_supply - start_dollar_supply,
+                                          self.bc_supply - start_bc_supply))
     
     def _trigger_event(self):
         """Trigger a market event with sudden price change"""
@@ -260,60 +442,109 @@ class Market:
         self.bc_supply = max(MIN_BC_SUPPLY, self.bc_supply)
         self.dollar_supply = max(MIN_DOLLAR_SUPPLY, self.dollar_supply)
         
-        print(f"🎉 EVENT TRIGGERED: {self.event_title} - {'Positive' if is_positive else 'Negative'} shock of {shock_factor*100:.1f}%")
+        logger.info(f"🎉 EVENT TRIGGERED: {self.event_title} - {'Positive' if is_positive else 'Negative'} shock of {shock_factor*100:.1f}%")
     
-    def save_to_redis(self):
-        """Save all market data to Redis"""
+    def save_to_redis(self, supply_deltas: Optional[Tuple[float, float]] = None):
+        """
+        Save all market data to Redis
+        
+        Args:
+            supply_deltas: (dollar, bc) change since the market was loaded. If given, the
+                supplies are applied as increments (through ADJUST_SUPPLIES_LUA) instead of
+                written from this copy, so trades that committed since the load are kept.
+        """
         try:
             r = get_redis_connection()
             
+            # Both hashes in one round trip, applied together so readers never see
+            # a new tick with the old price
+            pipe = r.pipeline()
+            
             # Store market basic info
-            market_key = f"market:{self.game_id}"
-            r.hset(market_key, mapping={
+            market_key, market_data_key = market_keys(self.game_id)
+            market_info = {
                 "game_id": self.game_id,
                 "start_time": serialize_datetime(self.start_time),
                 "current_tick": str(self.current_tick),
                 "users": json.dumps(self.users),
-                "dollar_supply": str(self.dollar_supply),
-                "bc_supply": str(self.bc_supply),
                 "event_tick": str(self.event_tick),
                 "event_time": serialize_datetime(self.event_time),
                 "event_title": self.event_title,
                 "event_triggered": str(self.event_triggered)
-            })
+            }
             
             # Store market data
-            market_data_key = f"market:{self.game_id}:data"
-            r.hset(market_data_key, mapping={
+            market_data = {
                 "current_price": str(self.market_data.current_price),
-                "price_history": json.dumps(self.market_data.price_history),
+                # Serialized straight from the NumPy buffer; the history is rewritten every tick
+                "price_history": orjson.dumps(self.market_data.price_history.values,
+                                              option=orjson.OPT_SERIALIZE_NUMPY),
                 "start_time": serialize_datetime(self.market_data.start_time),
                 "current_tick": str(self.market_data.current_tick),
-                "volatility": str(self.market_data.volatility),
-                "dollar_supply": str(self.market_data.dollar_supply),
-                "bc_supply": str(self.market_data.bc_supply)
-            })
+                "volatility": str(self.market_data.volatility)
+            }
+            
+            if supply_deltas is None:
+                market_info["dollar_supply"] = market_data["dollar_supply"] = str(self.dollar_supply)
+                market_info["bc_supply"] = market_data["bc_supply"] = str(self.bc_supply)
+            
+            pipe.hset(market_key, mapping=market_info)
+            pipe.hset(market_data_key, mapping=market_data)
+            if supply_deltas is not None:
+                # A plain EVAL inside the MULTI: a registered Script would add a SCRIPT EXISTS trip
+                pipe.eval(ADJUST_SUPPLIES_LUA, 2, market_key, market_data_key, *supply_deltas)
+            replies = pipe.execute()
+            
+            if supply_deltas is not None and replies[-1]:
+                # Keep this copy in step with what Redis now holds
+                self.dollar_supply, self.bc_supply = map(float, replies[-1])
+                self.market_data.dollar_supply = self.dollar_supply
+                self.market_data.bc_supply = self.bc_supply
             
         except Exception as e:
             # Log error but don't fail the operation
-            print(f"Warning: Failed to save market data to Redis: {e}")
+            logger.warning(f"Failed to save market data to Redis: {e}")
     
     @classmethod
     def load_from_redis(cls, game_id: str) -> Optional['Market']:
         """Load market data from Redis by game_id"""
         try:
-            r = get_redis_connection()
+            # Raw replies: the price history (the bulk of the reply, loaded every tick)
+            # goes to orjson as bytes, and only the small fields get decoded
+            r = get_redis_connection(decode_responses=False)
             
-            # Check if market exists
-            market_key = f"market:{game_id}"
-            if not r.exists(market_key):
-                return None
+            # Both hashes in one round trip; a missing market reads back as empty hashes
+            pipe = r.pipeline(transaction=False)
+            cls.queue_load(pipe, game_id)
+            return cls.from_redis_hashes(game_id, *pipe.execute())
             
-            # Load market basic info
-            market_data = r.hgetall(market_key)
-            if not market_data:
+        except Exception as e:
+            logger.error(f"Error loading market from Redis: {e}")
+            return None
+    
+    @staticmethod
+    def queue_load(pipe, game_id: str):
+        """
+        Queue the reads of load_from_redis on a pipeline (opened with
+        decode_responses=False), so they can go out with other commands.
+        Pass the two replies to from_redis_hashes.
+        """
+        market_key, market_data_key = market_keys(game_id)
+        pipe.hgetall(market_key)
+        pipe.hgetall(market_data_key)
+    
+    @classmethod
+    def from_redis_hashes(cls, game_id: str, raw_market_data: Dict[bytes, bytes],
+                          raw_data: Dict[bytes, bytes]) -> Optional['Market']:
+        """Build a market from the raw hashes read by queue_load, or None if it doesn't exist"""
+        try:
+            if not raw_market_data:
                 return None
             
+            price_history_json = raw_data.pop(b"price_history", None)
+            market_data = {k.decode(): v.decode() for k, v in raw_market_data.items()}
+            data = {k.decode(): v.decode() for k, v in raw_data.items()}
+            
             # Create Market instance
             start_time = deserialize_datetime(market_data["start_time"])
             current_tick = int(market_data["current_tick"])
@@ -324,14 +555,11 @@ class Market:
             event_time = deserialize_datetime(market_data.get("event_time", serialize_datetime(start_time + timedelta(seconds=150))))
             event_title = market_data.get("event_title", "Market Event")
             event_triggered = market_data.get("event_triggered", "false").lower() == "true"
-            # Load market data
-            market_data_key = f"market:{game_id}:data"
-            data = r.hgetall(market_data_key)
-            if not data:
+            if price_history_json is None:
                 return None
             
             # Reconstruct MarketData
-            price_history = json.loads(data["price_history"])
+            price_history = PriceHistory(orjson.loads(price_history_json))
             market_data_obj = MarketData(
                 current_price=float(data["current_price"]),
                 price_history=price_history,
@@ -359,16 +587,15 @@ class Market:
             return market
             
         except Exception as e:
-            print(f"Error loading market from Redis: {e}")
+            logger.error(f"Error loading market from Redis: {e}")
             return None
     
     def remove_from_redis(self):
         """Remove market data from Redis"""
         try:
             r = get_redis_connection()
-            market_key = f"market:{self.game_id}"
-            market_data_key = f"market:{self.game_id}:data"
+            market_key, market_data_key = market_keys(self.game_id)
             r.delete(market_key)
             r.delete(market_data_key)
         except Exception as e:
-            print(f"Warning: Failed to remove market data from Redis: {e}")
+            logger.warning(f"Failed to remove market data from Redis: {e}")
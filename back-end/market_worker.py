@@ -0,0 +1,178 @@
+"""
+Market tick worker for BananaCoin.
+Everything a single market tick needs lives here, so the API server can run
+ticks either on its thread pool or in separate worker processes.
+"""
+
+import json
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Optional
+from market import Market
+from bot_operations import run_all_bots
+from redis_helper import get_redis_connection, get_script
+
+
+# Game state info lives in Redis so every worker (and a restarted server) sees it
+GAME_STATE_TTL = 300  # Seconds; refreshed on every market tick
+
+# Only one server process may tick a game; it holds a lease that every tick renews
+TICKER_LEASE_TTL = 10  # Seconds; a crashed ticker's game can be restarted after this
+
+# Extend or drop the ticker lease, but only while this owner still holds it
+RENEW_TICKER_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+RELEASE_TICKER_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+# ============================================================================
+# GAME STATE STORE
+# ============================================================================
+
+def save_game_state(game_id: str, fields: Dict):
+    """
+    Merge fields into the game's state hash in Redis and refresh its TTL.
+    Values are JSON-encoded so numbers and booleans round-trip with their types.
+    """
+    pipe = get_redis_connection().pipeline(transaction=False)
+    _queue_game_state(pipe, game_id, fields)
+    pipe.execute()
+
+
+def _queue_game_state(pipe, game_id: str, fields: Dict):
+    """Queue save_game_state()'s commands on a pipeline"""
+    state_key = game_state_key(game_id)
+    pipe.hset(state_key, mapping={k: json.dumps(v) for k, v in fields.items()})
+    pipe.expire(state_key, GAME_STATE_TTL)
+
+
+def load_game_state(game_id: str) -> Dict:
+    """Load the game's state hash from Redis (empty dict if unknown or expired)"""
+    r = get_redis_connection()
+    return decode_game_state(r.hgetall(game_state_key(game_id)))
+
+
+@lru_cache(maxsize=1024)
+def game_state_key(game_id: str) -> str:
+    """Redis hash holding a game's state info"""
+    return f"game_state:{game_id}"
+
+
+def decode_game_state(data: Dict[str, str]) -> Dict:
+    """Decode a raw game state hash, as read by load_game_state()"""
+    return {k: json.loads(v) for k, v in data.items()}
+
+
+@lru_cache(maxsize=1024)
+def tick_channel(game_id: str) -> str:
+    """Pub/sub channel carrying per-tick market deltas for a game"""
+    return f"game:{game_id}:ticks"
+
+
+def publish_tick(game_id: str, market: Market):
+    """Broadcast the tick delta to websocket subscribers"""
+    pipe = get_redis_connection().pipeline(transaction=False)
+    _queue_tick(pipe, game_id, market)
+    pipe.execute()
+
+
+def _queue_tick(pipe, game_id: str, market: Market):
+    """Queue publish_tick()'s command on a pipeline"""
+    pipe.publish(tick_channel(game_id), json.dumps({
+        'tick': market.current_tick,
+        'price': market.market_data.current_price,
+        'volatility': market.market_data.volatility
+    }))
+
+
+# ============================================================================
+# TICKER LEASE
+# ============================================================================
+
+def ticker_key(game_id: str) -> str:
+    """Redis key naming the process that currently ticks a game"""
+    return f"market_ticker:{game_id}"
+
+
+def lease_ttl(update_interval: float) -> int:
+    """Lease length for a tick interval; it must outlive the gap between two ticks"""
+    return max(TICKER_LEASE_TTL, int(update_interval * 3) + 1)
+
+
+def claim_ticker(game_id: str, owner: str, ttl: int = TICKER_LEASE_TTL) -> bool:
+    """Take the ticker lease for a game. Returns False if another process holds it."""
+    r = get_redis_connection()
+    return bool(r.set(ticker_key(game_id), owner, nx=True, ex=ttl))
+
+
+def release_ticker(game_id: str, owner: str):
+    """Give up the ticker lease if this owner still holds it"""
+    r = get_redis_connection()
+    get_script(RELEASE_TICKER_LUA)(keys=[ticker_key(game_id)], args=[owner], client=r)
+
+
+# ============================================================================
+# MARKET TICK
+# ============================================================================
+
+def run_tick(game_id: str, update_count: int, owner: Optional[str] = None,
+             ttl: int = TICKER_LEASE_TTL) -> Optional[Dict]:
+    """
+    Run one market tick: update the price, let the bots trade, broadcast the
+    delta and record the game state.
+    
+    Blocking, and safe to run in a worker process: only the game ID goes in
+    and a small summary comes back, all other state is in Redis.
+    
+    If owner is given, the ticker lease is renewed first and the tick is
+    skipped if the lease was lost.
+    
+    Returns:
+        {'current_tick': int, 'current_price': float}, or None if the market is
+        gone or the lease was lost
+    """
+    # Renew the lease and read the market in one round trip. The lease script goes
+    # as a plain EVAL: a pipelined registered Script would add a SCRIPT EXISTS trip.
+    pipe = get_redis_connection(decode_responses=False).pipeline(transaction=False)
+    if owner is not None:
+        pipe.eval(RENEW_TICKER_LUA, 1, ticker_key(game_id), owner, ttl)
+    Market.queue_load(pipe, game_id)
+    replies = pipe.execute()
+    
+    if owner is not None and not replies.pop(0):
+        return None
+    
+    market = Market.from_redis_hashes(game_id, *replies)
+    if market is None:
+        return None
+    
+    market.updateMarket()
+    
+    # Every active bot trades once per tick, in one batch
+    run_all_bots(game_id, market.market_data.price_history)
+    
+    # Push the delta to live subscribers (REST polling still works as fallback)
+    # and record the game state, in one round trip
+    pipe = get_redis_connection().pipeline(transaction=False)
+    _queue_tick(pipe, game_id, market)
+    _queue_game_state(pipe, game_id, {
+        'current_tick': market.current_tick,
+        'current_price': market.market_data.current_price,
+        'updates_count': update_count,
+        'last_update': datetime.now().isoformat()
+    })
+    pipe.execute()
+    
+    return {
+        'current_tick': market.current_tick,
+        'current_price': market.market_data.current_price
+    }
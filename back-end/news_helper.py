@@ -3,38 +3,45 @@ Helper module for managing generic news headlines
 """
 import random
 import os
+from functools import lru_cache
 
-def load_generic_news() -> list[str]:
+@lru_cache(maxsize=1)
+def _load_headlines() -> tuple[str, ...]:
     """
-    Load generic news headlines from generic_news.txt file.
-    Returns a list of headlines, or empty list if file doesn't exist.
+    Read generic_news.txt once per process; the headlines never change while the server runs.
     """
     news_file = os.path.join(os.path.dirname(__file__), 'generic_news.txt')
     
     try:
         if os.path.exists(news_file):
             with open(news_file, 'r', encoding='utf-8') as f:
-                headlines = [line.strip() for line in f if line.strip()]
-            return headlines
+                # Strip each line once, then drop the blank ones
+                return tuple(headline for headline in map(str.strip, f) if headline)
         else:
             # Return default headlines if file doesn't exist
-            return [
+            return (
                 "Market Analysts Predict Bullish Trend",
                 "New Trading Features Announced",
                 "Investor Confidence Remains High",
                 "Price Stability Maintained",
                 "Trading Activity Increases"
-            ]
+            )
     except Exception as e:
         print(f"Error loading generic news: {e}")
-        return ["Market Activity Normal"]
+        return ("Market Activity Normal",)
+
+def load_generic_news() -> list[str]:
+    """
+    Load generic news headlines from generic_news.txt file.
+    Returns a list of headlines, or empty list if file doesn't exist.
+    """
+    return list(_load_headlines())
 
 def get_random_generic_news() -> str:
     """
     Get a random generic news headline.
     """
-    headlines = load_generic_news()
+    headlines = _load_headlines()
     if headlines:
         return random.choice(headlines)
     return "Market Activity Normal"
-
@@ -1,9 +1,12 @@
 import redis
+import redis.asyncio as aioredis
 from dotenv import load_dotenv
 import os
 import json
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Dict
+from redis.commands.core import Script
 
 # Load .env file from project root (parent directory of back-end)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -15,14 +18,69 @@ SERVER_PORT = os.getenv("REDIS_PORT")
 SERVER_PASSWORD = os.getenv("REDIS_PASSWORD")
 
 
-def get_redis_connection() -> redis.Redis:
-    """Get a Redis connection using environment variables"""
-    return redis.Redis(
-        host=SERVER_IP,
-        port=int(SERVER_PORT) if SERVER_PORT else 6379,
-        password=SERVER_PASSWORD,
-        decode_responses=True
-    )
+# One connection pool per process (per reply mode), shared by every client handed out
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "32"))
+REDIS_HEALTH_CHECK_INTERVAL = 30  # Seconds a pooled connection may sit idle before it's pinged
+_pools: Dict[bool, redis.BlockingConnectionPool] = {}
+# Unbounded: every open websocket pins one connection for its pub/sub subscription
+_async_pool: Optional[aioredis.ConnectionPool] = None
+
+
+def _get_pool(decode_responses: bool) -> redis.BlockingConnectionPool:
+    """The process's shared pool; callers wait for a free connection instead of failing"""
+    pool = _pools.get(decode_responses)
+    if pool is None:
+        pool = _pools.setdefault(decode_responses, redis.BlockingConnectionPool(
+            host=SERVER_IP,
+            port=int(SERVER_PORT) if SERVER_PORT else 6379,
+            password=SERVER_PASSWORD,
+            decode_responses=decode_responses,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            socket_keepalive=True,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL
+        ))
+    return pool
+
+
+def get_redis_connection(decode_responses: bool = True) -> redis.Redis:
+    """
+    Get a Redis connection using environment variables.
+    Clients share the process's connection pool, so this is cheap to call and
+    doesn't open a new socket per call.
+    Pass decode_responses=False on hot paths whose replies go straight to a parser
+    that takes bytes (orjson, int(), float()) or back out as a response body;
+    that skips a UTF-8 decode of every reply.
+    """
+    return redis.Redis(connection_pool=_get_pool(decode_responses))
+
+
+def get_async_redis_connection() -> aioredis.Redis:
+    """
+    Get an asyncio Redis connection (for pub/sub inside async endpoints).
+    Clients share one pool on the server's event loop, so each websocket reuses
+    a pooled socket instead of opening (and tearing down) its own.
+    """
+    global _async_pool
+    if _async_pool is None:
+        _async_pool = aioredis.ConnectionPool(
+            host=SERVER_IP,
+            port=int(SERVER_PORT) if SERVER_PORT else 6379,
+            password=SERVER_PASSWORD,
+            decode_responses=True,
+            socket_keepalive=True,
+            health_check_interval=REDIS_HEALTH_CHECK_INTERVAL
+        )
+    return aioredis.Redis(connection_pool=_async_pool)
+
+
+@lru_cache(maxsize=None)
+def get_script(source: str) -> Script:
+    """
+    Register a Lua script once per process and reuse it.
+    Calls go out as EVALSHA (the script is loaded on the first NOSCRIPT reply);
+    pass client= to run it on a specific connection.
+    """
+    return get_redis_connection().register_script(source)
 
 
 def serialize_datetime(dt: datetime) -> str:
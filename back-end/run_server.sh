@@ -36,5 +36,6 @@ echo "✅ Starting FastAPI server on http://0.0.0.0:8000"
 echo "📊 View API docs at http://localhost:8000/docs"
 echo ""
 
-uvicorn api_server:app --host 0.0.0.0 --port 8000 --reload
+# uvloop (libuv-based event loop) ships with uvicorn[standard] on Linux/macOS
+uvicorn api_server:app --host 0.0.0.0 --port 8000 --loop uvloop --reload
 
@@ -5,14 +5,30 @@ Manages transaction history in Redis for tracking all trades (user and bot) with
 """
 
 import json
+import logging
 from typing import List, Dict, Optional
 from datetime import datetime
 from redis_helper import get_redis_connection
 
+logger = logging.getLogger(__name__)
+
 
 class TransactionHistory:
     """Manages transaction history for a game"""
     
+    # Transactions are kept for the entire game period; 90 days is more than sufficient
+    TRANSACTION_TTL = 90 * 24 * 60 * 60
+    
+    @staticmethod
+    def _actor_key(game_id: str, actor: str) -> str:
+        """Index list of one actor's transactions (most recent first)"""
+        return f"transactions:{game_id}:actor:{actor}"
+    
+    @staticmethod
+    def _bots_key(game_id: str) -> str:
+        """Index list of all bot transactions (most recent first)"""
+        return f"transactions:{game_id}:bots"
+    
     @staticmethod
     def add_transaction(game_id: str, transaction: Dict) -> bool:
         """
@@ -33,76 +49,103 @@ class TransactionHistory:
         Returns:
             True if successful, False otherwise
         """
+        return TransactionHistory.add_transactions(game_id, [transaction])
+    
+    @staticmethod
+    def add_transactions(game_id: str, transactions: List[Dict]) -> bool:
+        """
+        Add several transactions (oldest first) to the game's transaction history,
+        with one pipeline for all of their list pushes and one interactions update.
+        See add_transaction() for the transaction fields.
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        if not transactions:
+            return True
+        
         try:
             r = get_redis_connection()
             
-            # Add timestamp if not present
-            if 'timestamp' not in transaction:
-                transaction['timestamp'] = datetime.now().isoformat()
-            
-            # Add backward compatibility fields
-            if 'actor_name' in transaction and 'name' not in transaction:
-                transaction['name'] = transaction['actor_name']
-            if 'amount' in transaction and 'value' not in transaction:
-                transaction['value'] = int(transaction['amount'] * 100)  # Convert to cents
-            
-            # Store in Redis list (most recent first)
-            tx_key = f"transactions:{game_id}"
-            r.lpush(tx_key, json.dumps(transaction))
+            # Store in Redis lists (most recent first), plus the per-actor and bot indexes
+            # so filtered reads don't have to scan the whole game's history
+            pipe = r.pipeline(transaction=False)
+            all_key = f"transactions:{game_id}"
+            bots_key = TransactionHistory._bots_key(game_id)
+            touched_keys = {all_key}
+            for transaction in transactions:
+                # Add timestamp if not present
+                if 'timestamp' not in transaction:
+                    transaction['timestamp'] = datetime.now().isoformat()
+                
+                # Add backward compatibility fields
+                if 'actor_name' in transaction and 'name' not in transaction:
+                    transaction['name'] = transaction['actor_name']
+                if 'amount' in transaction and 'value' not in transaction:
+                    transaction['value'] = int(transaction['amount'] * 100)  # Convert to cents
+                
+                tx_json = json.dumps(transaction)
+                index_keys = [all_key]
+                if 'actor' in transaction:
+                    index_keys.append(TransactionHistory._actor_key(game_id, transaction['actor']))
+                if transaction.get('is_bot', False):
+                    index_keys.append(bots_key)
+                
+                for key in index_keys:
+                    pipe.lpush(key, tx_json)
+                touched_keys.update(index_keys)
             
-            # Set expiration to ensure transactions persist for the entire game period
-            # 90 days is more than sufficient for any game duration
-            r.expire(tx_key, 90 * 24 * 60 * 60)
+            for key in touched_keys:
+                pipe.expire(key, TransactionHistory.TRANSACTION_TTL)
+            pipe.execute()
             
             # Also update the legacy interactions format for backward compatibility
-            TransactionHistory._update_interactions(game_id, transaction)
+            TransactionHistory._update_interactions(game_id, transactions)
             
             return True
             
         except Exception as e:
-            print(f"Error adding transaction to history: {e}")
+            logger.error(f"Error adding transaction to history: {e}")
             return False
     
     @staticmethod
-    def _update_interactions(game_id: str, transaction: Dict):
-        """Update the legacy interactions format in game data"""
+    def _update_interactions(game_id: str, transactions: List[Dict]):
+        """Append transactions to the legacy interactions format in game data"""
         try:
             r = get_redis_connection()
             game_key = f"game:{game_id}"
             
             # Get current interactions (create empty list if game doesn't exist)
+            # Only this field is needed, not the whole game hash
             interactions = []
-            if r.exists(game_key):
-                game_data = r.hgetall(game_key)
-                if 'interactions' in game_data:
-                    try:
-                        interactions_str = game_data['interactions']
-                        if isinstance(interactions_str, bytes):
-                            interactions_str = interactions_str.decode('utf-8')
-                        interactions = json.loads(interactions_str)
-                    except:
-                        interactions = []
-            
-            # Add new interaction in legacy format with ALL required fields
-            new_interaction = {
-                'name': transaction.get('actor_name', transaction.get('name', 'Unknown')),
-                'type': transaction['type'],
-                'value': int(transaction.get('amount', 0) * 100),  # Store as cents
-                'interactionName': transaction.get('actor_name', transaction.get('name', 'Unknown')),
-                'interactionDescription': f"{transaction['type'].upper()} {transaction.get('amount', 0):.2f} BC @ ${transaction.get('price', 0):.2f}"
-            }
-            
-            interactions.append(new_interaction)
+            interactions_str = r.hget(game_key, 'interactions')
+            if interactions_str is not None:
+                try:
+                    if isinstance(interactions_str, bytes):
+                        interactions_str = interactions_str.decode('utf-8')
+                    interactions = json.loads(interactions_str)
+                except:
+                    interactions = []
             
-            # Save back to Redis (create game if it doesn't exist)
-            r.hset(game_key, 'interactions', json.dumps(interactions))
+            # Add new interactions in legacy format with ALL required fields
+            for transaction in transactions:
+                interactions.append({
+                    'name': transaction.get('actor_name', transaction.get('name', 'Unknown')),
+                    'type': transaction['type'],
+                    'value': int(transaction.get('amount', 0) * 100),  # Store as cents
+                    'interactionName': transaction.get('actor_name', transaction.get('name', 'Unknown')),
+                    'interactionDescription': f"{transaction['type'].upper()} {transaction.get('amount', 0):.2f} BC @ ${transaction.get('price', 0):.2f}"
+                })
             
-            # Ensure game has basic fields if it's new
-            if not r.hexists(game_key, 'gameId'):
-                r.hset(game_key, 'gameId', game_id)
+            # Save back to Redis (create game if it doesn't exist), ensuring the game
+            # has basic fields if it's new - one round trip for both
+            pipe = r.pipeline(transaction=False)
+            pipe.hset(game_key, 'interactions', json.dumps(interactions))
+            pipe.hsetnx(game_key, 'gameId', game_id)
+            pipe.execute()
             
         except Exception as e:
-            print(f"Error updating interactions: {e}")
+            logger.error(f"Error updating interactions: {e}")
     
     @staticmethod
     def get_transactions(game_id: str, limit: int = 100, offset: int = 0) -> List[Dict]:
@@ -121,33 +164,43 @@ class TransactionHistory:
             r = get_redis_connection()
             tx_key = f"transactions:{game_id}"
             
-            if not r.exists(tx_key):
-                return []
-            
-            # Get transactions from Redis list (already ordered most recent first)
+            # Get transactions from Redis list (already ordered most recent first);
+            # a missing list reads back empty
             end_idx = offset + limit - 1
-            transactions_json = r.lrange(tx_key, offset, end_idx)
-            
-            transactions = []
-            for tx_json in transactions_json:
-                if isinstance(tx_json, bytes):
-                    tx_json = tx_json.decode('utf-8')
-                tx = json.loads(tx_json)
-                
-                # Add backward compatibility fields for front-end
-                if 'actor_name' in tx and 'name' not in tx:
-                    tx['name'] = tx['actor_name']
-                if 'amount' in tx and 'value' not in tx:
-                    tx['value'] = int(tx['amount'] * 100)  # Convert to cents
-                
-                transactions.append(tx)
-            
-            return transactions
+            return TransactionHistory._decode_transactions(r.lrange(tx_key, offset, end_idx))
             
         except Exception as e:
-            print(f"Error getting transactions: {e}")
+            logger.error(f"Error getting transactions: {e}")
+            return []
+    
+    @staticmethod
+    def _read_index(key: str, limit: int) -> List[Dict]:
+        """Read the most recent transactions from one of the index lists"""
+        try:
+            r = get_redis_connection()
+            return TransactionHistory._decode_transactions(r.lrange(key, 0, limit - 1))
+        except Exception as e:
+            logger.error(f"Error getting transactions from {key}: {e}")
             return []
     
+    @staticmethod
+    def _decode_transactions(transactions_json: List) -> List[Dict]:
+        """Parse stored transactions and add backward compatibility fields for front-end"""
+        transactions = []
+        for tx_json in transactions_json:
+            if isinstance(tx_json, bytes):
+                tx_json = tx_json.decode('utf-8')
+            tx = json.loads(tx_json)
+            
+            if 'actor_name' in tx and 'name' not in tx:
+                tx['name'] = tx['actor_name']
+            if 'amount' in tx and 'value' not in tx:
+                tx['value'] = int(tx['amount'] * 100)  # Convert to cents
+            
+            transactions.append(tx)
+        
+        return transactions
+    
     @staticmethod
     def get_user_transactions(game_id: str, user_id: str, limit: int = 100) -> List[Dict]:
         """
@@ -161,9 +214,7 @@ class TransactionHistory:
         Returns:
             List of transaction dictionaries for this user, most recent first
         """
-        all_transactions = TransactionHistory.get_transactions(game_id, limit=1000)  # Already has backward compat fields
-        user_transactions = [tx for tx in all_transactions if tx.get('actor') == user_id]
-        return user_transactions[:limit]
+        return TransactionHistory._read_index(TransactionHistory._actor_key(game_id, user_id), limit)
     
     @staticmethod
     def get_bot_transactions(game_id: str, limit: int = 100) -> List[Dict]:
@@ -177,9 +228,7 @@ class TransactionHistory:
         Returns:
             List of bot transaction dictionaries, most recent first
         """
-        all_transactions = TransactionHistory.get_transactions(game_id, limit=1000)  # Already has backward compat fields
-        bot_transactions = [tx for tx in all_transactions if tx.get('is_bot', False)]
-        return bot_transactions[:limit]
+        return TransactionHistory._read_index(TransactionHistory._bots_key(game_id), limit)
     
     @staticmethod
     def get_transaction_stats(game_id: str) -> Dict:
@@ -196,10 +245,9 @@ class TransactionHistory:
             r = get_redis_connection()
             tx_key = f"transactions:{game_id}"
             
-            total_count = r.llen(tx_key) if r.exists(tx_key) else 0
-            
-            # Get all transactions to calculate stats
-            transactions = TransactionHistory.get_transactions(game_id, limit=total_count)
+            # Get all transactions to calculate stats, in one read (a missing list reads back empty)
+            transactions = TransactionHistory._decode_transactions(r.lrange(tx_key, 0, -1))
+            total_count = len(transactions)
             
             stats = {
                 'total_transactions': total_count,
@@ -214,7 +262,7 @@ class TransactionHistory:
             return stats
             
         except Exception as e:
-            print(f"Error getting transaction stats: {e}")
+            logger.error(f"Error getting transaction stats: {e}")
             return {
                 'total_transactions': 0,
                 'buy_count': 0,
@@ -239,9 +287,9 @@ class TransactionHistory:
         try:
             r = get_redis_connection()
             tx_key = f"transactions:{game_id}"
-            r.delete(tx_key)
+            r.delete(tx_key, *r.scan_iter(match=f"{tx_key}:*"))
             return True
         except Exception as e:
-            print(f"Error clearing transactions: {e}")
+            logger.error(f"Error clearing transactions: {e}")
             return False
 
@@ -1,10 +1,9 @@
 from dataclasses import dataclass, field
 from typing import List, Dict, Optional
 from datetime import datetime
-import uuid
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     """Represents a user in the game with portfolio and bots"""
     
@@ -15,6 +14,8 @@ class User:
     last_interaction_v: int = 0  # Last interaction tick/version
     last_interaction_t: Optional[datetime] = None  # Last interaction timestamp
     bots: List[Dict[str, str]] = field(default_factory=list)  # List of {botId, botName}
+    # Last to_dict() result; cleared by every mutating method
+    _dict_cache: Optional[Dict] = field(default=None, init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Initialize last_interaction_t if not provided"""
@@ -193,6 +194,7 @@ class User:
             "botId": bot_id,
             "botName": bot_name
         })
+        self._dict_cache = None
         return True
     
     def remove_bot(self, bot_id: str) -> bool:
@@ -207,6 +209,7 @@ class User:
         """
         initial_length = len(self.bots)
         self.bots = [bot for bot in self.bots if bot.get("botId") != bot_id]
+        self._dict_cache = None
         return len(self.bots) < initial_length
     
     def get_bot(self, bot_id: str) -> Optional[Dict[str, str]]:
@@ -274,8 +277,9 @@ class User:
     # ============================================================================
     
     def _update_interaction(self, current_tick: int = 0):
-        """Update last interaction timestamp and tick"""
+        """Update last interaction timestamp and tick (every trade goes through here)"""
         self.last_interaction_t = datetime.now()
+        self._dict_cache = None
         if current_tick > 0:
             self.last_interaction_v = current_tick
     
@@ -296,18 +300,23 @@ class User:
         """
         Convert user to dictionary format for API/Firebase
         
+        The result is cached until the next trade or bot change, so callers
+        must treat it as read-only.
+        
         Returns:
             Dictionary representation of user
         """
-        return {
-            "userId": self.user_id,
-            "userName": self.user_name,
-            "coins": self.coins,
-            "usd": self.usd,
-            "lastInteractionV": self.last_interaction_v,
-            "lastInteractionT": self.last_interaction_t.isoformat() if self.last_interaction_t else None,
-            "bots": self.bots.copy()
-        }
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "userId": self.user_id,
+                "userName": self.user_name,
+                "coins": self.coins,
+                "usd": self.usd,
+                "lastInteractionV": self.last_interaction_v,
+                "lastInteractionT": self.last_interaction_t.isoformat() if self.last_interaction_t else None,
+                "bots": self.bots.copy()
+            }
+        return self._dict_cache
     
     @classmethod
     def from_dict(cls, data: Dict) -> 'User':
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class UserWallet:
     """Represents a user's portfolio"""
     user_id: str
@@ -16,17 +16,25 @@ export async function GET(
     }
 
     const redis = getRedisClient();
-    const gameExists = await redis.exists(`game:${gameId}`);
 
-    if (!gameExists) {
+    // Game, market data and market info in one round trip (a missing key reads back as {})
+    const [gameResult, marketDataResult, marketInfoResult] = (await redis
+      .pipeline()
+      .hgetall(`game:${gameId}`)
+      .hgetall(`market:${gameId}:data`)
+      .hgetall(`market:${gameId}`)
+      .exec()) ?? [];
+    const gameData = (gameResult?.[1] ?? {}) as Record<string, string>;
+    const marketData = (marketDataResult?.[1] ?? {}) as Record<string, string>;
+    const marketInfo = (marketInfoResult?.[1] ?? {}) as Record<string, string>;
+
+    if (Object.keys(gameData).length === 0) {
       return NextResponse.json(
         { error: 'Game not found' },
         { status: 404 }
       );
     }
 
-    const gameData = await redis.hgetall(`game:${gameId}`);
-
     // Parse JSON fields and transform to match Game interface
     const players = JSON.parse(gameData.players || '[]');
     const coinHistory = JSON.parse(gameData.coinHistory || '[1.0]');
@@ -37,7 +45,7 @@ export async function GET(
       (player.bots || []).map((bot: any) => `bot:${gameId}:${bot.botId}`)
     );
 
-    // Use pipeline to fetch all bots at once
+    // Use pipeline to fetch all bots at once (bot keys come from the players, so this is a second trip)
     const pipeline = redis.pipeline();
     allBotIds.forEach((botKey: string) => {
       pipeline.hgetall(botKey);
@@ -132,30 +140,18 @@ export async function GET(
     let allGenericNews: string[] = [];
     
     try {
-      // First, try to read market data directly from Redis (faster and more reliable)
-      const marketDataKey = `market:${gameId}:data`;
-      const marketDataExists = await redis.exists(marketDataKey);
-      
-      if (marketDataExists) {
-        const marketData = await redis.hgetall(marketDataKey);
-        
-        if (marketData && marketData.current_price) {
-          currentPrice = parseFloat(marketData.current_price);
-          priceHistory = JSON.parse(marketData.price_history || '[]');
-          volatility = parseFloat(marketData.volatility || '0');
-          marketActive = true;
-        }
+      // First, use the market data read directly from Redis (faster and more reliable)
+      if (marketData.current_price) {
+        currentPrice = parseFloat(marketData.current_price);
+        priceHistory = JSON.parse(marketData.price_history || '[]');
+        volatility = parseFloat(marketData.volatility || '0');
+        marketActive = true;
       }
       
-      // Fetch event data from market basic info
-      const marketKey = `market:${gameId}`;
-      const marketKeyExists = await redis.exists(marketKey);
-      if (marketKeyExists) {
-        const marketInfo = await redis.hgetall(marketKey);
-        if (marketInfo) {
-          eventTitle = marketInfo.event_title || '';
-          eventTriggered = marketInfo.event_triggered === 'True' || marketInfo.event_triggered === 'true';
-        }
+      // Event data from market basic info
+      if (Object.keys(marketInfo).length > 0) {
+        eventTitle = marketInfo.event_title || '';
+        eventTriggered = marketInfo.event_triggered === 'True' || marketInfo.event_triggered === 'true';
       }
       
       // Always try to get generic news from FastAPI (even if we have Redis data)
@@ -1,6 +1,20 @@
 import { NextRequest, NextResponse } from 'next/server';
 import { getRedisClient } from '@/utils/redis';
 
+// Writes the players field only if it still holds what this request read, so a
+// concurrent join or back-end trade in between is never overwritten.
+// KEYS: game:{id} - ARGV: players as read ('' if missing), new players - Returns 1, or 0 on conflict
+const SET_PLAYERS_IF_UNCHANGED = `
+if (redis.call('HGET', KEYS[1], 'players') or '') ~= ARGV[1] then
+  return 0
+end
+redis.call('HSET', KEYS[1], 'players', ARGV[2])
+return 1
+`;
+
+// Fresh read + compare-and-set attempts before reporting a conflict
+const MAX_JOIN_ATTEMPTS = 10;
+
 export async function POST(request: NextRequest) {
   try {
     const body = await request.json();
@@ -23,46 +37,58 @@ export async function POST(request: NextRequest) {
       );
     }
 
-    const gameData = await redis.hgetall(`game:${gameId}`);
+    for (let attempt = 0; attempt < MAX_JOIN_ATTEMPTS; attempt++) {
+      const gameData = await redis.hgetall(`game:${gameId}`);
 
-    if (gameData.isStarted === 'true') {
-      return NextResponse.json(
-        { error: 'Game already started' },
-        { status: 400 }
-      );
-    }
+      if (gameData.isStarted === 'true') {
+        return NextResponse.json(
+          { error: 'Game already started' },
+          { status: 400 }
+        );
+      }
 
-    const players = JSON.parse(gameData.players || '[]');
-    const maxPlayers = parseInt(gameData.maxPlayers || '4');
+      const players = JSON.parse(gameData.players || '[]');
+      const maxPlayers = parseInt(gameData.maxPlayers || '4');
 
-    if (players.length >= maxPlayers) {
-      return NextResponse.json(
-        { error: 'Game is full' },
-        { status: 400 }
-      );
-    }
+      if (players.length >= maxPlayers) {
+        return NextResponse.json(
+          { error: 'Game is full' },
+          { status: 400 }
+        );
+      }
 
-    // Check if player already in game
-    if (players.some((p: any) => p.userId === userId)) {
-      return NextResponse.json(
-        { error: 'Player already in game' },
-        { status: 400 }
-      );
-    }
+      // Check if player already in game
+      if (players.some((p: any) => p.userId === userId)) {
+        return NextResponse.json(
+          { error: 'Player already in game' },
+          { status: 400 }
+        );
+      }
 
-    players.push({
-      playerId: userId,
-      playerName: userName,
-      coinBalance: 0,
-      usdBalance: 10000,
-      bots: [],
-      lastInteractionValue: 0,
-      lastInteractionTime: new Date().toISOString(),
-    });
+      players.push({
+        playerId: userId,
+        playerName: userName,
+        coinBalance: 0,
+        usdBalance: 10000,
+        bots: [],
+        lastInteractionValue: 0,
+        lastInteractionTime: new Date().toISOString(),
+      });
 
-    await redis.hset(`game:${gameId}`, 'players', JSON.stringify(players));
+      const written = await redis.eval(
+        SET_PLAYERS_IF_UNCHANGED, 1, `game:${gameId}`,
+        gameData.players || '', JSON.stringify(players)
+      );
+      if (written === 1) {
+        return NextResponse.json({ success: true });
+      }
+      // Someone else changed the players since the read; try again on fresh data
+    }
 
-    return NextResponse.json({ success: true });
+    return NextResponse.json(
+      { error: 'Game is busy, please try again' },
+      { status: 409 }
+    );
   } catch (error) {
     console.error('Error joining game:', error);
     return NextResponse.json(
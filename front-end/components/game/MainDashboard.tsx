@@ -375,36 +375,55 @@ export default function MainDashboard({ game, currentUser }: MainDashboardProps)
   };
 
   const elapsedSeconds = getElapsedSeconds();
-  const startIndex = Math.max(0, coinsArr.length - DISPLAY_WINDOW_SECONDS);
-  // Ensure we always have at least one data point to prevent flashing
-  const displayData = coinsArr.length > 0 ? coinsArr.slice(startIndex) : [1.0];
-  const displayLabels = displayData.map((_, index) => {
-    const dataPointSecond = elapsedSeconds - (displayData.length - 1 - index);
-    return formatTimeLabel(Math.max(0, dataPointSecond));
-  });
-
-  const chartData = useMemo(() => ({
-    labels: displayLabels,
-    datasets: [
-      {
-        label: "Banana Coin Price",
-        data: displayData,
-        borderColor: "rgb(212, 160, 23)",
-        backgroundColor: "rgba(212, 160, 23, 0.1)",
-        tension: 0,
-        fill: true,
-        pointRadius: 0,
-        pointHoverRadius: 0,
-        borderWidth: 2,
+  const lastPrice = coinsArr.length > 0 ? coinsArr[coinsArr.length - 1] : undefined;
+
+  // Slice the visible window, build its labels and find its price bounds in
+  // a single pass. Only recomputed when a new price arrives, so re-renders
+  // from the timer or leaderboard reuse the same arrays and Chart.js can
+  // skip re-diffing the dataset.
+  const { chartData, minPrice, maxPrice } = useMemo(() => {
+    const startIndex = Math.max(0, coinsArr.length - DISPLAY_WINDOW_SECONDS);
+    // Ensure we always have at least one data point to prevent flashing
+    const displayData: number[] =
+      coinsArr.length > 0 ? coinsArr.slice(startIndex) : [1.0];
+    const count = displayData.length;
+    const displayLabels = new Array<string>(count);
+    // Use only the displayed data for scale calculation to prevent flashing
+    let low = Infinity;
+    let high = -Infinity;
+    for (let i = 0; i < count; i++) {
+      const dataPointSecond = elapsedSeconds - (count - 1 - i);
+      displayLabels[i] = formatTimeLabel(Math.max(0, dataPointSecond));
+      const price = displayData[i];
+      if (typeof price === "number" && price > 0) {
+        if (price < low) low = price;
+        if (price > high) high = price;
+      }
+    }
+
+    return {
+      chartData: {
+        labels: displayLabels,
+        datasets: [
+          {
+            label: "Banana Coin Price",
+            data: displayData,
+            borderColor: "rgb(212, 160, 23)",
+            backgroundColor: "rgba(212, 160, 23, 0.1)",
+            tension: 0,
+            fill: true,
+            pointRadius: 0,
+            pointHoverRadius: 0,
+            borderWidth: 2,
+          },
+        ],
       },
-    ],
-  }), [displayLabels.length, displayData.length, displayData[displayData.length - 1]]);
+      minPrice: low === Infinity ? 0.5 : low,
+      maxPrice: high === -Infinity ? 1.5 : high,
+    };
+  }, [coinsArr.length, lastPrice]);
 
   // --- Chart Limits ---
-  // Use only the displayed data for scale calculation to prevent flashing
-  const validPrices = displayData.filter((p) => typeof p === "number" && p > 0);
-  const minPrice = validPrices.length > 0 ? Math.min(...validPrices) : 0.5;
-  const maxPrice = validPrices.length > 0 ? Math.max(...validPrices) : 1.5;
   const gridMin = Math.floor(minPrice * 0.8 * 10) / 10;
   const gridMax = Math.ceil(maxPrice * 1.2 * 10) / 10;
   const gridRange = gridMax - gridMin;
@@ -451,7 +470,10 @@ export default function MainDashboard({ game, currentUser }: MainDashboardProps)
         },
       },
     },
-    animation: { duration: 0 },
+    // No animation frames at all (duration 0 still runs the animator on every
+    // update), and the x values are already sorted so Chart.js can skip checking
+    animation: false as const,
+    normalized: true,
   }), [gridMin, gridMax, gridStep]);
 
   // --- Portfolio Stats ---
@@ -505,7 +527,7 @@ export default function MainDashboard({ game, currentUser }: MainDashboardProps)
         <div className="flex flex-col min-h-0 overflow-hidden">
           <Card title="BANANA COIN MARKET" padding="lg" className="h-full flex flex-col">
             <div className="flex-1 min-h-0">
-              <Line key="banana-coin-chart" data={chartData} options={chartOptions} />
+              <Line key="banana-coin-chart" data={chartData} options={chartOptions} updateMode="none" />
             </div>
             <div className="mt-4 p-4 border-t-2 border-[var(--border)]">
               <div className="flex items-center justify-between">
@@ -188,19 +188,26 @@ export const getRoom = (
   onUpdate: (game: Game | null) => void
 ) => {
   let intervalId: NodeJS.Timeout;
+  // A slow poll must not stack more requests (and JSON parses) behind it
+  let inFlight = false;
+  let active = true;
 
   const fetchGame = async () => {
+    if (inFlight) return;
+    inFlight = true;
     try {
       const response = await fetch(`/api/game/${gameId}`);
       if (response.ok) {
         const data = await response.json();
-        onUpdate(data.game);
-      } else {
+        if (active) onUpdate(data.game);
+      } else if (active) {
         onUpdate(null);
       }
     } catch (error) {
       console.error('Error fetching game:', error);
-      onUpdate(null);
+      if (active) onUpdate(null);
+    } finally {
+      inFlight = false;
     }
   };
 
@@ -210,8 +217,11 @@ export const getRoom = (
   // Poll every 1 second to match backend market update rate
   intervalId = setInterval(fetchGame, 1000);
 
-  // Return unsubscribe function
-  return () => clearInterval(intervalId);
+  // Return unsubscribe function (responses still in flight are dropped)
+  return () => {
+    active = false;
+    clearInterval(intervalId);
+  };
 };
 
 /**
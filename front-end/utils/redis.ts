@@ -1,6 +1,10 @@
 import Redis from 'ioredis';
 
-let redis: Redis | null = null;
+// Kept on globalThis so every route in the process shares one connection, even
+// when Next.js re-evaluates this module (dev hot reload, separate route bundles)
+const globalForRedis = globalThis as unknown as { redis?: Redis | null };
+
+let redis: Redis | null = globalForRedis.redis ?? null;
 
 export function getRedisClient(): Redis {
   if (!redis) {
@@ -21,6 +25,8 @@ export function getRedisClient(): Redis {
     redis.on('connect', () => {
       console.log('Connected to Redis');
     });
+
+    globalForRedis.redis = redis;
   }
 
   return redis;
@@ -30,5 +36,6 @@ export async function closeRedisConnection() {
   if (redis) {
     await redis.quit();
     redis = null;
+    globalForRedis.redis = null;
   }
 }